@@ -1,15 +1,24 @@
+import importlib
+import logging
+import multiprocessing
+import time
 import tkinter as tk
 from tkinter import ttk
 
-# === Module imports ===
-from modules.payment_requisition import PaymentRequisitionApp
-from modules.import9500 import DepositImportApp
-from modules.expenses import GLExtractorApp
-from modules.bidmasterimport import BidmasterSalesApp
-from modules.compare9500 import Compare9500App
-from modules.petty_cash import PettyCashApp
-from modules.everlytic import Everlytic
-# from modules.creditors import CreditorsApp  # Uncomment once ready
+# ---- Tab registry: title → (module, class) ----
+# Modules are imported on first selection of their tab, so pandas, fpdf,
+# tkcalendar and openpyxl are not loaded before the window is shown.
+TABS = [
+    ("💼 EWallet & Petty Cash", "modules.petty_cash",          "PettyCashApp"),
+    ("📊 Compare 9500",       "modules.compare9500",         "Compare9500App"),
+    ("🏦 Import Deposits",     "modules.import9500",          "DepositImportApp"),
+    ("💸 Requisitions",        "modules.payment_requisition", "PaymentRequisitionApp"),
+    ("🧾 Bidmaster",          "modules.bidmasterimport",     "BidmasterSalesApp"),
+    ("📂 GL Extractor",       "modules.expenses",            "GLExtractorApp"),
+    ("📑 Everlytic",          "modules.everlytic",           "Everlytic"),
+    ("⏱ Performance",         "modules.performance",         "PerformanceApp"),
+    # ("🧾 Creditors",        "modules.creditors",           "CreditorsApp"),  # Uncomment once ready
+]
 
 
 def build_app():
@@ -42,28 +51,35 @@ def build_app():
     ttk.Label(welcome_frame, text="Welcome to the Finance Toolkit", style="Title.TLabel").pack(pady=24)
     notebook.add(welcome_frame, text="🏁 Welcome")
 
-    # ---- Tab registry: title → class ----
-    tabs = [
-        ("💼 EWallet & Petty Cash", PettyCashApp),
-        ("📊 Compare 9500",       Compare9500App),
-        ("🏦 Import Deposits",     DepositImportApp),
-        ("💸 Requisitions",        PaymentRequisitionApp),
-        ("🧾 Bidmaster",          BidmasterSalesApp),
-        ("📂 GL Extractor",       GLExtractorApp),
-        ("📑 Everlytic",          Everlytic),
-        # ("🧾 Creditors",        CreditorsApp),
-    ]
-
-    # ---- Create each tab from the registry ----
-    for title, AppClass in tabs:
+    # ---- Add an empty frame per tab; build it on first selection ----
+    pending = {}
+    for title, module_name, class_name in TABS:
         frame = ttk.Frame(notebook)
+        notebook.add(frame, text=title)
+        pending[str(frame)] = (title, frame, module_name, class_name)
+
+    # Seconds spent importing + building each tab, keyed by tab title
+    root.tab_build_times = {}
+
+    def build_selected_tab(event=None):
+        entry = pending.pop(notebook.select(), None)
+        if entry is None:
+            return
+        title, frame, module_name, class_name = entry
+        start = time.perf_counter()
+        AppClass = getattr(importlib.import_module(module_name), class_name)
         # Let your module build its own layout inside the frame
         AppClass(frame)
-        notebook.add(frame, text=title)
+        root.tab_build_times[title] = time.perf_counter() - start
+
+    notebook.bind("<<NotebookTabChanged>>", build_selected_tab)
 
     return root
 
 
 if __name__ == "__main__":
+    # Needed for process pools (e.g. requisition PDFs) in the PyInstaller build
+    multiprocessing.freeze_support()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s: %(message)s")
     app = build_app()
     app.mainloop()
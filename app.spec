@@ -6,7 +6,23 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    hiddenimports=[
+        # Tab modules are imported lazily by app.build_app, so PyInstaller cannot see them
+        'modules.petty_cash',
+        'modules.compare9500',
+        'modules.import9500',
+        'modules.payment_requisition',
+        'modules.requisition_pdf',
+        'modules.bidmasterimport',
+        'modules.expenses',
+        'modules.everlytic',
+        'modules.performance',
+        # Optional Excel engine, imported inside a try in modules.excel_io
+        'python_calamine',
+        # Parse cache storage (Feather), imported inside a try in modules.parse_cache
+        'pyarrow',
+        'pyarrow.feather',
+    ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,88 @@
+# benchmarks/bench_bidmaster_lines.py
+"""
+Bidmaster invoice line generation: building base, commission and doc-fee
+frames and concatenating them before writing (the old path) vs streaming
+chunks derived from the base frame (write_invoice_import).
+
+    python benchmarks/bench_bidmaster_lines.py --rows 50000 500000
+"""
+import argparse
+import filecmp
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from modules.bidmaster_transform import (  # noqa: E402
+    base_lines, commission_lines, docfee_lines, write_invoice_import, _NOTES_STRIP,
+)
+from modules.evolution_schema import write_csv  # noqa: E402
+
+COMMISSION = 12.5
+BRANCH_GL, DEPT_CODE = "BLM", "015"
+
+
+def make_reports(rows: int, seed: int = 0):
+    """Detail profit rows (M, AA, AB, AC, AF as the reader returns them) and a cash recon."""
+    rng = np.random.default_rng(seed)
+    buyers = rng.integers(1000, 1000 + max(rows // 20, 1), rows).astype(str)
+    invoice_df = pd.DataFrame({
+        "M": rng.choice(["2010 FORD FIGO", "TOYOTA HILUX 3.0 D-4D", "CAT 320D EXCAVATOR"], rows),
+        "AA": pd.Series(rng.integers(1, 999, rows)).map("{:03d}".format),
+        "AB": buyers,
+        "AC": rng.choice(["", 'Collect "before" Friday', "Keys, papers", "O'Brien"], rows),
+        "AF": rng.integers(1_000, 5_000_000, rows) / 100,
+    })
+    uniq = np.unique(buyers)
+    cash_df = pd.DataFrame({"buyer_nr": uniq, "aDescription": [f"Buyer {b}" for b in uniq]})
+    return invoice_df, cash_df
+
+
+def old_write(base, path):
+    """What merge_dataframes did: three full frames, one concat, then translate and write."""
+    comm = commission_lines(base, COMMISSION, BRANCH_GL, DEPT_CODE)
+    docfee = docfee_lines(comm, BRANCH_GL, DEPT_CODE)
+    merged = pd.concat([base, comm, docfee], ignore_index=True)
+    merged["CLIENTNOTES"] = merged["CLIENTNOTES"].fillna("").astype(str).str.translate(_NOTES_STRIP)
+    write_csv(merged, path, encoding="utf-8-sig")
+
+
+def new_write(base, path):
+    write_invoice_import(base, COMMISSION, BRANCH_GL, DEPT_CODE, path)
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[50_000, 200_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'old s':>8} {'new s':>8} {'old MB':>8} {'new MB':>8} {'same':>6}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            base = base_lines(*make_reports(rows), "123", "01/09/2025")
+            old_path, new_path = os.path.join(tmp, "old.csv"), os.path.join(tmp, "new.csv")
+            t_old, m_old = measure(old_write, base, old_path)
+            t_new, m_new = measure(new_write, base, new_path)
+            same = filecmp.cmp(old_path, new_path, shallow=False)
+            print(f"{rows:>10} {t_old:>8.3f} {t_new:>8.3f} {m_old:>8.1f} {m_new:>8.1f} {str(same):>6}")
+
+
+if __name__ == "__main__":
+    main()
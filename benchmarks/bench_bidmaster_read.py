@@ -0,0 +1,54 @@
+# benchmarks/bench_bidmaster_read.py
+"""
+Bidmaster report ingestion benchmark: the old python-engine full read vs the
+typed C-engine reader in modules.bidmaster_transform.
+
+    python benchmarks/bench_bidmaster_read.py --rows 10000 200000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from modules.bidmaster_transform import read_detail_profit_report, DETAIL_PROFIT_COLUMNS  # noqa: E402
+from synthetic import write_detail_profit  # noqa: E402
+
+
+def old_read(path):
+    """What BidmasterSalesApp.detail_profit_report + convert_file did before."""
+    df = pd.read_csv(path, header=None, encoding="ISO-8859-1", engine="python").iloc[:, :36]
+    df.columns = DETAIL_PROFIT_COLUMNS
+    df["AF"] = df["AF"].astype(str).str.replace(" ", "", regex=False).str.replace(",", "", regex=False).replace("", "0")
+    df["AF"] = df["AF"].astype(float)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'old s':>8} {'typed s':>8} {'speedup':>8} {'same AF':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = os.path.join(tmp, f"detail_{rows}.csv")
+            write_detail_profit(path, rows)
+            start = time.perf_counter()
+            old = old_read(path)
+            t_old = time.perf_counter() - start
+            start = time.perf_counter()
+            new = read_detail_profit_report(path)
+            t_new = time.perf_counter() - start
+            same = np.allclose(old["AF"], new["AF"])
+            print(f"{rows:>10} {t_old:>8.3f} {t_new:>8.3f} {t_old / t_new:>7.1f}x {str(same):>8}")
+
+
+if __name__ == "__main__":
+    main()
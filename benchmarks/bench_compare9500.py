@@ -0,0 +1,99 @@
+# benchmarks/bench_compare9500.py
+"""
+Compare 9500 diff benchmark: the old double outer merge vs the hashed
+multiset diff in modules.diff_engine, then a repeated Compare click with
+normalize + diff every time vs keys built once on load (CompareKeys), and
+next month's compare with a warm ReconStore vs a full diff.
+
+    python benchmarks/bench_compare9500.py --rows 100000 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from modules.diff_engine import normalize_for_compare, multiset_diff, row_hashes, clean_dataframe, CompareKeys  # noqa: E402
+from modules.recon_store import ReconStore, incremental_diff  # noqa: E402
+from synthetic import make_9500_pair  # noqa: E402
+
+
+def merge_diff(a, b):
+    """The approach Compare9500App.compare used before the hashed diff."""
+    only_a = pd.merge(a, b, how="outer", indicator=True).query("_merge == 'left_only'").drop(columns=["_merge"])
+    only_b = pd.merge(b, a, how="outer", indicator=True).query("_merge == 'left_only'").drop(columns=["_merge"])
+    return only_a, only_b
+
+
+def recompare(a, b, ncols):
+    """What each Compare click did before: normalize both sides, then diff."""
+    return multiset_diff(normalize_for_compare(a.iloc[:, :ncols]), normalize_for_compare(b.iloc[:, :ncols]))
+
+
+def recompare_keys(keys_a, keys_b, ncols):
+    """Compare click with keys built on load: pick cached columns, then diff."""
+    return multiset_diff(keys_a.frame(ncols), keys_b.frame(ncols), keys_a.hashes(ncols), keys_b.hashes(ncols))
+
+
+def next_month(a, b, new_share: float = 0.03):
+    """Both exports in date order; last month's are the same minus the newest rows."""
+    a = a.sort_values("Date", kind="stable").reset_index(drop=True)
+    b = b.sort_values("Date", kind="stable").reset_index(drop=True)
+    return a, b, a.iloc[:int(len(a) * (1 - new_share))], b.iloc[:int(len(b) * (1 - new_share))]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'merge s':>9} {'hashed s':>9} {'speedup':>8} {'A/B (merge)':>14} {'A/B (hashed)':>14}")
+    for rows in args.rows:
+        a, b = make_9500_pair(rows)
+        a, b = normalize_for_compare(a), normalize_for_compare(b)
+        t_merge, (ma, mb) = timed(merge_diff, a, b)
+        t_hash, (ha, hb) = timed(multiset_diff, a, b)
+        print(f"{rows:>10} {t_merge:>9.3f} {t_hash:>9.3f} {t_merge / t_hash:>7.1f}x "
+              f"{f'{len(ma)}/{len(mb)}':>14} {f'{len(ha)}/{len(hb)}':>14}")
+
+    print(f"\n{'rows':>10} {'load keys s':>12} {'re-compare s':>13} {'with keys s':>12} {'speedup':>8} {'same':>5}")
+    for rows in args.rows:
+        a, b = make_9500_pair(rows)
+        clean_dataframe(a)
+        clean_dataframe(b)
+        ncols = len(a.columns)
+        t_load, (keys_a, keys_b) = timed(lambda: (CompareKeys(a), CompareKeys(b)))
+        t_load += timed(lambda: (keys_a.ensure(ncols), keys_b.ensure(ncols)))[0]
+        t_old, (oa, ob) = timed(recompare, a, b, ncols)
+        t_new, (na, nb) = timed(recompare_keys, keys_a, keys_b, ncols)
+        same = oa.equals(na) and ob.equals(nb)
+        print(f"{rows:>10} {t_load:>12.3f} {t_old:>13.3f} {t_new:>12.3f} {t_old / t_new:>7.1f}x {str(same):>5}")
+
+    print(f"\n{'rows':>10} {'full diff s':>12} {'warm store s':>13} {'speedup':>8} {'diffed':>9} {'same':>5}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            a, b = make_9500_pair(rows)
+            a, b, last_a, last_b = next_month(normalize_for_compare(a), normalize_for_compare(b))
+            ha, hb = row_hashes(a), row_hashes(b)
+            store = ReconStore(f"bench_{rows}", directory=tmp)
+            incremental_diff(last_a, last_b, store, ha[:len(last_a)], hb[:len(last_b)])
+            t_full, (fa, fb) = timed(multiset_diff, a, b, ha, hb)
+            t_warm, (ia, ib, info) = timed(incremental_diff, a, b, store, ha, hb)
+            same = fa.equals(ia) and fb.equals(ib)
+            print(f"{rows:>10} {t_full:>12.3f} {t_warm:>13.3f} {t_full / t_warm:>7.1f}x "
+                  f"{info['diffed_rows']:>9} {str(same):>5}")
+
+
+if __name__ == "__main__":
+    main()
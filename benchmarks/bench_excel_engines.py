@@ -0,0 +1,104 @@
+# benchmarks/bench_excel_engines.py
+"""
+excel_io engines on the workbook shapes the tabs read: openpyxl streaming,
+calamine (when python-calamine is installed) and plain pd.read_excel as the
+baseline. Every engine's frame is checked against openpyxl's; the pandas
+baseline is timing only, as excel_io keeps some mixed columns as text.
+
+    python benchmarks/bench_excel_engines.py --rows 10000 100000
+    python benchmarks/bench_excel_engines.py --files "C:/exports/9500 Sept.xls"
+
+--files adds real workbooks (first sheet, header on row 1); .xls files are
+skipped by the openpyxl engine, which can't read them.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import synthetic  # noqa: E402
+from modules.excel_io import (  # noqa: E402
+    read_sheet, available_engines, resolve_engine, DEFAULT, NO_HEADER, PETTY_CASH, STREAMABLE,
+)
+
+# shape -> (synthetic.WRITERS file name, layout)
+SHAPES = {
+    "gl_ledger": ("gl_transactions.xlsx", NO_HEADER),
+    "petty_cash": ("petty_cash.xlsx", PETTY_CASH),
+    "deposits_9500": ("deposits_9500.xlsx", DEFAULT),
+    "refunds": ("customer_refunds.xlsx", DEFAULT),
+}
+
+
+def pandas_baseline(path, layout):
+    header = layout.header if layout.header is not None else None
+    skip = range(header + 1, header + 1 + layout.skip_after_header) if header is not None else None
+    return pd.read_excel(path, header=header, skiprows=skip,
+                         usecols=range(layout.ncols) if layout.ncols else None)
+
+
+def timed(fn, *args, **kw):
+    start = time.perf_counter()
+    result = fn(*args, **kw)
+    return time.perf_counter() - start, result
+
+
+def same(df, ref) -> bool:
+    try:
+        pd.testing.assert_frame_equal(df.reset_index(drop=True), ref.reset_index(drop=True),
+                                      check_dtype=False, check_column_type=False)
+        return True
+    except AssertionError:
+        return False
+
+
+def bench(label, path, layout):
+    ext = os.path.splitext(path)[1].lower()
+    ref = None
+    if ext in STREAMABLE:
+        t, ref = timed(read_sheet, path, layout=layout, engine="openpyxl")
+        print(f"{label:<28} {'openpyxl':<10} {t:>9.3f} {len(ref):>9} {'ref':>6}")
+    for engine in available_engines():
+        if engine == "openpyxl" or resolve_engine(path, engine) != engine:
+            continue
+        t, df = timed(read_sheet, path, layout=layout, engine=engine)
+        match = str(same(df, ref)) if ref is not None else "-"
+        ref = df if ref is None else ref
+        print(f"{label:<28} {engine:<10} {t:>9.3f} {len(df):>9} {match:>6}")
+    try:
+        t, df = timed(pandas_baseline, path, layout)
+    except ImportError as e:        # .xls without xlrd
+        print(f"{label:<28} {'pandas':<10} {'-':>9} {'-':>9} {'-':>6}  ({e})")
+        return
+    print(f"{label:<28} {'pandas':<10} {t:>9.3f} {len(df):>9} {'-':>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--shapes", nargs="+", choices=list(SHAPES), default=list(SHAPES))
+    parser.add_argument("--files", nargs="*", default=[], help="Real workbooks to add to the run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"engines available: {', '.join(available_engines())}")
+    print(f"{'workbook':<28} {'engine':<10} {'seconds':>9} {'rows':>9} {'same':>6}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            for shape in args.shapes:
+                name, layout = SHAPES[shape]
+                path = os.path.join(tmp, f"{rows}_{name}")
+                synthetic.WRITERS[name](path, rows, args.seed)
+                bench(f"{shape} {rows}", path, layout)
+    for path in args.files:
+        bench(os.path.basename(path)[:28], path, DEFAULT)
+
+
+if __name__ == "__main__":
+    main()
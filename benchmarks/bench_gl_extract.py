@@ -0,0 +1,58 @@
+# benchmarks/bench_gl_extract.py
+"""
+GL Extractor benchmark: the old per-row iterrows() parser vs the vectorized
+modules.gl_transform.extract_gl_rows, on a synthetic Account Transactions sheet.
+
+    python benchmarks/bench_gl_extract.py --rows 10000 200000
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from modules.gl_transform import extract_gl_rows  # noqa: E402
+from synthetic import make_ledger  # noqa: E402
+
+
+def iterrows_extract(df: pd.DataFrame) -> pd.DataFrame:
+    """The loop GLExtractorApp.process_file used before extract_gl_rows."""
+    cleaned_data = []
+    current_gl = None
+    for index, row in df.iterrows():
+        first_cell = str(row[0]) if not pd.isna(row[0]) else ""
+        if re.match(r"\d{4}/[A-Z]{2,3}/\d{3}", first_cell):
+            current_gl = first_cell.strip()
+            continue
+        date = pd.to_datetime(first_cell, errors='coerce')
+        if pd.notna(date):
+            cleaned_data.append([current_gl] + row.tolist())
+    columns = ['GL', 'Date', 'Reference', 'Description', 'Unused', 'Debit', 'Credit', 'Balance']
+    return pd.DataFrame(cleaned_data, columns=columns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'iterrows s':>11} {'vectorized s':>13} {'speedup':>8} {'same':>5}")
+    for rows in args.rows:
+        raw = make_ledger(rows)
+        start = time.perf_counter()
+        old = iterrows_extract(raw)
+        t_old = time.perf_counter() - start
+        start = time.perf_counter()
+        new = extract_gl_rows(raw)
+        t_new = time.perf_counter() - start
+        same = old.astype(str).equals(new.astype(str))
+        print(f"{len(raw):>10} {t_old:>11.3f} {t_new:>13.3f} {t_old / t_new:>7.1f}x {str(same):>5}")
+
+
+if __name__ == "__main__":
+    main()
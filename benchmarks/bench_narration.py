@@ -0,0 +1,57 @@
+# benchmarks/bench_narration.py
+"""
+Deposit narration benchmark: the old per-phrase Series.replace list vs the
+compiled NarrationEngine (one alternation for stripping, one for channels).
+
+    python benchmarks/bench_narration.py --rows 100000 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from modules.deposit_transform import NarrationEngine  # noqa: E402
+from synthetic import make_narrations  # noqa: E402
+
+# The list DepositImportApp passed to Series.replace, in its original order
+OLD_PHRASES = [
+    "FNB APP PAYMENT FROM", "DIGITAL PAYMENT CR ABSA BANK", "CAPITEC",
+    "ACB CREDIT CAPITEC", "FNB OB PMT", "PayShap Ext Credit",
+    "INT-BANKING PMT FRM", "IMMEDIATE TRF CR CAPITEC",
+    "IMMEDIATE TRF CR", "ACB CREDIT", "INVESTECPB"
+]
+
+
+def old_strip(text: pd.Series) -> pd.Series:
+    return text.replace(OLD_PHRASES, '', regex=True).str.strip()
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    engine = NarrationEngine()
+    print(f"{'rows':>10} {'old strip s':>12} {'engine strip s':>15} {'+channel s':>11} {'speedup':>8} {'same':>5}")
+    for rows in args.rows:
+        text = make_narrations(rows)
+        t_old, old = timed(old_strip, text)
+        t_new, new = timed(engine.strip, text)
+        t_tag, _ = timed(engine.channel, text)
+        print(f"{rows:>10} {t_old:>12.3f} {t_new:>15.3f} {t_tag:>11.3f} {t_old / t_new:>7.1f}x "
+              f"{str(old.equals(new)):>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/bench_startup.py
+"""
+Startup benchmark for the Tk app.
+
+Measures time-to-first-window (imports + build_app + first paint) and the
+time each notebook tab takes to import and build on first selection.
+
+    python benchmarks/bench_startup.py [--json results.json]
+
+Run it in a fresh interpreter each time; module imports are cached per process.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+_START = time.perf_counter()
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--json", help="Append the results as one JSON line to this file")
+    args = parser.parse_args()
+
+    import app
+
+    root = app.build_app()
+    root.update()
+    first_window = time.perf_counter() - _START
+    heavy_loaded = sorted(m for m in ("pandas", "fpdf", "tkcalendar", "openpyxl") if m in sys.modules)
+
+    notebook = root.nametowidget(root.winfo_children()[0])
+    for tab_id in notebook.tabs()[1:]:
+        notebook.select(tab_id)
+        root.update()
+
+    root.destroy()
+
+    results = {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "time_to_first_window_s": round(first_window, 4),
+        "heavy_modules_before_first_window": heavy_loaded,
+        "tab_build_s": {title: round(t, 4) for title, t in root.tab_build_times.items()},
+    }
+
+    print(f"Time to first window: {results['time_to_first_window_s']:.3f}s")
+    print(f"Heavy modules loaded before first window: {', '.join(heavy_loaded) or 'none'}")
+    for title, t in results["tab_build_s"].items():
+        print(f"  {title:<28} {t:.3f}s")
+
+    if args.json:
+        with open(args.json, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(results, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+# benchmarks/run_pipelines.py
+"""
+End-to-end benchmark of every import pipeline, headless: read the synthetic
+input the way the tab does, transform it, write the output. Reports wall
+time, input rows per second and peak traced memory for each pipeline/size.
+
+    python benchmarks/run_pipelines.py --rows 1000 100000 --json results.jsonl
+    python benchmarks/run_pipelines.py --only bidmaster everlytic --rows 1000000
+
+Inputs are generated into --data (kept between runs, so a 1M-row workbook is
+written once). Reads bypass the parse cache so every run is a cold parse.
+Memory is measured in a second, traced run because tracemalloc slows pandas
+down; --no-memory skips it.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import synthetic  # noqa: E402
+from modules.bidmaster_transform import (  # noqa: E402
+    read_detail_profit_report, read_cashrecon_report, base_lines, write_invoice_import,
+)
+from modules.deposit_transform import build_deposit_import, export_frame  # noqa: E402
+from modules.diff_engine import normalize_for_compare, multiset_diff  # noqa: E402
+from modules.everlytic_transform import load_preview, build_export, monthly_aggregates  # noqa: E402
+from modules.evolution_schema import write_csv  # noqa: E402
+from modules.excel_io import read_sheet, NO_HEADER, PETTY_CASH  # noqa: E402
+from modules.fuzzy_match import propose_matches  # noqa: E402
+from modules.gl_transform import extract_gl_rows, build_customer_invoices, build_supplier_invoices  # noqa: E402
+from modules.petty_transform import transform_petty_or_ewallet  # noqa: E402
+from modules.requisition_pdf import prepare_refunds  # noqa: E402
+
+
+# ---------- Pipelines ----------
+# Each takes (inputs dict, output dir) and returns the number of input rows processed.
+def run_bidmaster(inputs, out):
+    invoice_df = read_detail_profit_report(inputs["detail_profit"])
+    cash_df = read_cashrecon_report(inputs["cash_recon"])
+    base = base_lines(invoice_df, cash_df, "1249", "01/09/2025")
+    write_invoice_import(base, 12.5, "BLM", "015", os.path.join(out, "Inv_Invoice Import.csv"))
+    return len(invoice_df)
+
+
+def run_gl(inputs, out):
+    raw = read_sheet(inputs["gl_transactions"], layout=NO_HEADER)
+    customer = build_customer_invoices(extract_gl_rows(raw), "01/09/2025")
+    write_csv(customer, os.path.join(out, "Inv_InvoiceCustomer.csv"))
+    write_csv(build_supplier_invoices(customer), os.path.join(out, "Inv_InvoiceSupplier.csv"))
+    return len(raw)
+
+
+def _run_petty(key):
+    def run(inputs, out):
+        df = read_sheet(inputs[key], layout=PETTY_CASH)
+        write_csv(transform_petty_or_ewallet(df), os.path.join(out, f"{key}_import.csv"), encoding="utf-8-sig")
+        return len(df)
+    return run
+
+
+def run_deposits(inputs, out):
+    df = read_sheet(inputs["deposits_9500"])
+    write_csv(export_frame(build_deposit_import(df)), os.path.join(out, "deposit_import.csv"))
+    return len(df)
+
+
+def run_compare(inputs, out):
+    df_a = read_sheet(inputs["9500_A"])
+    df_b = read_sheet(inputs["9500_B"])
+    only_a, only_b = multiset_diff(normalize_for_compare(df_a), normalize_for_compare(df_b))
+    propose_matches(only_a, only_b)
+    return len(df_a) + len(df_b)
+
+
+def run_everlytic(inputs, out):
+    preview, _, _ = load_preview(inputs["everlytic_log"])
+    build_export(preview, "EV0125").to_csv(os.path.join(out, "everlytic_accounting.csv"), index=False)
+    return len(preview)
+
+
+def run_everlytic_monthly(inputs, out):
+    monthly = monthly_aggregates(inputs["everlytic_log"])
+    return int(monthly["Messages"].sum())
+
+
+def run_refunds(inputs, out):
+    """Load + Balance clean-up as on the Requisitions tab; PDF rendering has its own timing in the tab."""
+    total = 0
+    for key, kind in (("customer_refunds", "customer"), ("supplier_refunds", "supplier")):
+        df = prepare_refunds(read_sheet(inputs[key]), kind)
+        total += len(df)
+    return total
+
+
+# name -> (input files, runner)
+PIPELINES = {
+    "bidmaster": (["detail_profit", "cash_recon"], run_bidmaster),
+    "gl": (["gl_transactions"], run_gl),
+    "petty_cash": (["petty_cash"], _run_petty("petty_cash")),
+    "ewallet": (["ewallet"], _run_petty("ewallet")),
+    "deposits": (["deposits_9500"], run_deposits),
+    "compare9500": (["9500_A", "9500_B"], run_compare),
+    "everlytic": (["everlytic_log"], run_everlytic),
+    "everlytic_monthly": (["everlytic_log"], run_everlytic_monthly),
+    "refunds": (["customer_refunds", "supplier_refunds"], run_refunds),
+}
+
+
+# ---------- Inputs ----------
+# Input key -> synthetic.WRITERS file name; the 9500 pair is written together
+_FILES = {name.split(".")[0]: name for name in synthetic.WRITERS}
+_FILES.update({"9500_A": "9500_A.xlsx", "9500_B": "9500_B.xlsx"})
+
+
+def ensure_inputs(keys, data_dir, rows, seed=0) -> dict:
+    """Paths of the synthetic files for `keys`, writing any that don't exist yet."""
+    paths = {key: os.path.join(data_dir, f"{rows}_{seed}_{_FILES[key]}") for key in keys}
+    for key, path in paths.items():
+        if os.path.exists(path):
+            continue
+        if key in ("9500_A", "9500_B"):
+            synthetic.write_9500_pair(os.path.join(data_dir, f"{rows}_{seed}_9500_A.xlsx"),
+                                      os.path.join(data_dir, f"{rows}_{seed}_9500_B.xlsx"), rows, seed)
+        else:
+            synthetic.WRITERS[_FILES[key]](path, rows, seed)
+    return paths
+
+
+# ---------- Measuring ----------
+def measure(runner, inputs, memory=True) -> dict:
+    with tempfile.TemporaryDirectory() as out:
+        start = time.perf_counter()
+        rows = runner(inputs, out)
+        seconds = time.perf_counter() - start
+
+        peak = None
+        if memory:
+            tracemalloc.start()
+            try:
+                runner(inputs, out)
+                peak = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+            finally:
+                tracemalloc.stop()
+    return {"rows": rows, "seconds": round(seconds, 4),
+            "rows_per_s": round(rows / seconds) if seconds else None,
+            "peak_mb": round(peak, 1) if peak is not None else None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--only", nargs="+", choices=list(PIPELINES), help="Run just these pipelines")
+    parser.add_argument("--data", default=os.path.join(tempfile.gettempdir(), "aucor_bench_data"),
+                        help="Where generated inputs are kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the traced run for peak memory")
+    parser.add_argument("--json", help="Append one JSON line per result to this file")
+    args = parser.parse_args()
+
+    os.makedirs(args.data, exist_ok=True)
+    names = args.only or list(PIPELINES)
+    print(f"{'pipeline':<18} {'size':>9} {'rows':>9} {'seconds':>9} {'rows/s':>11} {'peak MB':>8}")
+    for rows in args.rows:
+        for name in names:
+            keys, runner = PIPELINES[name]
+            inputs = ensure_inputs(keys, args.data, rows, args.seed)
+            result = measure(runner, inputs, memory=not args.no_memory)
+            peak = f"{result['peak_mb']:>8.1f}" if result["peak_mb"] is not None else f"{'-':>8}"
+            print(f"{name:<18} {rows:>9} {result['rows']:>9} {result['seconds']:>9.3f} "
+                  f"{result['rows_per_s'] or 0:>11,} {peak}")
+            if args.json:
+                record = {"pipeline": name, "size": rows, **result,
+                          "python": platform.python_version(), "at": datetime.now().isoformat(timespec="seconds")}
+                with open(args.json, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
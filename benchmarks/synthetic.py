@@ -0,0 +1,341 @@
+# benchmarks/synthetic.py
+"""
+Synthetic inputs in every format the app reads, for benchmarks and manual
+testing. Each make_* returns a DataFrame; each write_* writes the file the
+way the real export looks (banner rows, positional columns, ZA number
+formatting) and returns its path. Sizes are free: 1k to 1M rows all work,
+the .xlsx writers just take a while at the top end.
+
+    python benchmarks/synthetic.py --rows 100000 --out synthetic_data
+
+Everything is seeded, so the same (rows, seed) gives the same file.
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from modules.deposit_transform import NARRATION_PHRASES  # noqa: E402
+
+START = pd.Timestamp("2025-01-01")
+ITEMS = ["2010 FORD FIGO", "TOYOTA HILUX 3.0 D-4D", "CAT 320D EXCAVATOR", "BELL 1206 LOADER", "OFFICE CHAIRS (LOT OF 12)"]
+SURNAMES = ["SMITH", "MOKOENA", "VAN WYK", "NAIDOO", "DLAMINI", "O'BRIEN", "BOTHA", "NKOSI"]
+
+
+def _dates(rng, rows: int, days: int = 365) -> pd.DatetimeIndex:
+    return START + pd.to_timedelta(rng.integers(0, days, rows), unit="D")
+
+
+def _za_amounts(values: np.ndarray) -> pd.Series:
+    """7504.0 -> '7,504.00'"""
+    return pd.Series(values).map("{:,.2f}".format)
+
+
+def _write_xlsx(path, sheets: dict):
+    """
+    sheets: name -> (lead_rows, df, header). lead_rows are written verbatim
+    above the header (banners), df rows after it. Write-only openpyxl keeps
+    million-row sheets out of memory.
+    """
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    for name, (lead_rows, df, header) in sheets.items():
+        ws = wb.create_sheet(title=name)
+        for row in lead_rows:
+            ws.append(list(row))
+        if header:
+            ws.append([str(c) for c in df.columns])
+        for row in df.itertuples(index=False, name=None):
+            ws.append([None if isinstance(v, float) and np.isnan(v) else
+                       v.to_pydatetime() if isinstance(v, pd.Timestamp) else v for v in row])
+    wb.save(path)
+    return path
+
+
+# ---------- Bidmaster ----------
+def buyer_count(rows: int) -> int:
+    """Roughly 20 lots per buyer; Cash Recon and the profit report share this pool."""
+    return max(rows // 20, 10)
+
+
+def make_detail_profit(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Headerless 40-column Detailed Profit Report (M item, AA lot, AB buyer, AC notes, AF hammer price)."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({i: rng.integers(0, 1000, rows).astype(str) for i in range(40)})
+    df[12] = rng.choice(ITEMS, rows)
+    df[26] = pd.Series(rng.integers(1, 999, rows)).map("{:03d}".format)
+    df[27] = (1000 + rng.integers(0, buyer_count(rows), rows)).astype(str)
+    df[28] = rng.choice(["", 'Collect "before" Friday', "Keys, papers", "Buyer\\Agent"], rows)
+    df[31] = _za_amounts(rng.integers(1_000, 5_000_000, rows))
+    return df
+
+
+def write_detail_profit(path, rows: int, seed: int = 0):
+    make_detail_profit(rows, seed).to_csv(path, header=False, index=False, encoding="ISO-8859-1")
+    return path
+
+
+def make_cash_recon(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Headerless 26-column Cash Recon; U is the buyer nr ('1234:'), V the buyer name in capitals."""
+    rng = np.random.default_rng(seed + 1)
+    buyers = 1000 + np.arange(buyer_count(rows))
+    n = len(buyers) * 2     # a couple of payments per buyer
+    df = pd.DataFrame({i: rng.integers(0, 1000, n).astype(str) for i in range(26)})
+    df[19] = pd.Series(np.repeat(buyers, 2)).map("{}: ".format)
+    df[20] = [f" {SURNAMES[b % len(SURNAMES)]} TRADING {b} " for b in np.repeat(buyers, 2)]
+    return df
+
+
+def write_cash_recon(path, rows: int, seed: int = 0):
+    make_cash_recon(rows, seed).to_csv(path, header=False, index=False, encoding="ISO-8859-1")
+    return path
+
+
+# ---------- GL Account Transactions ----------
+def make_ledger(rows: int, per_section: int = 50, seed: int = 0) -> pd.DataFrame:
+    """Raw sheet as read with header=None: GL header, opening balance, transactions, total."""
+    rng = np.random.default_rng(seed)
+    out = []
+    dates = _dates(rng, rows)
+    for i in range(rows):
+        if i % per_section == 0:
+            gl = f"{rng.integers(1000, 9999)}/{rng.choice(['BLM', 'WB'])}/{rng.choice(['007', '005', '015'])}"
+            out.append([gl, "Recoveries", None, None, None, None, None])
+            out.append(["Opening Balance", None, None, None, None, None, 0.0])
+        debit = float(rng.integers(0, 100_000)) / 100
+        out.append([dates[i].to_pydatetime(), f"REF{i}", f"Expense line {i}", None,
+                    debit if i % 3 else 0.0, 0.0 if i % 3 else debit, 0.0])
+        if i % per_section == per_section - 1:
+            out.append(["Total", None, None, None, None, None, None])
+    return pd.DataFrame(out)
+
+
+def write_ledger(path, rows: int, seed: int = 0):
+    return _write_xlsx(path, {"Account Transactions": ((), make_ledger(rows, seed=seed), False)})
+
+
+# ---------- Petty cash / eWallet ----------
+PETTY_COLUMNS = ["Date", "Description", "Reference", "Pastel_Acc", "Amount_Paid", "Amount_Received", "VAT(Y/N)", "MyModule"]
+
+
+def make_petty(rows: int, seed: int = 0, ewallet: bool = False) -> pd.DataFrame:
+    """Template data rows: mostly payments, some receipts, blank references, a few non-date lines."""
+    rng = np.random.default_rng(seed)
+    amount = rng.integers(100, 500_000, rows) / 100
+    received = rng.random(rows) < 0.15
+    what = ["Fuel", "Stationery", "Courier", "Refreshments", "Parking"] if not ewallet else \
+        ["eWallet top-up", "Buyer refund", "Deposit transfer", "Bank charges"]
+    df = pd.DataFrame({
+        "Date": _dates(rng, rows),
+        "Description": rng.choice(what, rows),
+        "Reference": np.where(rng.random(rows) < 0.2, "", rng.integers(1, 99_999, rows).astype(str)),
+        "Pastel_Acc": rng.choice(["8002/BLM/027", "3020/BLM/005", "B1249/P1033", "4500/WB/015"], rows),
+        "Amount_Paid": np.where(received, np.nan, amount),
+        "Amount_Received": np.where(received, amount, np.nan),
+        "VAT(Y/N)": rng.choice(["Y", "N", "yes", "no"], rows),
+        "MyModule": rng.choice(["GL", "AR", "AP"], rows, p=[0.7, 0.2, 0.1]),
+    })
+    # Subtotal lines the transform has to drop
+    df.loc[::97, "Date"] = pd.NaT
+    return df
+
+
+def write_petty(path, rows: int, seed: int = 0, ewallet: bool = False):
+    """Header on row 4, two instruction rows after it, data from row 7 (excel_io.PETTY_CASH)."""
+    title = "E-Wallet Template" if ewallet else "Petty Cash Template"
+    lead = [(title,), ("Branch: Bloemfontein",), ()]
+    df = make_petty(rows, seed, ewallet)
+    instructions = pd.DataFrame([["dd/mm/yyyy", "What was bought", "Slip nr", "GL or customer", "", "", "Y/N", "GL/AR/AP"],
+                                 [None] * len(PETTY_COLUMNS)], columns=PETTY_COLUMNS)
+    return _write_xlsx(path, {"Sheet1": (lead, pd.concat([instructions, df], ignore_index=True), True)})
+
+
+# ---------- 9500 deposits / compare ----------
+def make_narrations(rows: int, seed: int = 0) -> pd.Series:
+    """Multi-month bank export narrations: a channel prefix (or none) + payer/reference."""
+    rng = np.random.default_rng(seed)
+    prefixes = np.array(list(NARRATION_PHRASES) + ["", "MAGTAPE CREDIT"])
+    names = np.array(["J SMITH B1249", "MOKOENA DEP", "VAN WYK 88812", "PTY LTD INV 4471", "N NAIDOO"])
+    prefix = prefixes[rng.integers(0, len(prefixes), rows)]
+    name = names[rng.integers(0, len(names), rows)]
+    return pd.Series(np.char.add(np.char.add(prefix, " "), name), dtype=object)
+
+
+def make_deposits(rows: int, seed: int = 0) -> pd.DataFrame:
+    """One 9500 deposit sheet: Date, Description, Credit, Code, Reference."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Date": _dates(rng, rows),
+        "Description": make_narrations(rows, seed),
+        "Credit": rng.integers(100, 5_000_000, rows) / 100,
+        "Code": rng.choice(["B1249", "B1250", "DEP", "P"], rows),
+        "Reference": rng.integers(1, 99_999, rows).astype(float),
+    })
+
+
+def write_deposits(path, rows: int, seed: int = 0, sheets: int = 1):
+    """Deposit workbook with `sheets` monthly sheets sharing the rows."""
+    per_sheet = -(-rows // sheets)
+    return _write_xlsx(path, {
+        f"Month {i + 1}": ((), make_deposits(min(per_sheet, rows - i * per_sheet), seed + i), True)
+        for i in range(sheets)
+    })
+
+
+def make_9500_pair(rows: int, seed: int = 0):
+    """Evolution (A) and recon (B) exports sharing ~98% of their rows, with some duplicates."""
+    rng = np.random.default_rng(seed)
+    amounts = rng.integers(100, 5_000_000, rows) / 100
+    is_credit = rng.random(rows) < 0.7
+    a = pd.DataFrame({
+        "Date": _dates(rng, rows),
+        "Reference 2": rng.integers(1, 10_000, rows).astype(str),
+        "Code": rng.choice(["DEP", "EFT", "CASH", "TRF"], rows),
+        "Reference": rng.integers(1, 999_999, rows).astype(str),
+        "Description": rng.choice(["FNB APP PAYMENT", "CAPITEC", "ACB CREDIT", "PayShap"], rows),
+        "Debit": np.where(is_credit, 0.0, amounts),
+        "Credit": np.where(is_credit, amounts, 0.0),
+    })
+    # Book ~1% of A twice so duplicate handling is exercised
+    a = pd.concat([a, a.sample(frac=0.01, random_state=seed)], ignore_index=True)
+
+    b = a.sample(frac=0.98, random_state=seed + 1)
+    extra = a.sample(frac=0.01, random_state=seed + 2).assign(Reference="X")
+    b = pd.concat([b, extra], ignore_index=True)
+    return a, b
+
+
+def write_9500_pair(path_a, path_b, rows: int, seed: int = 0):
+    a, b = make_9500_pair(rows, seed)
+    _write_xlsx(path_a, {"Evolution": ((), a, True)})
+    _write_xlsx(path_b, {"Recon": ((), b, True)})
+    return path_a, path_b
+
+
+# ---------- Everlytic ----------
+EVERLYTIC_HEADER = [
+    "Customer Name", "Archive ID", "Message ID", "Message Subject", "Message Type",
+    "Google Analytics Source Tag", "Google Analytics Campaign Tag", "Google Analytics Medium Tag",
+    "Custom Tracking Tag", "Message Description", "Message Filter", "Send Date", "Emails Sent",
+    "SMSs credit used", "Sms Sent", "", "Total Transactional", "Failed Transactional", "Reads",
+    "Unique Reads", "Clicks", "Unique Clicks", "Bounces", "Complaints", "Forwards", "Unsubscribes",
+    "Click Rate", "Read Rate", "Bounce rate", "Complaint Rate", "Unsubscribe Rate",
+]
+BRANCHES = ["Aucor Bloemfontein", "Aucor eMalahleni", "Aucor Gauteng", "Aucor Mining"]
+
+
+def _za_count(values: np.ndarray) -> pd.Series:
+    """Accounting style: ' 7,176 ' and ' -   ' for zero."""
+    return pd.Series(values).map(lambda v: f" {v:,} " if v else " -   ")
+
+
+def make_everlytic(rows: int, seed: int = 0, months: int = 1, repeat_header_every: int = 5_000) -> pd.DataFrame:
+    """Message rows grouped under branch banner lines, with the header reprinted now and then."""
+    rng = np.random.default_rng(seed)
+    credits = rng.integers(0, 8_000, rows)
+    sent = (credits * rng.uniform(0.9, 1.0, rows)).astype(int)
+    send = START + pd.to_timedelta(rng.integers(0, 30 * months * 24 * 60, rows), unit="min")
+    send = send.sort_values()
+    subjects = [f"{d:%d.%m.%Y} - {rng.choice(BRANCHES)}" for d in send]
+    df = pd.DataFrame({c: "" for c in EVERLYTIC_HEADER}, index=range(rows))
+    df.columns = range(len(EVERLYTIC_HEADER))
+    df[1] = rng.integers(9_000_000, 9_999_999, rows).astype(str)
+    df[2] = rng.integers(500_000, 599_999, rows).astype(str)
+    df[3] = subjects
+    df[4] = "sms"
+    df[9] = subjects
+    df[11] = send.strftime("%Y/%m/%d %H:%M")
+    df[12] = "0"
+    df[13] = _za_count(credits).to_numpy()
+    df[14] = _za_count(sent).to_numpy()
+    df[15] = _za_amounts(credits * 0.14).to_numpy()
+
+    # A branch banner (name, no send date) every ~200 messages, header reprints every repeat_header_every
+    blocks = []
+    for start in range(0, rows, 200):
+        banner = pd.DataFrame([[BRANCHES[(start // 200) % len(BRANCHES)]] + [""] * (len(EVERLYTIC_HEADER) - 1)])
+        blocks.append(banner)
+        if start and repeat_header_every and start % repeat_header_every == 0:
+            blocks.append(pd.DataFrame([EVERLYTIC_HEADER]))
+        blocks.append(df.iloc[start:start + 200])
+    return pd.concat(blocks, ignore_index=True)
+
+
+def write_everlytic(path, rows: int, seed: int = 0, months: int = 1):
+    """CSV as exported: period banner, header, account total line, then the message log."""
+    end = START + pd.DateOffset(months=months) - pd.Timedelta(days=1)
+    df = make_everlytic(rows, seed, months)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(f"Account logs for period {START:%Y-%m-%d} to {end:%Y-%m-%d}" + "," * (len(EVERLYTIC_HEADER) - 1) + "\n")
+        pd.DataFrame([EVERLYTIC_HEADER]).to_csv(f, header=False, index=False)
+        pd.DataFrame([["Aucor"] + [""] * (len(EVERLYTIC_HEADER) - 1)]).to_csv(f, header=False, index=False)
+        df.to_csv(f, header=False, index=False)
+    return path
+
+
+# ---------- Refund lists (payment requisitions) ----------
+def make_refunds(rows: int, seed: int = 0, supplier: bool = False) -> pd.DataFrame:
+    """Customer or supplier refund list; Balance is text like 'R-1,234.56' as the debtors export has it."""
+    rng = np.random.default_rng(seed)
+    group = rng.integers(1200, 1300, rows)
+    balance = -rng.integers(10_000, 50_000_000, rows) / 100
+    df = pd.DataFrame({
+        "Group": group.astype(str),
+        "Group Description": [f"Auction {g}" for g in group],
+        "Supplier" if supplier else "Customer": [f"B{g}/P{i}" for i, g in enumerate(group)],
+        "Name": rng.choice(SURNAMES, rows),
+    })
+    if supplier:
+        df["Bank Name"] = rng.choice(["FNB", "ABSA", "Capitec", None], rows)
+        df["Bank Branch Code"] = rng.choice(["250655", "632005", "470010"], rows)
+        df["Bank Account No"] = rng.integers(10**9, 10**10, rows).astype(str)
+    else:
+        df["Customer Description"] = rng.choice(["", "PTY LTD", "CC"], rows)
+        df["Telephone 1"] = rng.integers(600_000_000, 899_999_999, rows).astype(float)
+        df["E-mail"] = [f"buyer{i}@example.co.za" for i in range(rows)]
+    df["Balance"] = ("R" + _za_amounts(-balance if supplier else balance)).to_numpy()
+    return df
+
+
+def write_refunds(path, rows: int, seed: int = 0, supplier: bool = False):
+    return _write_xlsx(path, {"Sheet1": ((), make_refunds(rows, seed, supplier), True)})
+
+
+# ---------- CLI ----------
+WRITERS = {
+    "detail_profit.csv": write_detail_profit,
+    "cash_recon.csv": write_cash_recon,
+    "gl_transactions.xlsx": write_ledger,
+    "petty_cash.xlsx": write_petty,
+    "ewallet.xlsx": lambda path, rows, seed=0: write_petty(path, rows, seed, ewallet=True),
+    "deposits_9500.xlsx": write_deposits,
+    "everlytic_log.csv": write_everlytic,
+    "customer_refunds.xlsx": write_refunds,
+    "supplier_refunds.xlsx": lambda path, rows, seed=0: write_refunds(path, rows, seed, supplier=True),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="synthetic_data")
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    for name, write in WRITERS.items():
+        path = os.path.join(args.out, f"{args.rows}_{name}")
+        write(path, args.rows, args.seed)
+        print(f"{path}  {os.path.getsize(path) / 1024 ** 2:.1f} MB")
+    write_9500_pair(os.path.join(args.out, f"{args.rows}_9500_A.xlsx"),
+                    os.path.join(args.out, f"{args.rows}_9500_B.xlsx"), args.rows, args.seed)
+    print(f"{os.path.join(args.out, f'{args.rows}_9500_[AB].xlsx')}")
+
+
+if __name__ == "__main__":
+    main()
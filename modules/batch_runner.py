@@ -0,0 +1,208 @@
+# modules/batch_runner.py
+"""
+Month-end batch: run every job listed in a manifest in parallel and write the
+outputs to one dated folder, with a summary report.
+
+    python -m modules.batch_runner month_end.json
+    python -m modules.batch_runner month_end.yaml --date 2025-09-30 --workers 4
+
+Manifest (JSON, or YAML when PyYAML is installed). Each job names a CLI
+command (see modules.cli) and its options by argument name; relative paths
+are relative to the manifest's folder.
+
+    {
+      "out_dir": "month_end",
+      "jobs": [
+        {"name": "petty BLM", "command": "petty-cash", "templates": ["petty/BLM"]},
+        {"name": "deposits", "command": "deposits", "workbook": "9500 Sept.xlsx", "all_sheets": true},
+        {"name": "auction 1249", "command": "bidmaster", "profit": "1249 profit.csv",
+         "cash": "1249 cash.csv", "branch": "Bloemfontein", "auction": "1249",
+         "department": "Bfn Vehicles", "commission": 12.5, "date": "01/09/2025"},
+        {"name": "refunds", "command": "requisitions", "refunds": "refunds.xlsx",
+         "kind": "customer", "user": "Jane Smith"}
+      ]
+    }
+
+Outputs go to <out_dir>/<date>/<job name>/ unless a job sets its own output
+option. The whole batch takes about as long as its slowest job.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+
+from modules import cli
+from modules.bidmaster_transform import IMPORT_FILE
+
+# command -> (output option, default file name; "" for options that take a folder)
+OUTPUTS = {
+    "bidmaster": ("out", IMPORT_FILE),
+    "gl-extract": ("out_dir", ""),
+    "deposits": ("out", "deposit_import.csv"),
+    "petty-cash": ("out", "cashbook_import.csv"),
+    "compare9500": ("out_dir", ""),
+    "everlytic": ("out", "everlytic_accounting.csv"),
+    "requisitions": ("out_dir", ""),
+}
+SUMMARY_FILE = "summary"    # .json and .csv in the dated folder
+# Options (argument dests, across all commands) that name files or folders;
+# relative ones are taken relative to the manifest's folder
+PATH_OPTIONS = {"profit", "cash", "ledger", "workbook", "templates", "a", "b", "report", "refunds", "out", "out_dir"}
+
+
+# ---------- Manifest ----------
+def load_manifest(path) -> dict:
+    with open(path, encoding="utf-8") as f:
+        if os.path.splitext(str(path))[1].lower() in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("YAML manifests need the PyYAML package; use JSON instead")
+            manifest = yaml.safe_load(f)
+        else:
+            manifest = json.load(f)
+    if not isinstance(manifest, dict) or not manifest.get("jobs"):
+        raise ValueError(f"{path}: manifest has no jobs")
+    return manifest
+
+
+def _folder_name(name: str) -> str:
+    return re.sub(r'[<>:"/\\|?*]+', "_", name).strip() or "job"
+
+
+def _resolve_paths(options: dict, base: str) -> dict:
+    """PATH_OPTIONS made absolute against base (the manifest's folder); other options as given."""
+    def absolute(value):
+        return os.path.join(base, os.path.expanduser(str(value)))    # join keeps absolute values as they are
+
+    resolved = dict(options)
+    for dest in PATH_OPTIONS & set(options):
+        value = options[dest]
+        if isinstance(value, (list, tuple)):
+            resolved[dest] = [absolute(v) for v in value]
+        elif value is not None and not isinstance(value, bool):
+            resolved[dest] = absolute(value)
+    return resolved
+
+
+def plan(manifest: dict, out_dir: str, base: str = ".") -> list:
+    """
+    (name, parsed args, job folder) per job, with outputs defaulting to the job
+    folder and relative paths resolved against base, so jobs never depend on the
+    working folder. Every job is validated here, so a typo fails the batch
+    before anything runs.
+    """
+    parser = cli.build_parser()
+    jobs, names = [], set()
+    for i, entry in enumerate(manifest["jobs"], 1):
+        options = dict(entry)
+        command = options.pop("command", None)
+        name = str(options.pop("name", f"{i} {command}"))
+        if name in names:
+            raise ValueError(f"Duplicate job name '{name}'")
+        names.add(name)
+
+        job_dir = os.path.join(out_dir, _folder_name(name))
+        options = _resolve_paths(options, base)
+        option, file_name = OUTPUTS.get(command, (None, None))
+        if option and not options.get(option):
+            options[option] = os.path.join(job_dir, file_name) if file_name else job_dir
+        try:
+            args = parser.parse_args(cli.command_argv(parser, command, options))
+        except SystemExit:      # argparse has already printed why
+            raise ValueError(f"Job '{name}': invalid options for {command}")
+        jobs.append((name, args, job_dir))
+    return jobs
+
+
+# ---------- Running ----------
+def _run_job(name, args, job_dir) -> dict:
+    """Worker: one job -> report row. Failures are reported, never raised, so other jobs carry on."""
+    os.makedirs(job_dir, exist_ok=True)
+    start = time.perf_counter()
+    try:
+        summary, status = cli.run(args, label=f"batch {name}"), "ok"
+    except Exception as e:
+        summary, status = {}, f"{type(e).__name__}: {e}"
+    row = {"job": name, "command": args.command, "status": status,
+           "seconds": round(time.perf_counter() - start, 2)}
+    # A command's own summary never overrides the report columns (requisitions has a 'seconds' line)
+    row.update((key, value) for key, value in summary.items() if key not in row)
+    return row
+
+
+def run_batch(manifest_path, out_root=None, run_date=None, workers=None, progress=None) -> dict:
+    """
+    Run every job of the manifest on a process pool. progress(row) is called
+    as each job finishes. Returns the report that is also written to
+    <out_root>/<date>/summary.json and summary.csv.
+    """
+    manifest_path = os.path.abspath(manifest_path)
+    base = os.path.dirname(manifest_path)
+    manifest = load_manifest(manifest_path)
+    out_root = os.path.join(base, out_root or manifest.get("out_dir", "batch_output"))
+    out_dir = os.path.join(out_root, run_date or str(manifest.get("date") or date.today().isoformat()))
+
+    jobs = plan(manifest, out_dir, base)
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or manifest.get("workers") or min(os.cpu_count() or 1, len(jobs))
+    start = time.perf_counter()
+    rows = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_job, name, args, job_dir) for name, args, job_dir in jobs]
+        for future in as_completed(futures):
+            row = future.result()
+            rows[row["job"]] = row
+            if progress:
+                progress(row)
+    wall = time.perf_counter() - start
+
+    report = {
+        "manifest": manifest_path, "output": out_dir, "workers": workers,
+        "seconds": round(wall, 2), "job_seconds": round(sum(r["seconds"] for r in rows.values()), 2),
+        "failed": sum(r["status"] != "ok" for r in rows.values()),
+        "jobs": [rows[name] for name, _, _ in jobs],
+    }
+    write_report(report, out_dir)
+    return report
+
+
+def write_report(report: dict, out_dir: str):
+    import pandas as pd
+    with open(os.path.join(out_dir, SUMMARY_FILE + ".json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=str)
+    # convert_dtypes keeps counts as integers where other jobs left the column blank
+    pd.DataFrame(report["jobs"]).convert_dtypes().to_csv(os.path.join(out_dir, SUMMARY_FILE + ".csv"), index=False)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m modules.batch_runner", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("manifest")
+    parser.add_argument("--out-dir", help="Root for the dated output folder (default: manifest out_dir)")
+    parser.add_argument("--date", help="Name of the dated folder (default: today, YYYY-MM-DD)")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args(argv)
+
+    def show(row):
+        detail = row["status"] if row["status"] != "ok" else \
+            ", ".join(f"{k} {v}" for k, v in row.items() if k not in ("job", "command", "status", "seconds", "output"))
+        print(f"{row['job']:<24} {row['seconds']:>8.1f}s  {detail}")
+
+    try:
+        report = run_batch(args.manifest, args.out_dir, args.date, args.workers, progress=show)
+    except (ValueError, OSError) as e:
+        print(f"batch: error: {e}", file=sys.stderr)
+        return 1
+    print(f"\n{len(report['jobs'])} jobs in {report['seconds']:.1f}s "
+          f"({report['job_seconds']:.1f}s of work, {report['workers']} workers), {report['failed']} failed")
+    print(f"Output: {report['output']}")
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
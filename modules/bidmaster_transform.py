@@ -0,0 +1,169 @@
+# modules/bidmaster_transform.py
+import numpy as np
+import pandas as pd
+
+from modules.evolution_schema import SALES_INVOICE, CHUNK_ROWS, iter_chunks, write_csv_chunks
+
+try:
+    import pyarrow  # noqa: F401
+    TEXT_DTYPE = "string[pyarrow]"
+except ImportError:
+    TEXT_DTYPE = str
+
+REPORT_ENCODING = "ISO-8859-1"
+
+# ---------- Report schemas ----------
+# Detailed Profit Report: 36 positional columns named like spreadsheet letters A..Z, AA..AJ
+DETAIL_PROFIT_COLUMNS = [chr(i) for i in range(65, 91)] + [f"A{chr(i)}" for i in range(65, 75)]
+# Only these feed the invoice lines: M = item, AA = lot nr, AB = buyer nr, AC = notes, AF = hammer price
+DETAIL_PROFIT_USECOLS = ["M", "AA", "AB", "AC", "AF"]
+
+# Cash Recon: 26 positional columns; U and V carry the buyer number and name
+CASHRECON_COLUMNS = [
+    "A","B","C","D","E","F","G","H","I","J",
+    "K","L","M","N","O","P","Q","R","S","buyer_nr",
+    "aDescription","V","W","X","Y","Z"
+]
+CASHRECON_USECOLS = ["buyer_nr", "aDescription"]
+
+
+def parse_amount(values: pd.Series) -> pd.Series:
+    """
+    Report amounts -> float, as the old reader parsed them: '.' is the decimal
+    point and spaces or commas are thousands separators ('1 234.50' and
+    '1,234.50' -> 1234.5). A decimal comma is not supported ('1 234,00' ->
+    123400.0). Empty cells stay NaN; cells of only spaces read as 0.
+    """
+    cleaned = values.astype(str).str.replace(r"[ ,]", "", regex=True)
+    cleaned = cleaned.where(values.ne(""), np.nan).replace("", "0")
+    return pd.to_numeric(cleaned).astype(float)
+
+
+def _read_report(path, columns, usecols) -> pd.DataFrame:
+    """
+    Read a headerless Bidmaster CSV export as text, keeping only `usecols`.
+
+    Columns are picked by position with the C parser, which also copes with
+    report lines that run past the last column we need.
+    """
+    positions = [columns.index(c) for c in usecols]
+    df = pd.read_csv(
+        path,
+        header=None,
+        usecols=positions,
+        dtype=TEXT_DTYPE,
+        keep_default_na=False,
+        encoding=REPORT_ENCODING,
+        engine="c",
+    )
+    df = df[positions]
+    df.columns = usecols
+    return df
+
+
+def read_detail_profit_report(path) -> pd.DataFrame:
+    df = _read_report(path, DETAIL_PROFIT_COLUMNS, DETAIL_PROFIT_USECOLS)
+    df["AF"] = parse_amount(df["AF"])
+    return df
+
+
+def read_cashrecon_report(path) -> pd.DataFrame:
+    df = _read_report(path, CASHRECON_COLUMNS, CASHRECON_USECOLS)
+    df["buyer_nr"] = df["buyer_nr"].astype(str).str.replace(":", "", regex=False).str.strip()
+    df["aDescription"] = df["aDescription"].astype(str).str.strip().str.title()
+    return df
+
+
+# ---------- Invoice lines ----------
+# Branch GL segment and department code of the commission/doc-fee accounts
+BRANCH_GL = {"Bloemfontein": "BLM", "Witbank": "WB"}
+DEPARTMENT_CODES = {
+    "Bfn Mining": "005",
+    "Bfn Warehouse": "007",
+    "Bfn Vehicles": "015",
+    "Witbank Mining": "005",
+    "Witbank Vehicles": "015",
+    "Bfn Gov & Other": "010",
+    "Witbank Gov & Other": "010",
+}
+
+IMPORT_FILE = "Inv_Invoice Import.csv"
+DOCFEE_PRICE = 2600.0   # float so doc-fee lines print "2600.0" like the other prices
+_NOTES_STRIP = str.maketrans({'"': '', "'": '', ',': '', '\\': ''})
+
+
+def base_lines(invoice_df: pd.DataFrame, cash_df: pd.DataFrame, auction_code: str, inv_date: str) -> pd.DataFrame:
+    """One sales line per lot of the Detailed Profit Report, billed to the buyer's account."""
+    buyer_nr = invoice_df["AB"].astype(str).str.strip()
+    buyers = cash_df.drop_duplicates("buyer_nr").set_index("buyer_nr")["aDescription"]
+    account_id = 'B' + auction_code + "/P" + buyer_nr
+    return SALES_INVOICE.build(invoice_df.index, {
+        "DocType": "4",
+        "AccountID": account_id,
+        "aDescription": buyer_nr.map(buyers).fillna("Buyer Unknown"),
+        "InvDate": inv_date,
+        "TaxInclusive": "",
+        "OrderNum": account_id,
+        "cDescription": "Lot nr " + invoice_df["AA"].astype(str).str.strip() + " - " + invoice_df["M"].astype(str).str.strip(),
+        "CLIENTNOTES": invoice_df["AC"],
+        "fQuantity": "1",
+        "fQtyToProcess": "1",
+        "fUnitPriceExcl": invoice_df["AF"],  # already parsed to float by the reader
+        "iModule": "1",
+        "iStockCodeID": "",
+        "iLedgerAccountID": f"8010/BLM/005/{auction_code}",
+        "iTaxTypeID": "20",
+        "iWarehouseID": "MSTR",
+        "iPriceListNameID": "1",
+    })
+
+
+def commission_lines(lines: pd.DataFrame, commission: float, branch_gl: str, dept_code: str) -> pd.DataFrame:
+    """Buyer's commission on each base line; unchanged columns are shared with `lines`."""
+    return SALES_INVOICE.derive(lines, {
+        "fUnitPriceExcl": lines["fUnitPriceExcl"] * (commission / 100.0),
+        "iLedgerAccountID": f"1630/{branch_gl}/{dept_code}",
+        "iTaxTypeID": "1",
+        "CLIENTNOTES": "",
+        "cDescription": lines["cDescription"].str.replace(r" - .*$", f" - Buyers Commission @ {commission}%", regex=True),
+    })
+
+
+def docfee_lines(lines: pd.DataFrame, branch_gl: str, dept_code: str) -> pd.DataFrame:
+    """Documentation fee per commission line (taken from the commission lines, as Evolution expects)."""
+    return SALES_INVOICE.derive(lines, {
+        "fUnitPriceExcl": DOCFEE_PRICE,
+        "iLedgerAccountID": f"1990/{branch_gl}/{dept_code}",
+        "cDescription": lines["cDescription"].str.replace(r"\s*-\s*.*$", " - Documentation Fee", regex=True),
+    })
+
+
+def _clean_notes(lines: pd.DataFrame) -> pd.DataFrame:
+    notes = lines["CLIENTNOTES"]
+    return SALES_INVOICE.derive(lines, {
+        "CLIENTNOTES": notes.fillna("").astype(str).str.translate(_NOTES_STRIP),
+    })
+
+
+def iter_invoice_lines(base: pd.DataFrame, commission: float, branch_gl: str, dept_code: str,
+                       chunksize: int = CHUNK_ROWS):
+    """
+    All base lines, then all commission lines, then all doc-fee lines, as
+    chunks derived from `base` on the fly. Same rows and order as concatenating
+    the three full frames, but only one chunk of each derived kind exists at a time.
+    """
+    for chunk in iter_chunks(base, chunksize):
+        yield _clean_notes(chunk)
+    for chunk in iter_chunks(base, chunksize):
+        yield _clean_notes(commission_lines(chunk, commission, branch_gl, dept_code))
+    for chunk in iter_chunks(base, chunksize):
+        comm = commission_lines(chunk, commission, branch_gl, dept_code)
+        yield _clean_notes(docfee_lines(comm, branch_gl, dept_code))
+
+
+def write_invoice_import(base: pd.DataFrame, commission: float, branch_gl: str, dept_code: str,
+                         path: str = IMPORT_FILE, chunksize: int = CHUNK_ROWS) -> str:
+    """Stream base + commission + doc-fee lines to the Evolution invoice import CSV."""
+    write_csv_chunks(iter_invoice_lines(base, commission, branch_gl, dept_code, chunksize),
+                     path, encoding="utf-8-sig")
+    return path
@@ -4,18 +4,17 @@ from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
 from tkcalendar import DateEntry
 
+from modules.jobs import JobRunner
+from modules import perf
+from modules.bidmaster_transform import (
+    read_detail_profit_report, read_cashrecon_report, base_lines, write_invoice_import,
+    BRANCH_GL, DEPARTMENT_CODES,
+)
+from modules.export_ledger import ExportLedger, describe as describe_repeats, REPEATS_PROMPT
+
 BLOEMFONTEIN = 1
 WITBANK = 2
 
-DEPARTMENT_CODES = {
-    "Bfn Mining": "005",
-    "Bfn Warehouse": "007",
-    "Bfn Vehicles": "015",
-    "Witbank Mining": "005",
-    "Witbank Vehicles": "015",
-    "Bfn Gov & Other": "010",
-    "Witbank Gov & Other": "010",
-}
 
 class BidmasterSalesApp:
     def __init__(self, parent):
@@ -87,6 +86,9 @@ class BidmasterSalesApp:
         # Proceed button
         ttk.Button(self.parent, text="🚀 Proceed", command=self.button_proceed_function).pack(pady=10)
 
+        self.jobs = JobRunner(self.parent, name="Bidmaster")
+        self.jobs.pack(fill="x", padx=10, pady=5)
+
     def validate_inputs(self):
         if not self.radio_state.get():
             messagebox.showerror("Error", "Please select a location.")
@@ -118,89 +120,52 @@ class BidmasterSalesApp:
         self.chosen_commission = commission
         return True
 
-    def detail_profit_report(self):
-        path = filedialog.askopenfilename(filetypes=[("CSV Files", "*.csv")])
-        if not path: return None
-        df = pd.read_csv(path, header=None, encoding="ISO-8859-1", engine="python").iloc[:, :36]
-        headers = [chr(i) for i in range(65, 91)] + [f"A{chr(i)}" for i in range(65, 75)]
-        df.columns = headers
-        return df
-
-    def cashrecon_report(self):
-        path = filedialog.askopenfilename(filetypes=[("CSV Files", "*.csv")])
-        if not path: return None
-        df = pd.read_csv(path, header=None, encoding="ISO-8859-1", engine="python").iloc[:, :26]
-        df.columns = [
-            "A","B","C","D","E","F","G","H","I","J",
-            "K","L","M","N","O","P","Q","R","S","buyer_nr",
-            "aDescription","V","W","X","Y","Z"
-        ]
-        df["buyer_nr"] = df["buyer_nr"].astype(str).str.replace(":", "", regex=False).str.strip()
-        df["aDescription"] = df["aDescription"].astype(str).str.strip().str.title()
-        return df
-
     def convert_file(self, invoice_df, extracted_df):
-        branch_letter = "B" if self.chosen_location == BLOEMFONTEIN else "W"
-        branch_gl = "BLM" if self.chosen_location == BLOEMFONTEIN else "WB"
-        invoice_df["AF"] = invoice_df["AF"].astype(str).str.replace(" ", "", regex=False).str.replace(",", "", regex=False).replace("", "0")
-        invoice_df["fUnitPriceExcl"] = invoice_df["AF"].astype(float)
-        invoice_df["AB"] = invoice_df["AB"].astype(str).str.strip()
-        merged_df = pd.merge(invoice_df, extracted_df[["buyer_nr", "aDescription"]], left_on="AB", right_on="buyer_nr", how="left")
-        invoice_df["aDescription"] = merged_df["aDescription"].fillna("Buyer Unknown")
-        invoice_df["DocType"] = "4"
-        invoice_df["AccountID"] = 'B' + self.chosen_auction_code + "/P" + invoice_df["AB"]
-        invoice_df["InvDate"] = self.date
-        invoice_df["TaxInclusive"] = ""
-        invoice_df["OrderNum"] = invoice_df["AccountID"]
-        invoice_df["cDescription"] = "Lot nr " + invoice_df["AA"].astype(str).str.strip() + " - " + invoice_df["M"].astype(str).str.strip()
-        invoice_df["CLIENTNOTES"] = invoice_df["AC"]
-        invoice_df["fQuantity"] = invoice_df["fQtyToProcess"] = "1"
-        invoice_df["iModule"] = "1"
-        invoice_df["iStockCodeID"] = ""
-        invoice_df["iLedgerAccountID"] = f"8010/BLM/005/{self.chosen_auction_code}"
-        invoice_df["iTaxTypeID"] = "20"
-        invoice_df["iWarehouseID"] = "MSTR"
-        invoice_df["iPriceListNameID"] = "1"
-        return invoice_df[[
-            "DocType","AccountID","aDescription","InvDate","TaxInclusive","OrderNum",
-            "cDescription","CLIENTNOTES","fQuantity","fQtyToProcess","fUnitPriceExcl",
-            "iModule","iStockCodeID","iLedgerAccountID","iTaxTypeID","iWarehouseID","iPriceListNameID"
-        ]]
-
-    def add_commission(self, df, branch_gl, dept_code):
-        out = df.copy()
-        out["fUnitPriceExcl"] *= (self.chosen_commission / 100.0)
-        out["iLedgerAccountID"] = f"1630/{branch_gl}/{dept_code}"
-        out["iTaxTypeID"] = "1"
-        out["CLIENTNOTES"] = ""
-        out["cDescription"] = out["cDescription"].str.replace(r" - .*$", f" - Buyers Commission @ {self.chosen_commission}%", regex=True)
-        return out
-
-    def add_docfee(self, df, branch_gl, dept_code):
-        out = df.copy()
-        out["fUnitPriceExcl"] = 2600
-        out["iLedgerAccountID"] = f"1990/{branch_gl}/{dept_code}"
-        out["cDescription"] = out["cDescription"].str.replace(r"\s*-\s*.*$", " - Documentation Fee", regex=True)
-        return out
-
-    def merge_dataframes(self, *dfs):
-        merged = pd.concat(dfs, ignore_index=True)
-        merged["CLIENTNOTES"] = merged["CLIENTNOTES"].fillna("").astype(str).str.translate(str.maketrans({'"': '', "'": '', ',': '', '\\': ''}))
-        merged.to_csv("Inv_Invoice Import.csv", index=False, encoding="utf-8-sig")
-        messagebox.showinfo("Done", "Invoice Import file created: 'Inv_Invoice Import.csv'")
+        return base_lines(invoice_df, extracted_df, self.chosen_auction_code, self.date)
 
     def button_proceed_function(self):
         if not self.validate_inputs():
             return
         if not messagebox.askyesno("Confirm", f"Proceed with {self.chosen_department} @ {self.chosen_commission}%?"):
             return
-        invoice_df = self.detail_profit_report()
-        if invoice_df is None: return
-        cash_df = self.cashrecon_report()
-        if cash_df is None: return
-        final_df = self.convert_file(invoice_df, cash_df)
-        branch_gl = "BLM" if self.chosen_location == BLOEMFONTEIN else "WB"
-        final_comm = self.add_commission(final_df, branch_gl, self.chosen_department_code)
-        final_docfee = self.add_docfee(final_comm, branch_gl, self.chosen_department_code)
-        self.merge_dataframes(final_df, final_comm, final_docfee)
- 
\ No newline at end of file
+        invoice_path = filedialog.askopenfilename(title="Detailed Profit Report", filetypes=[("CSV Files", "*.csv")])
+        if not invoice_path: return
+        cash_path = filedialog.askopenfilename(title="Cash Recon", filetypes=[("CSV Files", "*.csv")])
+        if not cash_path: return
+
+        ledger = ExportLedger()
+        branch_gl = BRANCH_GL["Bloemfontein" if self.chosen_location == BLOEMFONTEIN else "Witbank"]
+
+        def work(ctx):
+            with perf.stage("read") as s:
+                invoice_df = read_detail_profit_report(invoice_path)
+                cash_df = read_cashrecon_report(cash_path)
+                s.rows = len(invoice_df) + len(cash_df)
+            ctx.check()
+            with perf.stage("transform", rows=len(invoice_df)):
+                final_df = self.convert_file(invoice_df, cash_df)
+            # Commission and doc-fee lines follow from the base lines, so those are what is checked
+            with perf.stage("ledger check", rows=len(final_df)):
+                return final_df, ledger.check("bidmaster", final_df)
+
+        def checked(result):
+            final_df, previous = result
+            written = None      # all lines; else the mask of new lines, for the ledger
+            if previous.notna().any():
+                choice = messagebox.askyesnocancel("Already exported", describe_repeats(previous) + REPEATS_PROMPT)
+                if choice is None:
+                    return
+                if choice:
+                    written = previous.isna()
+            self.jobs.run(lambda ctx: write(ctx, final_df, written), text="Writing invoice import...",
+                          on_done=lambda path: messagebox.showinfo("Done", f"Invoice Import file created: '{path}'"))
+
+        def write(ctx, final_df, written):
+            lines = final_df if written is None else final_df[written]
+            # Commission and doc-fee lines are derived from the base lines chunk by chunk while writing
+            with perf.stage("write", rows=3 * len(lines)):
+                path = write_invoice_import(lines, self.chosen_commission, branch_gl, self.chosen_department_code)
+                ledger.record("bidmaster", final_df, path, mask=written)
+            return path
+
+        self.jobs.run(work, text="Building invoice import...", on_done=checked)
@@ -0,0 +1,413 @@
+# modules/cli.py
+"""
+Command-line entry point: the same transforms the tabs run, driven by
+explicit arguments instead of dialogs. Never imports tkinter.
+
+    python -m modules.cli bidmaster --profit "Detail Profit.csv" --cash "Cash Recon.csv" \
+        --branch Bloemfontein --auction 1249 --department "Bfn Vehicles" --commission 12.5 --date 01/09/2025
+    python -m modules.cli gl-extract ledger.xlsx --date 30/09/2025
+    python -m modules.cli deposits "9500 Sept.xlsx" --all-sheets --out deposits.csv
+    python -m modules.cli petty-cash templates/ --out petty_import.csv
+    python -m modules.cli compare9500 evolution.xlsx recon.xlsx --columns 9 --out-dir results
+    python -m modules.cli everlytic "SMS AUG 2025.csv" --reference "EV{period:%m%y}"
+    python -m modules.cli requisitions refunds.xlsx --kind customer --user "Jane Smith"
+
+Each run is recorded in the perf log under the tab's name, so it shows on the
+Performance tab next to the GUI runs.
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import BrokenExecutor
+from datetime import datetime
+
+from modules import perf
+
+
+# ---------- Argument types ----------
+def _date(text: str) -> str:
+    """dd/mm/yyyy as the tabs' date pickers give it."""
+    try:
+        datetime.strptime(text, "%d/%m/%Y")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{text}' is not a dd/mm/yyyy date")
+    return text
+
+
+def _number(text: str) -> float:
+    try:
+        return float(text.replace(",", "."))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{text}' is not a number")
+
+
+def _auction_code(text: str) -> str:
+    if not text.strip().isdigit():
+        raise argparse.ArgumentTypeError("auction code must be numeric (without the 'B' or 'W')")
+    return text.strip()
+
+
+def _skip_repeats(kind: str, df, policy: str, summary: dict):
+    """
+    Check df against the export ledger. Lines exported before fail the run
+    (policy 'fail'), are left out ('skip') or written anyway ('keep').
+    Returns (lines to write, record); call record(path) once they are written.
+    """
+    from modules.export_ledger import ExportLedger, describe
+    ledger = ExportLedger()
+    with perf.stage("ledger check", rows=len(df)):
+        previous = ledger.check(kind, df)
+    repeats = int(previous.notna().sum())
+    if repeats:
+        if policy == "fail":
+            raise ValueError(describe(previous) + " Use --repeats skip or --repeats keep.")
+        summary[f"repeats {'skipped' if policy == 'skip' else 'kept'}"] = repeats
+    written = previous.isna() if repeats and policy == "skip" else None
+
+    def record(path):
+        # Occurrences are numbered over the whole checked frame, so it is recorded with the mask
+        ledger.record(kind, df, path, mask=written)
+
+    return (df if written is None else df[written]), record
+
+
+def _next_to(path, suffix: str) -> str:
+    """'C:/in/9500 Sept.xlsx' + '_deposits.csv' -> 'C:/in/9500 Sept_deposits.csv'"""
+    return os.path.splitext(str(path))[0] + suffix
+
+
+# ---------- Commands ----------
+# Each takes the parsed args and returns an ordered dict of summary lines.
+def run_bidmaster(args) -> dict:
+    from modules.bidmaster_transform import (
+        read_detail_profit_report, read_cashrecon_report, base_lines, write_invoice_import,
+        BRANCH_GL, DEPARTMENT_CODES,
+    )
+    with perf.stage("read") as s:
+        invoice_df = read_detail_profit_report(args.profit)
+        cash_df = read_cashrecon_report(args.cash)
+        s.rows = len(invoice_df) + len(cash_df)
+    with perf.stage("transform", rows=len(invoice_df)):
+        base = base_lines(invoice_df, cash_df, args.auction, args.date)
+    summary = {}
+    base, record = _skip_repeats("bidmaster", base, args.repeats, summary)
+    with perf.stage("write", rows=3 * len(base)):
+        path = write_invoice_import(base, args.commission, BRANCH_GL[args.branch],
+                                    DEPARTMENT_CODES[args.department], args.out)
+        record(path)
+    summary.update({"lots": len(base), "lines": 3 * len(base), "output": path})
+    return summary
+
+
+def run_gl_extract(args) -> dict:
+    from modules.excel_io import read_sheet_cached, NO_HEADER
+    from modules.gl_transform import extract_gl_rows, build_customer_invoices, build_supplier_invoices
+    from modules.evolution_schema import write_csv
+
+    with perf.stage("read") as s:
+        df, hit = read_sheet_cached(args.ledger, sheet=0, layout=NO_HEADER)
+        s.rows, s.extra["cache_hit"] = len(df), hit
+    with perf.stage("extract", rows=len(df)):
+        clean_df = extract_gl_rows(df)
+    with perf.stage("transform", rows=len(clean_df)):
+        customer_df = build_customer_invoices(clean_df, args.date)
+        supplier_df = build_supplier_invoices(customer_df)
+
+    out_dir = args.out_dir or os.path.dirname(os.path.abspath(args.ledger))
+    os.makedirs(out_dir, exist_ok=True)
+    cust_path = os.path.join(out_dir, "Inv_InvoiceCustomer.csv")
+    supp_path = os.path.join(out_dir, "Inv_InvoiceSupplier.csv")
+    with perf.stage("write", rows=len(customer_df) + len(supplier_df)):
+        write_csv(customer_df, cust_path)
+        write_csv(supplier_df, supp_path)
+    return {"ledger rows": len(df), "customer invoices": len(customer_df),
+            "supplier invoices": len(supplier_df), "output": f"{cust_path}, {supp_path}"}
+
+
+def run_deposits(args) -> dict:
+    import pandas as pd
+    from modules.excel_io import read_sheet_cached, sheet_names
+    from modules.deposit_transform import REQUIRED_COLUMNS, build_deposit_import, export_frame, load_all_sheets
+    from modules.evolution_schema import write_csv
+
+    summary = {}
+    if args.all_sheets:
+        with perf.stage("read + transform (all sheets)") as s:
+            df, skipped = load_all_sheets(args.workbook, workers=args.workers)
+            s.rows = len(df)
+        if df.empty:
+            raise ValueError(f"No sheet contains: {', '.join(REQUIRED_COLUMNS)}")
+        summary["sheets"] = df["Sheet"].nunique()
+        if skipped:
+            summary["skipped (missing columns)"] = ", ".join(skipped)
+    else:
+        sheet = args.sheet if args.sheet is not None else sheet_names(args.workbook)[0]
+        with perf.stage("read") as s:
+            df, hit = read_sheet_cached(args.workbook, sheet=sheet)
+            s.rows, s.extra["cache_hit"] = len(df), hit
+        df.columns = df.columns.str.strip()
+        if any(col not in df.columns for col in REQUIRED_COLUMNS):
+            raise ValueError(f"Sheet '{sheet}' must contain: {', '.join(REQUIRED_COLUMNS)}")
+        with perf.stage("transform", rows=len(df)):
+            df = build_deposit_import(df)
+        summary["sheet"] = sheet
+
+    lines, record = _skip_repeats("deposits", export_frame(df), args.repeats, summary)
+    out = args.out or _next_to(args.workbook, "_deposits.csv")
+    with perf.stage("export", rows=len(lines)):
+        write_csv(lines, out)
+        record(out)
+    total = pd.to_numeric(lines["Amount"], errors="coerce").sum()
+    summary.update({"deposits": len(lines), "amount": f"{total:,.2f}", "output": out})
+    return summary
+
+
+def run_petty_cash(args) -> dict:
+    from modules.excel_io import read_sheet_cached, PETTY_CASH
+    from modules.petty_transform import transform_petty_or_ewallet, export_frame, load_batch, template_paths
+    from modules.evolution_schema import write_csv
+
+    paths = [p for source in args.templates for p in template_paths(source)]
+    if not paths:
+        raise ValueError("No petty cash templates found")
+    summary = {"templates": len(paths)}
+    if len(paths) == 1:
+        with perf.stage("read") as s:
+            df, hit = read_sheet_cached(paths[0], layout=PETTY_CASH)
+            s.rows, s.extra["cache_hit"] = len(df), hit
+        df.columns = [str(c).strip() for c in df.columns]
+        with perf.stage("transform", rows=len(df)):
+            lines = transform_petty_or_ewallet(df)
+    else:
+        with perf.stage("read + transform (batch)") as s:
+            lines, failures = load_batch(paths, workers=args.workers)
+            s.rows = len(lines)
+        for name, error in failures.items():
+            summary[f"failed: {name}"] = error
+        if lines.empty:
+            raise ValueError("None of the templates could be read")
+
+    lines, record = _skip_repeats("petty_cash", export_frame(lines), args.repeats, summary)
+    if args.out.lower().endswith(".xlsx"):
+        with perf.stage("export xlsx", rows=len(lines)):
+            lines.to_excel(args.out, index=False)
+    else:
+        with perf.stage("export csv", rows=len(lines)):
+            write_csv(lines, args.out, encoding="utf-8-sig")
+    record(args.out)
+    summary.update({"lines": len(lines), "output": args.out})
+    return summary
+
+
+def run_compare9500(args) -> dict:
+    from modules.excel_io import read_sheet_cached, sheet_names, SheetLayout
+    from modules.diff_engine import clean_dataframe, CompareKeys, multiset_diff
+    from modules.recon_store import ReconStore, incremental_diff
+    from modules.fuzzy_match import propose_matches
+
+    layout = SheetLayout(ncols=args.columns)
+    with perf.stage("read + clean A") as s:
+        df_a, hit = read_sheet_cached(args.a, layout=layout, clean=clean_dataframe)
+        s.rows, s.extra["cache_hit"] = len(df_a), hit
+    with perf.stage("read + clean B") as s:
+        df_b, hit = read_sheet_cached(args.b, sheet=sheet_names(args.b)[0], layout=layout, clean=clean_dataframe)
+        s.rows, s.extra["cache_hit"] = len(df_b), hit
+    if list(df_a.columns) != list(df_b.columns):
+        raise ValueError("The column headers in Excel A and Excel B do not match")
+
+    summary = {}
+    with perf.stage("keys", rows=len(df_a) + len(df_b)):
+        keys_a, keys_b = CompareKeys(df_a), CompareKeys(df_b)
+        df_a, hash_a = keys_a.frame(args.columns), keys_a.hashes(args.columns)
+        df_b, hash_b = keys_b.frame(args.columns), keys_b.hashes(args.columns)
+    with perf.stage("diff", rows=len(df_a) + len(df_b), incremental=bool(args.store)):
+        if not args.store:
+            only_in_a, only_in_b = multiset_diff(df_a, df_b, hash_a, hash_b)
+        else:
+            store = ReconStore(args.store)
+            only_in_a, only_in_b, info = incremental_diff(df_a, df_b, store, hash_a, hash_b)
+            store.save()
+            summary["carried matches"] = info["carried"]
+            summary["new matches"] = info["new_matches"]
+    with perf.stage("fuzzy match", rows=len(only_in_a) + len(only_in_b)):
+        pairs = propose_matches(only_in_a, only_in_b)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    outputs = {"only_in_a.xlsx": only_in_a, "only_in_b.xlsx": only_in_b, "suggested_pairs.xlsx": pairs}
+    with perf.stage("export", rows=sum(len(df) for df in outputs.values())):
+        for name, df in outputs.items():
+            df.to_excel(os.path.join(args.out_dir, name), index=False)
+    summary.update({"only in A": len(only_in_a), "only in B": len(only_in_b),
+                    "suggested pairs": len(pairs), "output": os.path.abspath(args.out_dir)})
+    return summary
+
+
+def run_everlytic(args) -> dict:
+    from modules.everlytic_transform import process_file, monthly_aggregates, build_monthly_journal
+
+    if not args.monthly:
+        with perf.stage("read + transform + export") as s:
+            info = process_file(args.report, args.reference, args.account, args.out)
+            s.rows = info["rows"]
+        return {"messages": info["rows"], "reference": info["reference"],
+                "banner rows removed": info["removed_banners"], "output": info["output"]}
+
+    with perf.stage("read + aggregate (monthly)") as s:
+        monthly = monthly_aggregates(args.report)
+        s.rows = int(monthly["Messages"].sum())
+    if monthly.empty:
+        raise ValueError("No dated messages in the report")
+    out = args.out or _next_to(args.report, "_monthly.csv")
+    with perf.stage("export monthly", rows=len(monthly)):
+        build_monthly_journal(monthly, args.reference, args.account).to_csv(out, index=False)
+    return {"months": len(monthly), "messages": int(monthly["Messages"].sum()),
+            "amount": f"{monthly['Amount'].sum():,.2f}", "output": out}
+
+
+def run_requisitions(args) -> dict:
+    from modules.excel_io import read_sheet_cached
+    from modules.requisition_pdf import prepare_refunds, render_requisitions
+
+    with perf.stage(f"read {args.kind}s") as s:
+        df, hit = read_sheet_cached(args.refunds)
+        s.rows, s.extra["cache_hit"] = len(df), hit
+    prepare_refunds(df, args.kind)
+    os.makedirs(args.out_dir, exist_ok=True)
+    with perf.stage(f"render {args.kind} PDFs") as s:
+        stats = render_requisitions(df, args.kind, args.user, out_dir=args.out_dir, workers=args.workers)
+        s.rows = stats["written"]
+    return {"PDFs": f"{stats['written']} of {stats['total']}",
+            "seconds": f"{stats['seconds']:.1f} ({stats['per_second']:.1f} PDFs/s)",
+            "output": os.path.abspath(args.out_dir)}
+
+
+# ---------- Parser ----------
+REPEAT_POLICIES = ["fail", "skip", "keep"]
+# subcommand -> (perf module name, runner); module names match the tabs' JobRunner names
+COMMANDS = {
+    "bidmaster": ("Bidmaster", run_bidmaster),
+    "gl-extract": ("GL Extractor", run_gl_extract),
+    "deposits": ("Import Deposits", run_deposits),
+    "petty-cash": ("Petty Cash", run_petty_cash),
+    "compare9500": ("Compare 9500", run_compare9500),
+    "everlytic": ("Everlytic", run_everlytic),
+    "requisitions": ("Requisitions", run_requisitions),
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from modules.bidmaster_transform import BRANCH_GL, DEPARTMENT_CODES, IMPORT_FILE
+    from modules.everlytic_transform import ACCOUNT_DEFAULT, REFERENCE_PATTERN
+
+    parser = argparse.ArgumentParser(prog="python -m modules.cli", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    p = sub.add_parser("bidmaster", help="Detailed Profit Report + Cash Recon -> invoice import CSV")
+    p.add_argument("--profit", required=True, help="Detailed Profit Report CSV")
+    p.add_argument("--cash", required=True, help="Cash Recon CSV")
+    p.add_argument("--branch", required=True, choices=list(BRANCH_GL))
+    p.add_argument("--auction", required=True, type=_auction_code, help="Auction code without the 'B' or 'W'")
+    p.add_argument("--department", required=True, choices=list(DEPARTMENT_CODES))
+    p.add_argument("--commission", required=True, type=_number, help="Commission percentage")
+    p.add_argument("--date", required=True, type=_date, help="Auction date, dd/mm/yyyy")
+    p.add_argument("--out", default=IMPORT_FILE)
+    p.add_argument("--repeats", choices=REPEAT_POLICIES, default="fail",
+                   help="Lines the export ledger has seen before: fail the run (default), skip or keep them")
+
+    p = sub.add_parser("gl-extract", help="GL ledger workbook -> customer and supplier invoice CSVs")
+    p.add_argument("ledger")
+    p.add_argument("--date", required=True, type=_date, help="Invoice date, dd/mm/yyyy")
+    p.add_argument("--out-dir", help="Default: the ledger's folder")
+
+    p = sub.add_parser("deposits", help="9500 deposit workbook -> deposit import CSV")
+    p.add_argument("workbook")
+    sheets = p.add_mutually_exclusive_group()
+    sheets.add_argument("--sheet", help="Sheet name (default: the first sheet)")
+    sheets.add_argument("--all-sheets", action="store_true", help="Every sheet with the deposit columns")
+    p.add_argument("--out", help="Default: <workbook>_deposits.csv")
+    p.add_argument("--repeats", choices=REPEAT_POLICIES, default="fail",
+                   help="Lines the export ledger has seen before: fail the run (default), skip or keep them")
+    p.add_argument("--workers", type=int)
+
+    p = sub.add_parser("petty-cash", help="Petty cash / eWallet templates -> cashbook import")
+    p.add_argument("templates", nargs="+", help="Template files or folders of templates")
+    p.add_argument("--out", required=True, help=".csv or .xlsx")
+    p.add_argument("--repeats", choices=REPEAT_POLICIES, default="fail",
+                   help="Lines the export ledger has seen before: fail the run (default), skip or keep them")
+    p.add_argument("--workers", type=int)
+
+    p = sub.add_parser("compare9500", help="Diff two 9500 exports and suggest matches")
+    p.add_argument("a", help="Excel A (Evolution)")
+    p.add_argument("b", help="Excel B (recon)")
+    p.add_argument("--columns", type=int, default=9, help="Columns to compare (default 9)")
+    p.add_argument("--store", help="Carry matches forward in this recon store")
+    p.add_argument("--out-dir", default=".")
+
+    p = sub.add_parser("everlytic", help="Everlytic SMS log -> accounting CSV or monthly journals")
+    p.add_argument("report")
+    p.add_argument("--reference", default=REFERENCE_PATTERN,
+                   help="Reference or pattern with {period} / {stem} (default %(default)s)")
+    p.add_argument("--account", default=ACCOUNT_DEFAULT)
+    p.add_argument("--monthly", action="store_true", help="One journal per month instead of per message")
+    p.add_argument("--out", help="Default: <report>_accounting.csv (<report>_monthly.csv with --monthly)")
+
+    p = sub.add_parser("requisitions", help="Refund list -> payment requisition PDFs")
+    p.add_argument("refunds")
+    p.add_argument("--kind", required=True, choices=["customer", "supplier"])
+    p.add_argument("--user", required=True, help="Name and surname printed on the requisitions")
+    p.add_argument("--out-dir", default=".")
+    p.add_argument("--workers", type=int)
+    return parser
+
+
+def command_argv(parser: argparse.ArgumentParser, command: str, options: dict) -> list:
+    """
+    argv for `command` from an option dict such as a manifest entry:
+    {"templates": ["a.xlsx"], "out": "x.csv", "all_sheets": True}. Keys are the
+    argument dests; lists expand to several values, True/False toggle flags.
+    """
+    commands = next(a for a in parser._actions if isinstance(a, argparse._SubParsersAction)).choices
+    if command not in commands:
+        raise ValueError(f"Unknown command '{command}' (use one of: {', '.join(commands)})")
+    actions = {a.dest: a for a in commands[command]._actions if a.dest != "help"}
+    unknown = set(options) - set(actions)
+    if unknown:
+        raise ValueError(f"Unknown option(s) for {command}: {', '.join(sorted(unknown))}")
+
+    argv = [command]
+    for dest, action in actions.items():
+        value = options.get(dest)
+        if value is None or value is False:
+            continue
+        if action.option_strings:
+            argv.append(action.option_strings[-1])
+        if value is not True:
+            argv.extend(str(v) for v in (value if isinstance(value, (list, tuple)) else [value]))
+    return argv
+
+
+def run(args, label: str = None) -> dict:
+    """Run a parsed command as one perf job; returns its summary."""
+    module, runner = COMMANDS[args.command]
+    with perf.job_scope(module, perf.new_job_id()), perf.stage(perf.JOB, label=label or f"cli {args.command}"):
+        return runner(args)
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        summary = run(args)
+    except (ValueError, KeyError, OSError, BrokenExecutor) as e:
+        # BrokenExecutor: a pool worker died or its initializer failed
+        print(f"{args.command}: error: {str(e) or type(e).__name__}", file=sys.stderr)
+        return 1
+
+    width = max(len(key) for key in summary)
+    for key, value in summary.items():
+        print(f"{key + ':':<{width + 1}} {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
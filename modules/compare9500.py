@@ -1,7 +1,19 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import pandas as pd
-import threading
+
+from modules.data_grid import DataFrameGrid
+from modules.jobs import JobRunner
+from modules import perf
+from modules.excel_io import read_sheet_cached, sheet_names, SheetLayout
+from modules.parse_cache import describe
+from modules.diff_engine import clean_dataframe, CompareKeys, multiset_diff
+from modules.recon_store import ReconStore, incremental_diff
+from modules.fuzzy_match import propose_matches
+
+# Spinbox maximum. Files are read up to this many columns (not the whole sheet),
+# so the count can still be raised after loading
+MAX_COLUMNS = 50
 
 class Compare9500App:
     def __init__(self, parent):
@@ -9,8 +21,9 @@ class Compare9500App:
         self.frame = ttk.Frame(parent, padding=20)
         self.frame.pack(fill="both", expand=True)
 
-        self.df_a = None
-        self.df_b = None
+        # Loaded sides, normalized and hashed column by column as they are needed
+        self.keys_a = None
+        self.keys_b = None
 
         self.build_ui()
 
@@ -26,7 +39,7 @@ class Compare9500App:
             "2. Upload Excel from Evolution).",
             "3. Upload Excel Reconciliation export).",
             "4. Click 'Compare' to find unmatched rows.",
-            "5. Preview both unmatched sets (A and B) below. B should be empty except for totals. If not, check the files and redo the process.",
+            "5. Preview both unmatched sets (A and B) below, with suggested near-miss pairs underneath. B should be empty except for totals. If not, check the files and redo the process.",
             "6. Export results of A and copy and paste it in to the reconciliation. Ensure the balance is correct.",
         ]
         for step in steps:
@@ -38,26 +51,46 @@ class Compare9500App:
 
         ttk.Label(control_frame, text="Number of columns to compare:").grid(row=0, column=0, padx=5)
         self.column_var = tk.IntVar(value=9)
-        ttk.Spinbox(control_frame, from_=1, to=50, textvariable=self.column_var, width=5).grid(row=0, column=1, padx=5)
+        ttk.Spinbox(control_frame, from_=1, to=MAX_COLUMNS, textvariable=self.column_var, width=5).grid(row=0, column=1, padx=5)
 
         # File buttons
         ttk.Button(control_frame, text="📁 Upload Evolution", command=self.load_file_a).grid(row=0, column=2, padx=10)
         ttk.Button(control_frame, text="📁 Upload Recon", command=self.load_file_b).grid(row=0, column=3, padx=10)
         ttk.Button(control_frame, text="🔍 Compare", command=self.compare).grid(row=0, column=4, padx=10)
 
+        # Month-to-month store of already matched rows
+        self.incremental_var = tk.BooleanVar(value=True)
+        self.store_var = tk.StringVar(value="9500")
+        ttk.Checkbutton(control_frame, text="Carry matches forward for:",
+                        variable=self.incremental_var).grid(row=1, column=0, columnspan=2, padx=5, pady=(8, 0), sticky="w")
+        ttk.Entry(control_frame, textvariable=self.store_var, width=12).grid(row=1, column=2, padx=10, pady=(8, 0))
+        ttk.Button(control_frame, text="♻️ Reset matches", command=self.reset_store).grid(row=1, column=3, padx=10, pady=(8, 0))
+
+        # Background jobs (loading / comparing)
+        self.jobs = JobRunner(self.frame, name="Compare 9500")
+        self.jobs.pack(fill="x", pady=(0, 5))
+
         # Result label
         self.result_label = ttk.Label(self.frame, text="", font=("Segoe UI", 10, "bold"))
         self.result_label.pack(pady=(5, 10))
 
-        # Treeviews for previews
+        # Tables for previews
         self.tree_frame = ttk.Frame(self.frame)
         self.tree_frame.pack(fill="both", expand=True)
 
         self.tree_frame.columnconfigure(0, weight=1)
         self.tree_frame.columnconfigure(1, weight=1)
 
-        self.tree_a = self.create_treeview("Only in A", 0)
-        self.tree_b = self.create_treeview("Only in B", 1)
+        self.table_a = self.create_table("Only in A", 0)
+        self.table_b = self.create_table("Only in B", 1)
+
+        # Second stage: near misses between A and B
+        self.tree_frame.rowconfigure(0, weight=2)
+        self.tree_frame.rowconfigure(1, weight=1)
+        pairs_frame = ttk.LabelFrame(self.tree_frame, text="Suggested pairs (date, cents or reference near misses)", padding=5)
+        pairs_frame.grid(row=1, column=0, columnspan=2, sticky="nsew", padx=5, pady=5)
+        self.table_pairs = DataFrameGrid(pairs_frame)
+        self.table_pairs.pack(fill="both", expand=True)
 
         # Export buttons
         action_frame = ttk.Frame(self.frame)
@@ -65,80 +98,74 @@ class Compare9500App:
 
         ttk.Button(action_frame, text="⬇️ Export A - not on recon'", command=self.export_a).grid(row=0, column=0, padx=15)
         ttk.Button(action_frame, text="⬇️ Export B - twice on recon'", command=self.export_b).grid(row=0, column=1, padx=15)
+        ttk.Button(action_frame, text="⬇️ Export suggested pairs", command=self.export_pairs).grid(row=0, column=2, padx=15)
 
-    def create_treeview(self, title, col_index):
+    def create_table(self, title, col_index):
         container = ttk.LabelFrame(self.tree_frame, text=title, padding=5)
         container.grid(row=0, column=col_index, sticky="nsew", padx=5, pady=5)
 
-        tree = ttk.Treeview(container, show="headings")
-        tree.pack(side="left", fill="both", expand=True)
-
-        scrollbar_y = ttk.Scrollbar(container, orient="vertical", command=tree.yview)
-        scrollbar_y.pack(side="right", fill="y")
-        tree.configure(yscrollcommand=scrollbar_y.set)
+        table = DataFrameGrid(container, xscroll=False)
+        table.pack(fill="both", expand=True)
 
-        return tree
+        return table
 
     def load_file_a(self):
-        def task():
-            path = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx")])
-            if path:
-                try:
-                    df = pd.read_excel(path).iloc[:, :self.column_var.get()]
-                    self.clean_dataframe(df)
-                    self.df_a = df
-                    self.parent.after(0, lambda: messagebox.showinfo("Success", "Excel A loaded successfully."))
-                except Exception as e:
-                    self.parent.after(0, lambda e=e: messagebox.showerror("Error", f"Failed to load Excel A:\n{e}"))
-
-        threading.Thread(target=task).start()
+        path = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx")])
+        if not path:
+            return
+        ncols = self.column_var.get()
+
+        def work(ctx):
+            # Up to MAX_COLUMNS; cached after cleaning, so a repeat load skips both
+            with perf.stage("read + clean A") as s:
+                df, hit = read_sheet_cached(path, layout=SheetLayout(ncols=MAX_COLUMNS), clean=clean_dataframe,
+                                            on_chunk=lambda n: ctx.progress(n, text=f"Reading Excel A: {n:,} rows"))
+                s.rows, s.extra["cache_hit"] = len(df), hit
+            ctx.summary = describe(hit, "Excel A")
+            keys = CompareKeys(df)
+            with perf.stage("keys A", rows=len(df)):
+                keys.ensure(ncols)
+            return keys
+
+        def done(keys):
+            self.keys_a = keys
+            messagebox.showinfo("Success", "Excel A loaded successfully.")
+
+        self.jobs.run(work, on_done=done, text="Loading Excel A...",
+                      on_error=lambda e: messagebox.showerror("Error", f"Failed to load Excel A:\n{e}"))
 
     def load_file_b(self):
-        def task():
-            path = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx")])
-            if path:
-                try:
-                    xls = pd.ExcelFile(path)
-                    sheet = xls.sheet_names[0]
-                    df = pd.read_excel(path, sheet_name=sheet).iloc[:, :self.column_var.get()]
-                    self.clean_dataframe(df)
-                    self.df_b = df
-                    self.parent.after(0, lambda: messagebox.showinfo("Success", f"Excel B sheet '{sheet}' loaded."))
-                except Exception as e:
-                    self.parent.after(0, lambda e=e: messagebox.showerror("Error", f"Failed to load Excel B:\n{e}"))
-        
-        threading.Thread(target=task).start()
-
-    def clean_dataframe(self, df):
-        df.columns = df.columns.str.strip()
-
-        for col in ["Debit", "Credit"]:
-            if col in df.columns:
-                df[col] = pd.to_numeric(
-                    df[col].astype(str)
-                    .str.replace("R", "", regex=False)
-                    .str.replace(",", "", regex=False)
-                    .str.strip(),
-                    errors="coerce"
-                ).fillna(0).round(2)
-
-        for ref_col in ["Reference", "Reference 2"]:
-            if ref_col in df.columns:
-                df[ref_col] = df[ref_col].astype(str).str.strip().str.lstrip("0").str.replace(r"\.0$", "", regex=True)
-                df[ref_col] = df[ref_col].replace(["", "None", "nan"], pd.NA)
-
-        if "Date" in df.columns:
-            df["Date"] = pd.to_datetime(df["Date"], errors="coerce").dt.date
-
-        if "Description" in df.columns:
-            df["Description"] = df["Description"].astype(str).str.lstrip("0").str.strip()
+        path = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx")])
+        if not path:
+            return
+        ncols = self.column_var.get()
+
+        def work(ctx):
+            sheet = sheet_names(path)[0]
+            with perf.stage("read + clean B") as s:
+                df, hit = read_sheet_cached(path, sheet=sheet, layout=SheetLayout(ncols=MAX_COLUMNS), clean=clean_dataframe,
+                                            on_chunk=lambda n: ctx.progress(n, text=f"Reading Excel B: {n:,} rows"))
+                s.rows, s.extra["cache_hit"] = len(df), hit
+            ctx.summary = describe(hit, "Excel B")
+            keys = CompareKeys(df)
+            with perf.stage("keys B", rows=len(df)):
+                keys.ensure(ncols)
+            return sheet, keys
+
+        def done(result):
+            sheet, self.keys_b = result
+            messagebox.showinfo("Success", f"Excel B sheet '{sheet}' loaded.")
+
+        self.jobs.run(work, on_done=done, text="Loading Excel B...",
+                      on_error=lambda e: messagebox.showerror("Error", f"Failed to load Excel B:\n{e}"))
 
     def compare(self):
-        if self.df_a is None or self.df_b is None:
+        if self.keys_a is None or self.keys_b is None:
             messagebox.showwarning("Missing", "Please upload both Excel files first.")
             return
 
-        if list(self.df_a.columns) != list(self.df_b.columns):
+        ncols = self.column_var.get()
+        if list(self.keys_a.df.columns[:ncols]) != list(self.keys_b.df.columns[:ncols]):
             messagebox.showerror(
                 "Header Mismatch",
                 "The column headers in Excel A and Excel B do not match.\n\n"
@@ -146,52 +173,74 @@ class Compare9500App:
             )
             return
 
-        df_a_clean = self.df_a.dropna(how="all").fillna("")
-        df_b_clean = self.df_b.dropna(how="all").fillna("")
-
-        for col in df_a_clean.columns:
-            if "date" in col.lower():
-                df_a_clean[col] = pd.to_datetime(df_a_clean[col], errors="coerce").dt.date
-                df_b_clean[col] = pd.to_datetime(df_b_clean[col], errors="coerce").dt.date
-            elif col.lower() in ["debit", "credit"]:
-                df_a_clean[col] = df_a_clean[col].astype(float)
-                df_b_clean[col] = df_b_clean[col].astype(float)
-            else:
-                df_a_clean[col] = df_a_clean[col].astype(str)
-                df_b_clean[col] = df_b_clean[col].astype(str)
-
-        self.only_in_a = pd.merge(df_a_clean, df_b_clean, how="outer", indicator=True)\
-                          .query("_merge == 'left_only'").drop(columns=["_merge"])
-        self.only_in_b = pd.merge(df_b_clean, df_a_clean, how="outer", indicator=True)\
-                          .query("_merge == 'left_only'").drop(columns=["_merge"])
-
-        self.display_treeview(self.tree_a, self.only_in_a)
-        self.display_treeview(self.tree_b, self.only_in_b)
-
-        result = f"✅ Compared!\nOnly in A: {len(self.only_in_a)} rows\nOnly in B: {len(self.only_in_b)} rows"
-        self.result_label.config(text=result)
-
-    def display_treeview(self, tree, df):
-        tree.delete(*tree.get_children())
-        tree["columns"] = list(df.columns)
-
-        for col in df.columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=120, anchor="center")
+        keys_a, keys_b = self.keys_a, self.keys_b
+        store_name = self.store_var.get().strip() if self.incremental_var.get() else ""
+
+        def work(ctx):
+            # Columns were normalized and hashed on load; only ones added since (a higher count) are built here
+            with perf.stage("keys", rows=len(keys_a.df) + len(keys_b.df)) as s:
+                s.extra["columns_built"] = keys_a.ensure(ncols) + keys_b.ensure(ncols)
+                df_a_clean, hash_a = keys_a.frame(ncols), keys_a.hashes(ncols)
+                df_b_clean, hash_b = keys_b.frame(ncols), keys_b.hashes(ncols)
+            ctx.check()
+            with perf.stage("diff", rows=len(df_a_clean) + len(df_b_clean), incremental=bool(store_name)):
+                if not store_name:
+                    # Single hashed pass; duplicates keep their multiplicity
+                    only_in_a, only_in_b = multiset_diff(df_a_clean, df_b_clean, hash_a, hash_b)
+                else:
+                    # Only rows not matched in earlier runs go through the diff
+                    store = ReconStore(store_name)
+                    only_in_a, only_in_b, info = incremental_diff(df_a_clean, df_b_clean, store, hash_a, hash_b)
+                    store.save()
+                    ctx.summary = (f"{info['carried']:,} matches carried forward, "
+                                   f"{info['new_matches']:,} new, {info['diffed_rows']:,} rows diffed")
+            ctx.check()
+            with perf.stage("fuzzy match", rows=len(only_in_a) + len(only_in_b)):
+                pairs = propose_matches(only_in_a, only_in_b)
+            return only_in_a, only_in_b, pairs
+
+        def done(result):
+            self.only_in_a, self.only_in_b, self.pairs = result
+            with perf.stage("display", rows=len(self.only_in_a) + len(self.only_in_b) + len(self.pairs)):
+                self.table_a.show(self.only_in_a, widths=120, anchor="center")
+                self.table_b.show(self.only_in_b, widths=120, anchor="center")
+                self.table_pairs.show(self.pairs, widths=110, anchor="center")
+
+            summary = (f"✅ Compared!\nOnly in A: {len(self.only_in_a)} rows\nOnly in B: {len(self.only_in_b)} rows"
+                       f"\nSuggested pairs: {len(self.pairs)}")
+            self.result_label.config(text=summary)
+
+        self.jobs.run(work, on_done=done, text="Comparing...")
+
+    def export_pairs(self):
+        if hasattr(self, "pairs") and not self.pairs.empty:
+            path = filedialog.asksaveasfilename(defaultextension=".xlsx")
+            if path:
+                with perf.stage("export", rows=len(self.pairs), module=self.jobs.name):
+                    self.pairs.to_excel(path, index=False)
+                messagebox.showinfo("Exported", f"Saved to {path}")
 
-        for _, row in df.iterrows():
-            tree.insert("", "end", values=list(row))
+    def reset_store(self):
+        name = self.store_var.get().strip()
+        if not name:
+            return
+        if messagebox.askyesno("Reset matches", f"Forget all carried matches for '{name}'?\n"
+                               "The next compare will diff both files in full."):
+            ReconStore(name).reset()
+            self.jobs.set_status(f"Matches for '{name}' cleared.")
 
     def export_a(self):
         if hasattr(self, "only_in_a") and not self.only_in_a.empty:
             path = filedialog.asksaveasfilename(defaultextension=".xlsx")
             if path:
-                self.only_in_a.to_excel(path, index=False)
+                with perf.stage("export", rows=len(self.only_in_a), module=self.jobs.name):
+                    self.only_in_a.to_excel(path, index=False)
                 messagebox.showinfo("Exported", f"Saved to {path}")
 
     def export_b(self):
         if hasattr(self, "only_in_b") and not self.only_in_b.empty:
             path = filedialog.asksaveasfilename(defaultextension=".xlsx")
             if path:
-                self.only_in_b.to_excel(path, index=False)
+                with perf.stage("export", rows=len(self.only_in_b), module=self.jobs.name):
+                    self.only_in_b.to_excel(path, index=False)
                 messagebox.showinfo("Exported", f"Saved to {path}")
@@ -0,0 +1,143 @@
+# modules/data_grid.py
+import tkinter as tk
+from tkinter import ttk
+import pandas as pd
+
+
+def _cell(value):
+    """Blank out NaN/None/NaT so they don't show up as 'nan' in the table."""
+    try:
+        return "" if pd.isna(value) else value
+    except (TypeError, ValueError):
+        return value
+
+
+class DataFrameGrid(ttk.Frame):
+    """
+    Read-only table backed directly by a DataFrame.
+
+    Only the rows that fit in the widget are inserted into the Treeview.
+    Scrolling moves a window over the DataFrame and re-renders those rows,
+    so opening a 200k-row frame costs the same as opening a 20-row one.
+    """
+
+    DEFAULT_ROW_HEIGHT = 20
+    HEADING_HEIGHT = 25
+
+    def __init__(self, parent, xscroll: bool = True, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.df = None
+        self.offset = 0          # position of the first visible row in self.df
+        self.visible = 20        # rows that fit in the current widget height
+
+        body = ttk.Frame(self)
+        body.pack(fill="both", expand=True)
+
+        self.yscroll = ttk.Scrollbar(body, orient="vertical", command=self._on_scrollbar)
+        self.yscroll.pack(side="right", fill="y")
+
+        self.tree = ttk.Treeview(body, show="headings", height=self.visible)
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        if xscroll:
+            xs = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)
+            xs.pack(fill="x")
+            self.tree.configure(xscrollcommand=xs.set)
+
+        # Scrolling is ours: the Treeview only ever holds one screenful of rows
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_by(3))
+        self.tree.bind("<Prior>", lambda e: self._scroll_by(-self.visible))
+        self.tree.bind("<Next>", lambda e: self._scroll_by(self.visible))
+        self.tree.bind("<Home>", lambda e: self._scroll_to(0))
+        self.tree.bind("<End>", lambda e: self._scroll_to(self._total()))
+
+    # ---------- Public ----------
+    def show(self, df: pd.DataFrame, widths=None, anchor: str = "w"):
+        """
+        Display df from the top.
+        widths: None (fit to header/first 200 values), an int for every column,
+                or a {column: width} dict.
+        """
+        self.df = df
+        self.offset = 0
+
+        cols = [str(c) for c in df.columns]
+        self.tree["columns"] = cols
+        for col, src in zip(cols, df.columns):
+            self.tree.heading(col, text=col)
+            if isinstance(widths, dict):
+                width = widths.get(src, 120)
+            elif widths is not None:
+                width = widths
+            else:
+                max_len = max([len(col)] + [len(str(v)) for v in df[src].head(200).tolist()])
+                width = min(max(80, max_len * 8), 380)
+            self.tree.column(col, width=width, anchor=anchor)
+
+        self._render()
+
+    def clear(self):
+        self.df = None
+        self.tree.delete(*self.tree.get_children())
+        self.tree["columns"] = []
+        self.yscroll.set(0, 1)
+
+    # ---------- Rendering ----------
+    def _total(self) -> int:
+        return 0 if self.df is None else len(self.df)
+
+    def _render(self):
+        self.tree.delete(*self.tree.get_children())
+        total = self._total()
+        if not total:
+            self.yscroll.set(0, 1)
+            return
+
+        window = self.df.iloc[self.offset:self.offset + self.visible]
+        for values in window.itertuples(index=False, name=None):
+            self.tree.insert("", "end", values=[_cell(v) for v in values])
+
+        self.yscroll.set(self.offset / total, min(1.0, (self.offset + len(window)) / total))
+
+    def _row_height(self) -> int:
+        children = self.tree.get_children()
+        box = self.tree.bbox(children[0]) if children else ""
+        if box:
+            return box[3]
+        try:
+            return int(ttk.Style().lookup("Treeview", "rowheight")) or self.DEFAULT_ROW_HEIGHT
+        except (ValueError, tk.TclError):
+            return self.DEFAULT_ROW_HEIGHT
+
+    # ---------- Scrolling ----------
+    def _scroll_to(self, offset: int):
+        offset = max(0, min(int(offset), self._total() - self.visible))
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def _scroll_by(self, rows: int):
+        self._scroll_to(self.offset + rows)
+        return "break"
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._scroll_to(float(amount) * self._total())
+        elif action == "scroll":
+            step = self.visible if unit == "pages" else 1
+            self._scroll_by(int(amount) * step)
+
+    def _on_mousewheel(self, event):
+        # Windows reports multiples of 120; macOS reports small deltas
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self._scroll_by(-3 * delta)
+
+    def _on_resize(self, event):
+        visible = max(1, (event.height - self.HEADING_HEIGHT) // self._row_height())
+        if visible != self.visible:
+            self.visible = visible
+            self.offset = max(0, min(self.offset, self._total() - self.visible))
+            self._render()
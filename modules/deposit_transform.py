@@ -0,0 +1,149 @@
+# modules/deposit_transform.py
+import csv
+import json
+import os
+import re
+
+import pandas as pd
+
+from modules.excel_io import read_sheet_cached, sheet_names
+from modules.parallel import map_processes
+from modules.evolution_schema import CASHBOOK
+from modules.petty_transform import OUTPUT_COLUMNS, export_frame  # noqa: F401 (re-exported)
+
+DEPOSIT_ACCOUNT = "9500/BLM/027"
+REQUIRED_COLUMNS = ["Date", "Description", "Credit", "Code", "Reference"]
+
+# Everything after Amount in the Evolution cashbook layout, for a deposit line
+DEFAULTS = {
+    'UseTax': 'N', 'TaxType': '', 'TaxAccount': '', 'TaxAmount': 0, 'Project': '',
+    'Account': DEPOSIT_ACCOUNT, 'IsDebit': 'Y', 'SplitType': 0, 'SplitGroup': 0,
+    'Reconcile': 'N', 'PostDated': 'N', 'UseDiscount': 'N', 'DiscPerc': 0, 'DiscTrCode': '',
+    'DiscDesc': '', 'UseDiscTax': 'N', 'DiscTaxType': '', 'DiscTaxAcc': '', 'DiscTaxAmt': 0,
+    'PayeeName': '', 'PrintCheque': 'N', 'SalesRep': '', 'Module': 0,
+    'SagePayExtra1': '', 'SagePayExtra2': '', 'SagePayExtra3': ''
+}
+
+# Bank narration prefix -> deposit channel. Longer phrases win over the shorter
+# ones they contain ("ACB CREDIT CAPITEC" before "CAPITEC"), whatever the order here.
+NARRATION_PHRASES = {
+    "FNB APP PAYMENT FROM": "FNB App",
+    "FNB OB PMT": "FNB Online",
+    "DIGITAL PAYMENT CR ABSA BANK": "ABSA",
+    "ACB CREDIT CAPITEC": "Capitec",
+    "IMMEDIATE TRF CR CAPITEC": "Capitec",
+    "CAPITEC": "Capitec",
+    "PayShap Ext Credit": "PayShap",
+    "INT-BANKING PMT FRM": "Internet Banking",
+    "IMMEDIATE TRF CR": "Immediate Transfer",
+    "ACB CREDIT": "ACB",
+    "INVESTECPB": "Investec",
+}
+OTHER_CHANNEL = "Other"
+
+# Optional override: CSV (phrase,channel) or JSON {phrase: channel}
+NARRATION_FILE = os.environ.get("AUCOR_NARRATIONS", "narrations.csv")
+
+
+class NarrationEngine:
+    """
+    All narration phrases compiled into one alternation, longest phrase first,
+    so each description is scanned once per operation regardless of how many
+    phrases there are and overlapping phrases never depend on table order.
+    """
+
+    def __init__(self, phrases: dict = None):
+        self.phrases = dict(phrases or NARRATION_PHRASES)
+        ordered = sorted(self.phrases, key=len, reverse=True)
+        self.pattern = re.compile("|".join(re.escape(p) for p in ordered))
+        self._capture = f"({self.pattern.pattern})"
+
+    @classmethod
+    def from_file(cls, path):
+        if str(path).lower().endswith(".json"):
+            with open(path, encoding="utf-8") as f:
+                return cls(json.load(f))
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = [r for r in csv.reader(f) if r and r[0].strip()]
+        if rows and [c.strip().lower() for c in rows[0][:2]] == ["phrase", "channel"]:
+            rows = rows[1:]
+        return cls({r[0].strip(): (r[1].strip() if len(r) > 1 else OTHER_CHANNEL) for r in rows})
+
+    def channel(self, text: pd.Series) -> pd.Series:
+        """Channel of the first (leftmost, longest) phrase in each narration; 'Other' if none."""
+        found = text.str.extract(self._capture, expand=False)
+        channel = found.map(self.phrases).fillna(OTHER_CHANNEL)
+        return channel.where(text.notna(), "")
+
+    def strip(self, text: pd.Series) -> pd.Series:
+        """Remove every phrase occurrence in one pass and trim the result."""
+        return text.str.replace(self.pattern, "", regex=True).str.strip()
+
+
+_default_engine = None
+
+
+def default_engine() -> NarrationEngine:
+    """NARRATION_FILE when it exists, otherwise the built-in table. Built once."""
+    global _default_engine
+    if _default_engine is None:
+        if os.path.exists(NARRATION_FILE):
+            _default_engine = NarrationEngine.from_file(NARRATION_FILE)
+        else:
+            _default_engine = NarrationEngine()
+    return _default_engine
+
+
+def build_deposit_import(df: pd.DataFrame, engine: NarrationEngine = None) -> pd.DataFrame:
+    """
+    9500 deposit sheet (Date, Description, Credit, Code, Reference) -> Evolution
+    cashbook import lines, plus a 'Channel' column that is not part of the
+    export (see export_frame).
+    """
+    engine = engine or default_engine()
+    description = df["Description"]
+    # Non-text descriptions come out as NaN, as they did with Series.replace + .str.strip
+    text = description.astype(object).where(description.map(type).eq(str))
+
+    reference = (df["Code"].astype(str) + df["Reference"].astype(str).str.strip()).str.strip()
+    modified = CASHBOOK.build(df.index, {
+        "TxDate": df["Date"],
+        "Description": engine.strip(text),
+        "Reference": reference.str.replace(r"\.0$", "", regex=True),
+        "Amount": df["Credit"],
+        **DEFAULTS,
+    })
+    return modified.assign(Channel=engine.channel(text).astype("category"))
+
+
+# ---------- Whole workbooks ----------
+def _load_sheet(job):
+    """Worker: (path, sheet) -> deposit lines tagged with the sheet name, or None if it isn't a deposit sheet."""
+    path, sheet = job
+    df, _ = read_sheet_cached(path, sheet=sheet)
+    df.columns = [str(c).strip() for c in df.columns]
+    if any(col not in df.columns for col in REQUIRED_COLUMNS):
+        return None
+    return build_deposit_import(df).assign(Sheet=sheet)
+
+
+def load_all_sheets(path, workers=None, progress=None, cancel_event=None):
+    """
+    Parse every sheet of a workbook concurrently (one process per sheet, up to
+    `workers`) and map each with build_deposit_import. Wall time is roughly
+    that of the slowest sheet. progress(done, total) is called as sheets finish;
+    setting cancel_event raises JobCancelled (see parallel.map_processes).
+
+    Returns (combined, skipped): combined keeps workbook sheet order and has a
+    'Sheet' column with each row's source; skipped lists sheets without the
+    REQUIRED_COLUMNS.
+    """
+    sheets = sheet_names(path)
+    frames = map_processes(_load_sheet, [(path, sheet) for sheet in sheets],
+                           workers=workers, progress=progress, cancel_event=cancel_event)
+    results = {sheet: frame for sheet, frame in zip(sheets, frames) if frame is not None}
+    skipped = [sheet for sheet, frame in zip(sheets, frames) if frame is None]
+
+    if not results:
+        return pd.DataFrame(columns=OUTPUT_COLUMNS + ["Channel", "Sheet"]), skipped
+    return pd.concat(list(results.values()), ignore_index=True), skipped
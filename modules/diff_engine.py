@@ -0,0 +1,165 @@
+# modules/diff_engine.py
+import numpy as np
+import pandas as pd
+
+
+# ---------- Loading ----------
+def clean_dataframe(df: pd.DataFrame) -> None:
+    """
+    In-place tidy-up of a loaded 9500 export: stripped headers, Debit/Credit
+    as rounded numbers ('R1,234.50' -> 1234.5), references without leading
+    zeros or a trailing '.0', Date as date and Description without leading zeros.
+    """
+    df.columns = df.columns.str.strip()
+
+    for col in ["Debit", "Credit"]:
+        if col in df.columns:
+            df[col] = pd.to_numeric(
+                df[col].astype(str)
+                .str.replace("R", "", regex=False)
+                .str.replace(",", "", regex=False)
+                .str.strip(),
+                errors="coerce"
+            ).fillna(0).round(2)
+
+    for ref_col in ["Reference", "Reference 2"]:
+        if ref_col in df.columns:
+            df[ref_col] = df[ref_col].astype(str).str.strip().str.lstrip("0").str.replace(r"\.0$", "", regex=True)
+            df[ref_col] = df[ref_col].replace(["", "None", "nan"], pd.NA)
+
+    if "Date" in df.columns:
+        df["Date"] = pd.to_datetime(df["Date"], errors="coerce").dt.date
+
+    if "Description" in df.columns:
+        df["Description"] = df["Description"].astype(str).str.lstrip("0").str.strip()
+
+
+# ---------- Normalization ----------
+def _normalize_column(col: str, values: pd.Series) -> pd.Series:
+    """Blank-filled values cast to the type they are compared on (see normalize_for_compare)."""
+    if "date" in col.lower():
+        return pd.to_datetime(values, errors="coerce").dt.date
+    if col.lower() in ["debit", "credit"]:
+        return values.astype(float)
+    return values.astype(str)
+
+
+def normalize_for_compare(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Drop fully blank rows and cast every column to the type it is compared on:
+    date-like columns -> date, Debit/Credit -> float, everything else -> str.
+    """
+    out = df.dropna(how="all").fillna("")
+    for col in out.columns:
+        out[col] = _normalize_column(col, out[col])
+    return out
+
+
+# ---------- Hashing ----------
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """One uint64 hash per row, computed over the column values only (not the index)."""
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def combine_hashes(column_hashes: list) -> np.ndarray:
+    """
+    Row hashes from per-column hashes, combined the way hash_pandas_object
+    combines a frame's columns, so the result equals row_hashes() of those
+    columns (and hashes kept in a ReconStore stay valid).
+    """
+    if not column_hashes:
+        return np.array([], dtype=np.uint64)
+    n = len(column_hashes)
+    mult = np.uint64(1000003)
+    out = np.zeros_like(column_hashes[0]) + np.uint64(0x345678)
+    for i, h in enumerate(column_hashes):
+        out ^= h
+        out *= mult
+        mult += np.uint64(82520 + 2 * (n - i))
+    return out + np.uint64(97531)
+
+
+class CompareKeys:
+    """
+    One loaded side of a compare, normalized and hashed column by column.
+
+    Each column is normalized and hashed once (ensure()); frame() and hashes()
+    for a given column count then only pick and combine cached columns, so a
+    re-compare, or one with a different column count, does no casting.
+    frame(n) equals normalize_for_compare(df.iloc[:, :n]) and hashes(n)
+    equals row_hashes() of it.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._cache = {}    # position -> (normalized values, blank mask, value hashes)
+
+    def width(self, ncols: int) -> int:
+        return min(ncols, len(self.df.columns))
+
+    def missing(self, ncols: int) -> list:
+        return [i for i in range(self.width(ncols)) if i not in self._cache]
+
+    def ensure(self, ncols: int) -> int:
+        """Normalize and hash the first ncols columns not done yet; returns how many were."""
+        todo = self.missing(ncols)
+        for i in todo:
+            col = self.df.columns[i]
+            values = self.df.iloc[:, i]
+            normalized = _normalize_column(col, values.fillna(""))
+            self._cache[i] = (normalized, values.isna().to_numpy(),
+                              pd.util.hash_pandas_object(normalized, index=False).to_numpy())
+        return len(todo)
+
+    def _keep(self, n: int) -> np.ndarray:
+        """Rows that are not blank in all of the first n columns."""
+        return ~np.logical_and.reduce([self._cache[i][1] for i in range(n)])
+
+    def frame(self, ncols: int) -> pd.DataFrame:
+        n = self.width(ncols)
+        self.ensure(n)
+        out = pd.concat([self._cache[i][0] for i in range(n)], axis=1)
+        return out[self._keep(n)] if n else out
+
+    def hashes(self, ncols: int) -> np.ndarray:
+        n = self.width(ncols)
+        self.ensure(n)
+        if not n:
+            return np.array([], dtype=np.uint64)
+        return combine_hashes([self._cache[i][2] for i in range(n)])[self._keep(n)]
+
+
+def _beyond_count(hashes: np.ndarray, counts: pd.Series) -> np.ndarray:
+    """
+    True for rows past the allowance in `counts` (hash -> n).
+
+    The k-th occurrence of a hash (k = 0, 1, ...) is covered only if counts
+    holds more than k for it, so duplicates keep their multiplicity.
+    """
+    own = pd.Series(hashes)
+    occurrence = own.groupby(hashes, sort=False).cumcount().to_numpy()
+    available = own.map(counts).fillna(0).to_numpy()
+    return occurrence >= available
+
+
+def _unmatched_mask(hashes: np.ndarray, other_hashes: np.ndarray) -> np.ndarray:
+    """True for rows that have no partner on the other side."""
+    return _beyond_count(hashes, pd.Series(other_hashes).value_counts())
+
+
+# ---------- Diff ----------
+def multiset_diff(df_a: pd.DataFrame, df_b: pd.DataFrame, hash_a=None, hash_b=None):
+    """
+    Rows of A not matched in B and rows of B not matched in A, respecting
+    duplicate multiplicity (a row booked twice in A but once in B appears once
+    in "only in A"). Both frames must share the same columns and be normalized.
+    Precomputed row hashes (CompareKeys.hashes) skip the hashing pass.
+
+    Returns (only_in_a, only_in_b) with fresh RangeIndexes.
+    """
+    hash_a = row_hashes(df_a) if hash_a is None else hash_a
+    hash_b = row_hashes(df_b) if hash_b is None else hash_b
+
+    only_in_a = df_a[_unmatched_mask(hash_a, hash_b)].reset_index(drop=True)
+    only_in_b = df_b[_unmatched_mask(hash_b, hash_a)].reset_index(drop=True)
+    return only_in_a, only_in_b
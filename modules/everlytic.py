@@ -1,22 +1,34 @@
 # modules/everlytic.py
 import os
+import queue
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
 import pandas as pd
 
+from modules.data_grid import DataFrameGrid
+from modules.jobs import JobRunner
+from modules import perf
+from modules.parse_cache import describe
+from modules.hot_folder import HotFolder
+from modules.everlytic_transform import (
+    EXPORT_COLS, ACCOUNT_DEFAULT, REFERENCE_PATTERN, read_report, clean_report, build_preview, build_export, process_file,
+    monthly_aggregates, build_monthly_journal,
+)
+
 
 class Everlytic:
-    EXPORT_COLS = [
-        "TxDate","Description","Reference","Amount","UseTax",
-        "TaxType","TaxAccount","TaxAmount","Project","Account","IsDebit",
-    ]
-    ACCOUNT_DEFAULT = "8002/BLM/027/046"
+    EXPORT_COLS = EXPORT_COLS
+    ACCOUNT_DEFAULT = ACCOUNT_DEFAULT
+    REFERENCE_PATTERN = REFERENCE_PATTERN
 
     def __init__(self, parent):
         self.container = ttk.Frame(parent)
         self.container.pack(fill="both", expand=True)
         self.df_preview = None
         self.source_path = None
+        self.watcher = None
+        self._watch_events = queue.Queue()
+        self._drain_job = None
 
         ttk.Label(self.container, text="📑 Everlytic CSV/Excel Report → Accounting", font=("Arial", 16, "bold")).pack(pady=(8, 2))
         ttk.Label(self.container, text="1) Select CSV/Excel  •  2) Preview  •  3) Export CSV").pack(pady=(0, 8))
@@ -24,12 +36,25 @@ class Everlytic:
         controls = ttk.Frame(self.container); controls.pack(pady=6)
         ttk.Button(controls, text="📁 Select CSV/Excel", command=self.load_file).grid(row=0, column=0, padx=8)
         ttk.Button(controls, text="⬇️ Export (CSV)", command=self.export_accounting_csv).grid(row=0, column=1, padx=8)
-
-        table_wrap = ttk.Frame(self.container); table_wrap.pack(fill="both", expand=True, pady=8)
-        self.tree = ttk.Treeview(table_wrap, show="headings"); self.tree.pack(side="left", fill="both", expand=True)
-        yscroll = ttk.Scrollbar(table_wrap, orient="vertical", command=self.tree.yview); yscroll.pack(side="right", fill="y")
-        xscroll = ttk.Scrollbar(self.container, orient="horizontal", command=self.tree.xview); xscroll.pack(fill="x")
-        self.tree.configure(yscrollcommand=yscroll.set, xscrollcommand=xscroll.set)
+        ttk.Button(controls, text="📅 Monthly journals...", command=self.export_monthly_journals).grid(row=0, column=2, padx=8)
+
+        # Hot folder: exports dropped into the inbox are processed unattended
+        watch = ttk.LabelFrame(self.container, text="Watch folder", padding=6)
+        watch.pack(fill="x", padx=8, pady=(0, 6))
+        ttk.Label(watch, text="Reference pattern:").grid(row=0, column=0, padx=4, sticky="w")
+        self.reference_pattern_var = tk.StringVar(value=self.REFERENCE_PATTERN)
+        ttk.Entry(watch, textvariable=self.reference_pattern_var, width=18).grid(row=0, column=1, padx=4)
+        self.watch_button = ttk.Button(watch, text="👁 Watch folder...", command=self.toggle_watch)
+        self.watch_button.grid(row=0, column=2, padx=8)
+        self.watch_status = ttk.Label(watch, text="Not watching. {period:%m%y} = report month, {stem} = file name.",
+                                      foreground="blue")
+        self.watch_status.grid(row=0, column=3, padx=4, sticky="w")
+
+        self.table = DataFrameGrid(self.container)
+        self.table.pack(fill="both", expand=True, pady=8)
+
+        self.jobs = JobRunner(self.container, name="Everlytic")
+        self.jobs.pack(fill="x", pady=(4, 0))
 
         self.status = ttk.Label(self.container, text="No file loaded.", anchor="w")
         self.status.pack(fill="x", pady=(4, 2))
@@ -42,59 +67,24 @@ class Everlytic:
         )
         if not path:
             return
-        try:
-            # Detect by extension
-            ext = os.path.splitext(path)[1].lower()
-            if ext in [".xlsx", ".xls"]:
-                df = pd.read_excel(path, header=1, engine="openpyxl")
-            else:
-                df = pd.read_csv(path, header=1)
-
-            df.columns = [str(c).strip() for c in df.columns]
-
-            # 1) Always drop the first data row after the headers (banner line)
-            if len(df) > 0:
-                df = df.iloc[1:].reset_index(drop=True)
-
-            # 2) ALSO remove any stray branch banners
-            df, removed_banners = self._drop_banner_rows(df)
-
-            # 3) Remove any reprinted header lines
-            df, removed_repeat = self._drop_repeated_header_rows(df)
-
-            # Build preview...
-            n = len(df)
-            empty_series = pd.Series([""] * n, index=df.index)
-            zero_series = pd.Series([0] * n, index=df.index)
-
-            description = (
-                "Everlytic - " + df["Message Subject"].astype(str)
-                if "Message Subject" in df.columns else empty_series
-            )
-            txdate = (
-                pd.to_datetime(df["Send Date"], errors="coerce").dt.strftime("%d/%m/%Y")
-                if "Send Date" in df.columns else empty_series
-            )
-            sms_credits = (
-                pd.to_numeric(df["SMSs credit used"], errors="coerce").fillna(0)
-                if "SMSs credit used" in df.columns else zero_series
-            )
-            amount = (sms_credits * 0.14).round(2)
-
-            sms_sent = (
-                df["Sms Sent"] if "Sms Sent" in df.columns else
-                (df["SMSs sent"] if "SMSs sent" in df.columns else empty_series)
-            )
-
-            self.df_preview = pd.DataFrame({
-                "TxDate": txdate,
-                "Description": description,
-                "SMSs credit used": sms_credits,
-                "Sms Sent": sms_sent,
-                "Amount": amount,
-            })
 
-            self._display(self.df_preview)
+        def work(ctx):
+            # Header on row 2 with the account total line dropped; then stray
+            # branch banners and reprinted header lines
+            with perf.stage("read") as s:
+                df, hit = read_report(path)
+                s.rows, s.extra["cache_hit"] = len(df), hit
+            if not path.lower().endswith(".csv"):
+                ctx.summary = describe(hit, "Everlytic")
+            with perf.stage("clean", rows=len(df)):
+                df, removed_banners, removed_repeat = clean_report(df)
+            with perf.stage("transform", rows=len(df)):
+                return build_preview(df), removed_banners, removed_repeat
+
+        def done(result):
+            self.df_preview, removed_banners, removed_repeat = result
+            with perf.stage("display", rows=len(self.df_preview)):
+                self._display(self.df_preview)
             self.source_path = path
             self.status.config(
                 text=(
@@ -103,10 +93,8 @@ class Everlytic:
                 )
             )
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load file:\n{e}")
-
-
+        self.jobs.run(work, on_done=done, text="Loading Everlytic file...",
+                      on_error=lambda e: messagebox.showerror("Error", f"Failed to load file:\n{e}"))
 
     # ---------- Export ----------
     def export_accounting_csv(self):
@@ -127,48 +115,111 @@ class Everlytic:
             return
 
         try:
-            out_df = self._build_export_dataframe(reference_value=ref)
-            out_df.to_csv(path, index=False)
+            with perf.stage("export", rows=len(self.df_preview), module=self.jobs.name):
+                out_df = self._build_export_dataframe(reference_value=ref)
+                out_df.to_csv(path, index=False)
             messagebox.showinfo("Exported", f"Saved to:\n{path}")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to export:\n{e}")
 
+    def export_monthly_journals(self):
+        """Multi-month log -> one journal per month, streamed so the log is never loaded whole."""
+        path = filedialog.askopenfilename(
+            title="Select Everlytic account log",
+            filetypes=[("CSV/Excel files", "*.csv *.xlsx"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        pattern = self.reference_pattern_var.get().strip() or self.REFERENCE_PATTERN
+
+        def work(ctx):
+            with perf.stage("read + aggregate (monthly)") as s:
+                monthly = monthly_aggregates(path, progress=lambda n: ctx.progress(n, text=f"Reading log: {n:,} rows"))
+                s.rows = int(monthly["Messages"].sum())
+            return monthly
+
+        def done(monthly):
+            if monthly.empty:
+                messagebox.showwarning("No Data", "No dated messages found in the log.")
+                return
+            # The table now shows the monthly summary; Export must not write a per-message log the user can't see
+            self.df_preview, self.source_path = None, None
+            self._display(monthly.assign(Month=monthly["Month"].astype(str)))
+            self.status.config(text=f"{os.path.basename(path)}: {len(monthly)} month(s), "
+                                    f"{int(monthly['Messages'].sum())} messages (load a file to export per message)")
+            out_path = filedialog.asksaveasfilename(
+                title="Save Monthly Journals",
+                defaultextension=".csv",
+                initialfile=os.path.splitext(os.path.basename(path))[0] + "_monthly.csv",
+                filetypes=[("CSV (UTF-8)", "*.csv")],
+            )
+            if out_path:
+                with perf.stage("export monthly", rows=len(monthly)):
+                    build_monthly_journal(monthly, pattern, self.ACCOUNT_DEFAULT).to_csv(out_path, index=False)
+                messagebox.showinfo("Exported", f"Saved to:\n{out_path}")
+
+        self.jobs.run(work, on_done=done, text="Summarising log by month...",
+                      on_error=lambda e: messagebox.showerror("Error", f"Failed to summarise log:\n{e}"))
+
     # ---------- Transform ----------
     def _build_export_dataframe(self, reference_value: str) -> pd.DataFrame:
-        src = self.df_preview.copy()
-
-        base = pd.DataFrame({
-            "TxDate": src["TxDate"],
-            "Description": src["Description"],
-            "Reference": reference_value,
-            "Amount": src["Amount"],
-            "UseTax": "N",
-            "TaxType": "",
-            "TaxAccount": "",
-            "TaxAmount": 0,
-            "Project": "",
-            "Account": self.ACCOUNT_DEFAULT,  # 8002/BLM/027/046
-            "IsDebit": "N",
-        })
-
-        dup = base.copy()
-        dup["IsDebit"] = "Y"
-        dup["Account"] = "3020/BLM/"
-
-        out = pd.concat([base, dup], ignore_index=True)
-        return out[self.EXPORT_COLS]
-
-    # ---------- Helpers ----------
-    
-    
+        return build_export(self.df_preview, reference_value, self.ACCOUNT_DEFAULT)
+
+    # ---------- Watch mode ----------
+    def toggle_watch(self):
+        if self.watcher is not None and self.watcher.running:
+            self.watcher.stop()
+            self.watcher = None
+            self.watch_button.config(text="👁 Watch folder...")
+            self.watch_status.config(text="Not watching.")
+            return
+
+        pattern = self.reference_pattern_var.get().strip()
+        if not pattern:
+            messagebox.showwarning("Reference", "Enter a reference pattern first.")
+            return
+        folder = filedialog.askdirectory(title="Select Everlytic inbox folder")
+        if not folder:
+            return
 
+        self.watcher = HotFolder(
+            folder,
+            handler=lambda path: self._process_dropped_file(path, pattern),
+            patterns=("*.csv", "*.xlsx"),
+            ignore=("*_accounting.csv", "*_monthly.csv"),     # our own outputs, if saved into the inbox
+            ledger_name=".everlytic_processed.json",
+            on_event=lambda kind, path, info: self._watch_events.put((kind, path, info)),
+        )
+        self.watcher.start()
+        self.watch_button.config(text="⏹ Stop watching")
+        self.watch_status.config(text=f"Watching {folder}")
+        if self._drain_job is None:
+            self._drain_job = self.container.after(500, self._drain_watch_events)
+
+    def _process_dropped_file(self, path, pattern) -> dict:
+        """Watcher thread: one unattended export, timed like a job stage."""
+        with perf.stage("watch: process file", module=self.jobs.name) as s:
+            info = process_file(path, pattern, self.ACCOUNT_DEFAULT)
+            s.rows = info["rows"]
+        return info
+
+    def _drain_watch_events(self):
+        """Tk side of the watcher: its thread only queues events."""
+        while True:
+            try:
+                kind, path, info = self._watch_events.get_nowait()
+            except queue.Empty:
+                break
+            name = os.path.basename(path)
+            if kind == "processed":
+                text = f"✅ {name} → {os.path.basename(info['output'])} ({info['rows']} rows, ref {info['reference']})"
+            elif kind == "skipped":
+                text = f"⏭ {name} skipped: same content as {info.get('file')} (already processed)"
+            else:
+                text = f"❌ {name}: {info.get('error')}"
+            self.watch_status.config(text=text)
+        self._drain_job = self.container.after(500, self._drain_watch_events) if self.watcher is not None else None
 
     # ---------- Display ----------
     def _display(self, df: pd.DataFrame):
-        self.tree.delete(*self.tree.get_children())
-        self.tree["columns"] = list(df.columns)
-        for col in df.columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=max(120, min(320, len(col) * 12)), anchor="w")
-        for _, row in df.fillna("").iterrows():
-            self.tree.insert("", "end", values=list(row))
+        self.table.show(df, widths={col: max(120, min(320, len(col) * 12)) for col in df.columns})
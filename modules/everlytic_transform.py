@@ -0,0 +1,281 @@
+# modules/everlytic_transform.py
+import os
+import re
+from datetime import datetime
+
+import pandas as pd
+
+from modules.excel_io import read_sheet_cached, iter_sheet_chunks, EVERLYTIC, NO_HEADER
+
+EXPORT_COLS = [
+    "TxDate", "Description", "Reference", "Amount", "UseTax",
+    "TaxType", "TaxAccount", "TaxAmount", "Project", "Account", "IsDebit",
+]
+ACCOUNT_DEFAULT = "8002/BLM/027/046"
+CONTRA_ACCOUNT = "3020/BLM/"
+SMS_RATE = 0.14     # rand per SMS credit
+REFERENCE_PATTERN = "EV{period:%m%y}"   # e.g. EV0825 for the August 2025 report
+
+# First line of every export: "Account logs for period 2025-08-01 to 2025-08-31"
+PERIOD_PATTERN = re.compile(r"period\s+(\d{4}-\d{2}-\d{2})")
+# Columns whose reprinted header text marks a repeated header line
+_HEADER_KEYS = ["Customer Name", "Message Subject", "Send Date"]
+
+# Count/amount columns, exported in the ZA accounting style: " 867,516.00 ", " -   " for zero
+NUMERIC_COLUMNS = [
+    "Emails Sent", "SMSs credit used", "Sms Sent", "SMSs sent", "Sms Failed",
+    "Total Transactional", "Failed Transactional",
+]
+_DASHES = ["-"] + [f"-{' ' * n}" for n in range(1, 8)]
+# C-parser options that read those numbers as floats directly (thousands commas,
+# padding) and turn the dash placeholders into NaN
+_CSV_OPTIONS = dict(header=1, thousands=",", skipinitialspace=True, na_values=_DASHES)
+CHUNK_ROWS = 50_000
+
+
+# ---------- Reading ----------
+def _is_excel(path) -> bool:
+    return os.path.splitext(str(path))[1].lower() in (".xlsx", ".xls", ".xlsm")
+
+
+def parse_za_number(values: pd.Series) -> pd.Series:
+    """' 7,504.00 ' -> 7504.0 and ' -   ' -> NaN for columns the reader left as text."""
+    if values.dtype != object:
+        return values
+    text = values.astype(str).str.strip().str.replace(",", "", regex=False)
+    return pd.to_numeric(text.where(~text.isin(["-", "", "nan", "None"])), errors="coerce")
+
+
+def _tidy(df: pd.DataFrame) -> pd.DataFrame:
+    """Strip padded headers ('  SMSs credit used  ') and make the numeric columns numeric."""
+    df.columns = [str(c).strip() for c in df.columns]
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = parse_za_number(df[col])
+    return df
+
+
+def read_report(path):
+    """
+    Everlytic CSV/Excel export -> (raw rows, cache hit): header on row 2,
+    account total line dropped. Excel goes through the parse cache.
+    """
+    hit = False
+    if _is_excel(path):
+        df, hit = read_sheet_cached(path, layout=EVERLYTIC)
+    else:
+        df = pd.read_csv(path, **_CSV_OPTIONS).iloc[1:].reset_index(drop=True)
+    return _tidy(df), hit
+
+
+def iter_report_chunks(path, chunksize: int = CHUNK_ROWS):
+    """
+    Stream an export as cleaned chunks (banners and reprinted headers removed)
+    so multi-year logs never sit in memory whole. Yields (chunk, raw_rows_read).
+    """
+    if _is_excel(path):
+        chunks = iter_sheet_chunks(path, layout=EVERLYTIC, chunksize=chunksize)
+    else:
+        chunks = pd.read_csv(path, chunksize=chunksize, **_CSV_OPTIONS)
+
+    rows_read = 0
+    for i, chunk in enumerate(chunks):
+        if i == 0 and not _is_excel(path):
+            chunk = chunk.iloc[1:]      # account total line
+        rows_read += len(chunk)
+        chunk, _, _ = clean_report(chunk.reset_index(drop=True))
+        # A reprinted header turns its chunk's numbers into text; re-parse after dropping it
+        yield _tidy(chunk), rows_read
+
+
+def report_period(path):
+    """Start of the reporting period from the banner line, or the file's mtime if there is none."""
+    try:
+        if str(path).lower().endswith(".csv"):
+            with open(path, encoding="utf-8", errors="replace") as f:
+                banner = f.readline()
+        else:
+            chunks = iter_sheet_chunks(path, layout=NO_HEADER, chunksize=1)
+            banner = str(next(chunks).iat[0, 0])
+            chunks.close()
+        match = PERIOD_PATTERN.search(banner)
+        if match:
+            return datetime.strptime(match.group(1), "%Y-%m-%d")
+    except (OSError, ValueError, IndexError, StopIteration):
+        pass
+    return datetime.fromtimestamp(os.path.getmtime(path))
+
+
+# ---------- Cleaning ----------
+def _blank(col: pd.Series) -> pd.Series:
+    return col.isna() | col.astype(str).str.strip().eq("")
+
+
+def drop_banner_rows(df: pd.DataFrame):
+    """Branch/customer total lines: a Customer Name but no Send Date. Returns (df, removed)."""
+    if "Customer Name" not in df.columns or "Send Date" not in df.columns:
+        return df, 0
+    banner = ~_blank(df["Customer Name"]) & _blank(df["Send Date"])
+    return df[~banner].reset_index(drop=True), int(banner.sum())
+
+
+def drop_repeated_header_rows(df: pd.DataFrame):
+    """Header lines reprinted inside the data (cells equal to their column name). Returns (df, removed)."""
+    keys = [c for c in _HEADER_KEYS if c in df.columns]
+    if not keys:
+        return df, 0
+    repeated = pd.concat([df[c].astype(str).str.strip().eq(c) for c in keys], axis=1).any(axis=1)
+    return df[~repeated].reset_index(drop=True), int(repeated.sum())
+
+
+# ---------- Transform ----------
+def build_preview(df: pd.DataFrame) -> pd.DataFrame:
+    """Cleaned report rows -> TxDate, Description, SMS credits/sent and Amount (credits x SMS_RATE)."""
+    n = len(df)
+    empty_series = pd.Series([""] * n, index=df.index)
+    zero_series = pd.Series([0] * n, index=df.index)
+
+    description = (
+        "Everlytic - " + df["Message Subject"].astype(str)
+        if "Message Subject" in df.columns else empty_series
+    )
+    txdate = (
+        pd.to_datetime(df["Send Date"], errors="coerce").dt.strftime("%d/%m/%Y")
+        if "Send Date" in df.columns else empty_series
+    )
+    sms_credits = (
+        pd.to_numeric(df["SMSs credit used"], errors="coerce").fillna(0)
+        if "SMSs credit used" in df.columns else zero_series
+    )
+    amount = (sms_credits * SMS_RATE).round(2)
+
+    sms_sent = (
+        df["Sms Sent"] if "Sms Sent" in df.columns else
+        (df["SMSs sent"] if "SMSs sent" in df.columns else empty_series)
+    )
+
+    return pd.DataFrame({
+        "TxDate": txdate,
+        "Description": description,
+        "SMSs credit used": sms_credits,
+        "Sms Sent": sms_sent,
+        "Amount": amount,
+    })
+
+
+def clean_report(df: pd.DataFrame):
+    """Both cleaning passes. Returns (df, removed_banners, removed_repeat)."""
+    df, removed_banners = drop_banner_rows(df)
+    df, removed_repeat = drop_repeated_header_rows(df)
+    return df, removed_banners, removed_repeat
+
+
+def load_preview(path):
+    """read_report + clean_report + build_preview. Returns (preview, removed_banners, removed_repeat)."""
+    df, _ = read_report(path)
+    df, removed_banners, removed_repeat = clean_report(df)
+    return build_preview(df), removed_banners, removed_repeat
+
+
+def build_export(preview: pd.DataFrame, reference_value: str, account: str = ACCOUNT_DEFAULT) -> pd.DataFrame:
+    """Accounting lines: each preview row against `account`, mirrored as a debit on CONTRA_ACCOUNT."""
+    base = pd.DataFrame({
+        "TxDate": preview["TxDate"],
+        "Description": preview["Description"],
+        "Reference": reference_value,
+        "Amount": preview["Amount"],
+        "UseTax": "N",
+        "TaxType": "",
+        "TaxAccount": "",
+        "TaxAmount": 0,
+        "Project": "",
+        "Account": account,
+        "IsDebit": "N",
+    })
+
+    dup = base.copy()
+    dup["IsDebit"] = "Y"
+    dup["Account"] = CONTRA_ACCOUNT
+
+    out = pd.concat([base, dup], ignore_index=True)
+    return out[EXPORT_COLS]
+
+
+def format_reference(pattern: str, path) -> str:
+    """
+    Reference for an unattended export. `pattern` is a str.format template with
+    {period} (report start date, e.g. {period:%m%y}) and {stem} (file name).
+    """
+    stem = os.path.splitext(os.path.basename(str(path)))[0]
+    return pattern.format(period=report_period(path), stem=stem).strip()
+
+
+def accounting_path(path) -> str:
+    """Output written next to the input: 'SMS AUG 2025.csv' -> 'SMS AUG 2025_accounting.csv'."""
+    return os.path.splitext(str(path))[0] + "_accounting.csv"
+
+
+def process_file(path, reference_pattern: str, account: str = ACCOUNT_DEFAULT, out_path=None) -> dict:
+    """Headless end-to-end run for one export; used by the hot-folder watcher and the CLI."""
+    preview, removed_banners, removed_repeat = load_preview(path)
+    reference = format_reference(reference_pattern, path)
+    out_path = out_path or accounting_path(path)
+    build_export(preview, reference, account).to_csv(out_path, index=False)
+    return {"output": out_path, "rows": len(preview), "reference": reference,
+            "removed_banners": removed_banners, "removed_repeat": removed_repeat}
+
+
+# ---------- Monthly journals ----------
+MONTHLY_COLUMNS = ["Month", "Messages", "SMSs credit used", "Sms Sent", "Amount"]
+
+
+def monthly_aggregates(path, chunksize: int = CHUNK_ROWS, progress=None) -> pd.DataFrame:
+    """
+    Per-month totals of a (multi-year) log, built chunk by chunk: only one
+    chunk and the running monthly sums are held at a time. Amount is summed
+    from the per-message rounded amounts, so it ties to the line-level export.
+    progress(rows_read) is called after each chunk.
+    """
+    partials = []
+    for chunk, rows_read in iter_report_chunks(path, chunksize):
+        preview = build_preview(chunk)
+        month = pd.to_datetime(chunk["Send Date"], errors="coerce").dt.to_period("M") \
+            if "Send Date" in chunk.columns else pd.Series(pd.NaT, index=chunk.index)
+        sent = pd.to_numeric(preview["Sms Sent"], errors="coerce").fillna(0)
+        partials.append(
+            pd.DataFrame({
+                "Month": month,
+                "Messages": 1,
+                "SMSs credit used": preview["SMSs credit used"],
+                "Sms Sent": sent,
+                "Amount": preview["Amount"],
+            }).dropna(subset=["Month"]).groupby("Month").sum()
+        )
+        if progress:
+            progress(rows_read)
+
+    if not partials:
+        return pd.DataFrame(columns=MONTHLY_COLUMNS)
+    monthly = pd.concat(partials).groupby(level=0).sum().sort_index()
+    monthly["Amount"] = monthly["Amount"].round(2)
+    return monthly.reset_index()[MONTHLY_COLUMNS]
+
+
+def build_monthly_journal(monthly: pd.DataFrame, reference_pattern: str,
+                          account: str = ACCOUNT_DEFAULT) -> pd.DataFrame:
+    """
+    One journal per month: dated the last day of the month, described
+    'Everlytic SMS - Aug 2025', reference from reference_pattern with {period}
+    = the month (and {stem} = 'YYYY-MM'), mirrored like build_export.
+    """
+    months = monthly["Month"]
+    preview = pd.DataFrame({
+        "TxDate": months.dt.end_time.dt.strftime("%d/%m/%Y"),
+        "Description": "Everlytic SMS - " + months.dt.strftime("%b %Y"),
+        "Amount": monthly["Amount"],
+    })
+    references = pd.Series(
+        [reference_pattern.format(period=m.to_timestamp(), stem=str(m)).strip() for m in months],
+        index=monthly.index, dtype=object,
+    )
+    return build_export(preview, references, account)
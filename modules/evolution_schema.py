@@ -0,0 +1,117 @@
+# modules/evolution_schema.py
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 50_000
+
+# Per-column storage: "category" for low-cardinality codes/flags, a small
+# numpy int for numeric codes, None to keep the values as given (dates,
+# free text, amounts).
+CATEGORY = "category"
+TEXT = None
+
+
+class ImportLayout:
+    """
+    Column order and compact dtypes of one Evolution import format.
+
+    build() turns scalar constants into a single-category categorical (one
+    byte per row) or a small int array instead of a Python string per row;
+    the full text only exists chunk by chunk when write_csv() writes it.
+    """
+
+    def __init__(self, name: str, columns: dict):
+        self.name = name
+        self.dtypes = dict(columns)
+        self.columns = list(columns)
+
+    def _column(self, name, value, index):
+        dtype = self.dtypes[name]
+        if isinstance(value, pd.Series):
+            value = value.reindex(index) if not value.index.equals(index) else value
+            return value if dtype is None or value.dtype == dtype else value.astype(dtype)
+        n = len(index)
+        if dtype == CATEGORY:
+            return pd.Series(pd.Categorical.from_codes(np.zeros(n, dtype="int8"), categories=[value]), index=index)
+        if dtype is None:
+            return pd.Series([value] * n, index=index, dtype=object if isinstance(value, str) else None)
+        return pd.Series(np.full(n, value, dtype=dtype), index=index)
+
+    def build(self, index, values: dict) -> pd.DataFrame:
+        """Frame in layout order from column -> Series or scalar; every layout column is required."""
+        missing = [c for c in self.columns if c not in values]
+        if missing:
+            raise KeyError(f"{self.name}: missing {', '.join(missing)}")
+        return pd.DataFrame({c: self._column(c, values[c], index) for c in self.columns}, index=index, copy=False)
+
+    def derive(self, df: pd.DataFrame, overrides: dict) -> pd.DataFrame:
+        """Same rows as df with some columns replaced; the other columns are reused, not copied."""
+        return self.build(df.index, {**{c: df[c] for c in self.columns}, **overrides})
+
+    def conform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """An existing frame in layout order with the layout's compact dtypes."""
+        return self.build(df.index, {c: df[c] for c in self.columns})
+
+
+def iter_chunks(df: pd.DataFrame, chunksize: int = CHUNK_ROWS):
+    """Row slices of df; an empty frame yields itself once so its header still gets written."""
+    if df.empty:
+        yield df
+        return
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+
+def write_csv_chunks(chunks, path, encoding: str = "utf-8", **kwargs):
+    """Write an iterable of same-layout frames as one CSV (header from the first)."""
+    kwargs.setdefault("index", False)
+    with open(path, "w", encoding=encoding, newline="") as f:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(f, header=i == 0, **kwargs)
+
+
+def write_csv(df: pd.DataFrame, path, chunksize: int = CHUNK_ROWS, encoding: str = "utf-8", **kwargs):
+    """
+    DataFrame.to_csv, but rows are turned into text `chunksize` at a time, so
+    a large import with categorical columns never exists as one object matrix.
+    Output is byte-for-byte what df.to_csv(path, index=False, ...) writes.
+    """
+    write_csv_chunks(iter_chunks(df, chunksize), path, encoding=encoding, **kwargs)
+
+
+def memory_mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+# ---------- Registry ----------
+# Cashbook batch import (petty cash / eWallet, 9500 deposits)
+CASHBOOK = ImportLayout("cashbook", {
+    'TxDate': TEXT, 'Description': TEXT, 'Reference': TEXT, 'Amount': TEXT,
+    'UseTax': CATEGORY, 'TaxType': CATEGORY, 'TaxAccount': CATEGORY, 'TaxAmount': "int8",
+    'Project': CATEGORY, 'Account': CATEGORY, 'IsDebit': CATEGORY, 'SplitType': "int8",
+    'SplitGroup': "int8", 'Reconcile': CATEGORY, 'PostDated': CATEGORY, 'UseDiscount': CATEGORY,
+    'DiscPerc': "int8", 'DiscTrCode': CATEGORY, 'DiscDesc': CATEGORY, 'UseDiscTax': CATEGORY,
+    'DiscTaxType': CATEGORY, 'DiscTaxAcc': CATEGORY, 'DiscTaxAmt': "int8", 'PayeeName': CATEGORY,
+    'PrintCheque': CATEGORY, 'SalesRep': CATEGORY, 'Module': "int8", 'SagePayExtra1': CATEGORY,
+    'SagePayExtra2': CATEGORY, 'SagePayExtra3': CATEGORY,
+})
+
+# Recovery invoices from the GL extractor (upper-case headers)
+GL_INVOICE = ImportLayout("gl_invoice", {
+    'DOCTYPE': "int8", 'ACCOUNTID': CATEGORY, 'DESCRIPTION': CATEGORY, 'INVDATE': CATEGORY,
+    'TAXINCLUSIVE': CATEGORY, 'ORDERNUM': CATEGORY, 'CDESCRIPTION': TEXT, 'CLINENOTES': CATEGORY,
+    'FQUANTITY': "int8", 'FQTYTOPROCESS': "int8", 'FUNITPRICEEXCL': TEXT, 'IMODULE': "int8",
+    'ISTOCKCODEID': CATEGORY, 'ILEDGERACCOUNTID': CATEGORY, 'ITAXTYPEID': "int8",
+    'IWAREHOUSEID': CATEGORY, 'IPRICELISTNAMEID': "int8",
+})
+
+# Bidmaster sales invoices (Evolution's own header casing)
+SALES_INVOICE = ImportLayout("sales_invoice", {
+    'DocType': CATEGORY, 'AccountID': CATEGORY, 'aDescription': CATEGORY, 'InvDate': CATEGORY,
+    'TaxInclusive': CATEGORY, 'OrderNum': CATEGORY, 'cDescription': TEXT, 'CLIENTNOTES': TEXT,
+    'fQuantity': CATEGORY, 'fQtyToProcess': CATEGORY, 'fUnitPriceExcl': TEXT, 'iModule': CATEGORY,
+    'iStockCodeID': CATEGORY, 'iLedgerAccountID': CATEGORY, 'iTaxTypeID': CATEGORY,
+    'iWarehouseID': CATEGORY, 'iPriceListNameID': CATEGORY,
+})
+
+LAYOUTS = {layout.name: layout for layout in (CASHBOOK, GL_INVOICE, SALES_INVOICE)}
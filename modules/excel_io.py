@@ -0,0 +1,249 @@
+# modules/excel_io.py
+import os
+from datetime import date, datetime
+from typing import Iterator, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class SheetLayout(NamedTuple):
+    """Where the data sits on a sheet. Row numbers are 0-based, like pandas' header=."""
+    header: Optional[int] = 0       # header row; None = no header, columns are 0..n-1
+    skip_after_header: int = 0      # banner/unit rows to drop straight after the header
+    ncols: Optional[int] = None     # only read the first N columns
+
+
+# ---------- Known layouts ----------
+DEFAULT = SheetLayout()
+NO_HEADER = SheetLayout(header=None)
+PETTY_CASH = SheetLayout(header=3, skip_after_header=2)   # header on row 4, data from row 7
+EVERLYTIC = SheetLayout(header=1, skip_after_header=1)    # period banner, header, account total
+
+STREAMABLE = (".xlsx", ".xlsm")
+CHUNK_ROWS = 50_000
+
+# ---------- Engines ----------
+# "calamine" (python-calamine, Rust): several times faster than openpyxl and
+# also reads legacy .xls, but parses a whole sheet at once. "openpyxl" streams
+# .xlsx/.xlsm in read-only mode. "auto" takes calamine when it is installed.
+ENGINE = os.environ.get("AUCOR_EXCEL_ENGINE", "auto")
+CALAMINE_TYPES = (".xlsx", ".xlsm", ".xlsb", ".xls", ".ods")
+
+try:
+    import python_calamine  # noqa: F401
+    HAVE_CALAMINE = True
+except ImportError:
+    HAVE_CALAMINE = False
+
+
+def available_engines() -> list:
+    return (["calamine"] if HAVE_CALAMINE else []) + ["openpyxl"]
+
+
+def resolve_engine(path, engine: Optional[str] = None) -> str:
+    """
+    Engine that will read `path`: 'calamine', 'openpyxl', or 'pandas' for
+    files openpyxl can't stream (.xls without calamine -> pd.read_excel/xlrd).
+    """
+    engine = engine or ENGINE
+    if engine not in ("auto", "calamine", "openpyxl"):
+        raise ValueError(f"Unknown Excel engine '{engine}' (use auto, calamine or openpyxl)")
+    if engine == "calamine" and not HAVE_CALAMINE:
+        raise ImportError("The calamine engine needs the python-calamine package")
+    ext = os.path.splitext(str(path))[1].lower()
+    if engine in ("auto", "calamine") and HAVE_CALAMINE and ext in CALAMINE_TYPES:
+        return "calamine"
+    return "openpyxl" if ext in STREAMABLE else "pandas"
+
+
+# ---------- Helpers ----------
+def _column_names(header_row) -> list:
+    """Header cells -> column labels the way pandas names them (Unnamed: i, dupes get .1, .2)."""
+    names, seen = [], {}
+    for i, value in enumerate(header_row):
+        name = f"Unnamed: {i}" if value is None or str(value) == "" else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _frame(rows: list, columns, dtypes) -> pd.DataFrame:
+    df = pd.DataFrame(rows)
+    if columns is not None:
+        width = max(len(columns), df.shape[1])
+        names = columns + _column_names([None] * width)[len(columns):]
+        df = df.reindex(columns=range(width))
+        df.columns = names
+
+    # Empty cells come through as None; make them NaN and re-infer like read_excel does
+    obj = df.columns[df.dtypes == object]
+    if len(obj):
+        df[obj] = df[obj].where(df[obj].notna(), np.nan)
+        df = df.infer_objects()
+    return _apply_dtypes(df, dtypes) if dtypes else df
+
+
+def _apply_dtypes(df: pd.DataFrame, dtypes: dict) -> pd.DataFrame:
+    """'float' and 'datetime' coerce bad values to NaN/NaT; anything else goes to astype."""
+    for col, dtype in dtypes.items():
+        if col not in df.columns:
+            continue
+        if dtype == "float":
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+        elif dtype == "datetime":
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+        else:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def _read_fallback(path, sheet, layout: SheetLayout) -> pd.DataFrame:
+    """Non-OOXML files (.xls) without calamine go through pandas (xlrd) in one piece."""
+    usecols = list(range(layout.ncols)) if layout.ncols else None
+    df = pd.read_excel(path, sheet_name=sheet, header=layout.header, usecols=usecols)
+    return df.iloc[layout.skip_after_header:].reset_index(drop=True)
+
+
+def _calamine_cell(value):
+    """calamine -> the values openpyxl gives: None for empty, int for whole numbers, datetime for dates."""
+    if isinstance(value, str):
+        return value if value != "" else None
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime(value.year, value.month, value.day)
+    return value
+
+
+def _calamine_rows(path, sheet, ncols):
+    from python_calamine import CalamineWorkbook
+    wb = CalamineWorkbook.from_path(str(path))
+    ws = wb.get_sheet_by_index(sheet) if isinstance(sheet, int) else wb.get_sheet_by_name(sheet)
+    # skip_empty_area=False keeps leading blank rows/columns so header= rows line up
+    for row in ws.to_python(skip_empty_area=False):
+        yield tuple(_calamine_cell(v) for v in (row[:ncols] if ncols else row))
+
+
+def _openpyxl_rows(path, sheet, ncols):
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[sheet] if isinstance(sheet, int) else wb[sheet]
+        yield from ws.iter_rows(values_only=True, max_col=ncols)
+    finally:
+        wb.close()
+
+
+# ---------- Public ----------
+def sheet_names(path, engine: Optional[str] = None) -> list:
+    engine = resolve_engine(path, engine)
+    if engine == "calamine":
+        from python_calamine import CalamineWorkbook
+        return list(CalamineWorkbook.from_path(str(path)).sheet_names)
+    if engine == "openpyxl":
+        from openpyxl import load_workbook
+        wb = load_workbook(path, read_only=True)
+        try:
+            return list(wb.sheetnames)
+        finally:
+            wb.close()
+    return pd.ExcelFile(path).sheet_names
+
+
+def iter_sheet_chunks(path, sheet=0, layout: SheetLayout = DEFAULT,
+                      chunksize: int = CHUNK_ROWS, dtypes: Optional[dict] = None,
+                      engine: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """
+    Stream a worksheet as DataFrame chunks of up to `chunksize` rows.
+
+    With openpyxl, .xlsx/.xlsm files are read in read-only mode, so only the
+    current chunk is held in memory and reading stops at layout.ncols columns.
+    With calamine (see resolve_engine) the sheet is parsed in one fast pass
+    and then chunked the same way; .xls files are read by calamine too.
+    Blank rows inside the data are kept and trailing blank rows dropped, which
+    matches pd.read_excel. `dtypes` maps column -> 'float', 'datetime' or any
+    astype() dtype and is applied to every chunk.
+    """
+    engine = resolve_engine(path, engine)
+    if engine == "pandas":
+        df = _read_fallback(path, sheet, layout)
+        yield _apply_dtypes(df, dtypes) if dtypes else df
+        return
+
+    rows = (_calamine_rows if engine == "calamine" else _openpyxl_rows)(path, sheet, layout.ncols)
+    try:
+        columns = None
+        if layout.header is not None:
+            for _ in range(layout.header):
+                next(rows, None)
+            columns = _column_names(next(rows, ()))
+        for _ in range(layout.skip_after_header):
+            next(rows, None)
+
+        batch, blanks = [], []
+        for row in rows:
+            if all(v is None for v in row):
+                blanks.append(row)      # only kept if more data follows
+                continue
+            if blanks:
+                batch.extend(blanks)
+                blanks = []
+            batch.append(row)
+            if len(batch) >= chunksize:
+                yield _frame(batch, columns, dtypes)
+                batch = []
+
+        if batch or columns is not None:
+            yield _frame(batch, columns, dtypes)
+    finally:
+        rows.close()
+
+
+def read_sheet(path, sheet=0, layout: SheetLayout = DEFAULT, dtypes: Optional[dict] = None,
+               on_chunk=None, engine: Optional[str] = None) -> pd.DataFrame:
+    """
+    Whole worksheet as one DataFrame, read through iter_sheet_chunks.
+    on_chunk(rows_read) is called after every chunk (e.g. JobContext progress).
+    """
+    chunks, rows_read = [], 0
+    for chunk in iter_sheet_chunks(path, sheet, layout, dtypes=dtypes, engine=engine):
+        chunks.append(chunk)
+        rows_read += len(chunk)
+        if on_chunk:
+            on_chunk(rows_read)
+    non_empty = [c for c in chunks if not c.empty]
+    if len(non_empty) == 1:
+        return non_empty[0]
+    if non_empty:
+        return pd.concat(non_empty, ignore_index=True)
+    return chunks[-1] if chunks else pd.DataFrame()
+
+
+def read_sheet_cached(path, sheet=0, layout: SheetLayout = DEFAULT, dtypes: Optional[dict] = None,
+                      on_chunk=None, engine: Optional[str] = None, clean=None):
+    """
+    read_sheet() through the parse cache. Returns (df, hit); a repeat load of
+    the same file contents with the same sheet/layout/dtypes/engine skips parsing.
+    clean(df), an in-place tidy-up such as diff_engine.clean_dataframe, runs
+    before the frame is stored, so a hit returns the cleaned frame as is.
+    """
+    from modules import parse_cache
+    engine = resolve_engine(path, engine)
+
+    def parse():
+        df = read_sheet(path, sheet, layout, dtypes, on_chunk, engine)
+        if clean is not None:
+            clean(df)
+        return df
+
+    return parse_cache.load(
+        path, parse,
+        reader="excel_io.read_sheet", sheet=sheet, layout=tuple(layout),
+        dtypes=sorted((dtypes or {}).items()), engine=engine,
+        clean=f"{clean.__module__}.{clean.__qualname__}" if clean is not None else None,
+    )
@@ -2,9 +2,15 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from tkcalendar import DateEntry  # this works fine without ttkbootstrap
 import pandas as pd
-import re
 import os
 
+from modules.jobs import JobRunner
+from modules import perf
+from modules.excel_io import read_sheet_cached, NO_HEADER
+from modules.parse_cache import describe
+from modules.gl_transform import extract_gl_rows, build_customer_invoices, build_supplier_invoices
+from modules.evolution_schema import write_csv
+
 class GLExtractorApp:
     def __init__(self, parent):
         self.parent = parent
@@ -49,84 +55,45 @@ class GLExtractorApp:
         ttk.Label(form, text="Select a ledger Excel file").grid(row=1, column=0, padx=5, pady=5, sticky="w")
         ttk.Button(form, text="📁 Browse File", command=self.process_file).grid(row=1, column=1, padx=5, pady=5)
 
+        self.jobs = JobRunner(self.frame, name="GL Extractor")
+        self.jobs.pack(fill="x", pady=5)
+
         # Output preview
         self.filename_label = ttk.Label(self.frame, text="", foreground="blue")
         self.filename_label.pack(pady=5)
 
     def process_file(self):
-        try:
-            file_path = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx")])
-            if not file_path:
-                return
-
-            df = pd.read_excel(file_path, sheet_name=0, header=None, engine='openpyxl')
-            cleaned_data = []
-            current_gl = None
-
-            for index, row in df.iterrows():
-                first_cell = str(row[0]) if not pd.isna(row[0]) else ""
-                if re.match(r"\d{4}/[A-Z]{2,3}/\d{3}", first_cell):
-                    current_gl = first_cell.strip()
-                    continue
-                try:
-                    date = pd.to_datetime(first_cell, errors='coerce')
-                    if pd.notna(date):
-                        cleaned_data.append([current_gl] + row.tolist())
-                except:
-                    continue
-
-            columns = ['GL', 'Date', 'Reference', 'Description', 'Unused', 'Debit', 'Credit', 'Balance']
-            clean_df = pd.DataFrame(cleaned_data, columns=columns)
-            selected_date = self.date_entry.get()
-
-            clean_df['DOCTYPE'] = 4
-            clean_df['ACCOUNTID'] = 'A008'
-            clean_df['DESCRIPTION'] = 'Aucor Central'
-            clean_df['INVDATE'] = selected_date
-            clean_df['TAXINCLUSIVE'] = ''
-            clean_df['ORDERNUM'] = 'A008'
-            clean_df['CDESCRIPTION'] = 'REC: ' + clean_df['Description'].astype(str)
-            clean_df['CLINENOTES'] = ''
-            clean_df['FQUANTITY'] = 1
-            clean_df['FUNITPRICEEXCL'] = clean_df['Debit'].fillna(0).astype(float)
-
-            credit_only_mask = (clean_df['Debit'].fillna(0) == 0) & (clean_df['Credit'].fillna(0) > 0)
-            clean_df.loc[credit_only_mask, 'FUNITPRICEEXCL'] = clean_df.loc[credit_only_mask, 'Credit'].astype(float)
-            clean_df.loc[credit_only_mask, 'FQUANTITY'] = -1
-            clean_df['FQTYTOPROCESS'] = clean_df['FQUANTITY']
-
-            clean_df['IMODULE'] = 1
-            clean_df['ISTOCKCODEID'] = ''
-            clean_df['ILEDGERACCOUNTID'] = clean_df['GL']
-            clean_df['ITAXTYPEID'] = 1
-            clean_df['IWAREHOUSEID'] = 'MSTR'
-            clean_df['IPRICELISTNAMEID'] = 1
-
-            clean_df = clean_df[clean_df['ILEDGERACCOUNTID'].str.endswith('/007')]
-
-            final_df = clean_df[['DOCTYPE', 'ACCOUNTID', 'DESCRIPTION', 'INVDATE', 'TAXINCLUSIVE', 'ORDERNUM',
-                                 'CDESCRIPTION', 'CLINENOTES', 'FQUANTITY', 'FQTYTOPROCESS', 'FUNITPRICEEXCL',
-                                 'IMODULE', 'ISTOCKCODEID', 'ILEDGERACCOUNTID', 'ITAXTYPEID', 'IWAREHOUSEID',
-                                 'IPRICELISTNAMEID']]
-
-            final_df = final_df.replace({'\'': '', '\"': '', ',': ''}, regex=True)
+        file_path = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx")])
+        if not file_path:
+            return
+        selected_date = self.date_entry.get()
+
+        def work(ctx):
+            with perf.stage("read") as s:
+                df, hit = read_sheet_cached(file_path, sheet=0, layout=NO_HEADER,
+                                            on_chunk=lambda n: ctx.progress(n, text=f"Reading ledger: {n:,} rows"))
+                s.rows, s.extra["cache_hit"] = len(df), hit
+            ctx.summary = describe(hit, "Ledger")
+            with perf.stage("extract", rows=len(df)):
+                clean_df = extract_gl_rows(df)
+            ctx.check()
+
+            with perf.stage("transform", rows=len(clean_df)):
+                final_df = build_customer_invoices(clean_df, selected_date)
+                supplier_df = build_supplier_invoices(final_df)
 
             output_dir = os.path.dirname(file_path)
             cust_path = os.path.join(output_dir, "Inv_InvoiceCustomer.csv")
-            final_df.to_csv(cust_path, index=False)
-
-            supplier_df = final_df.copy()
-            supplier_df['DOCTYPE'] = 5
-            supplier_df['ACCOUNTID'] = 'A001'
-            supplier_df['DESCRIPTION'] = 'Aucor Bloemfontein'
-            supplier_df['ORDERNUM'] = 'A001'
-            supplier_df['CDESCRIPTION'] = supplier_df['CDESCRIPTION'].str.replace('^REC:', 'B:', regex=True)
-            supplier_df = supplier_df.replace({'\'': '', '\"': '', ',': ''}, regex=True)
-
             supp_path = os.path.join(output_dir, "Inv_InvoiceSupplier.csv")
-            supplier_df.to_csv(supp_path, index=False)
-
+            with perf.stage("write", rows=len(final_df) + len(supplier_df)):
+                write_csv(final_df, cust_path)
+                write_csv(supplier_df, supp_path)
+            return cust_path, supp_path
+
+        def done(paths):
+            cust_path, supp_path = paths
+            self.filename_label.config(text=f"Saved {os.path.basename(cust_path)} and {os.path.basename(supp_path)}")
             messagebox.showinfo("Success", f"Files saved:\n{cust_path}\n{supp_path}")
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Something went wrong:\n{str(e)}")
+        self.jobs.run(work, on_done=done, text="Processing ledger...",
+                      on_error=lambda e: messagebox.showerror("Error", f"Something went wrong:\n{str(e)}"))
@@ -0,0 +1,168 @@
+# modules/export_ledger.py
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+LEDGER_PATH = os.environ.get(
+    "AUCOR_EXPORT_LEDGER",
+    os.path.join(os.path.expanduser("~"), ".aucor_tools", "export_ledger.sqlite3"),
+)
+
+# ---------- Natural keys ----------
+# kind -> (date, reference, amount, account) columns of its Evolution import
+_CASHBOOK_KEY = ("TxDate", "Reference", "Amount", "Account")
+KEYS = {
+    "deposits": _CASHBOOK_KEY,
+    "petty_cash": _CASHBOOK_KEY,
+    "bidmaster": ("InvDate", "cDescription", "fUnitPriceExcl", "AccountID"),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS exports (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    file TEXT,
+    exported_at TEXT NOT NULL,
+    rows INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lines (
+    export_id INTEGER NOT NULL REFERENCES exports(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    key INTEGER NOT NULL,
+    occurrence INTEGER NOT NULL,
+    tx_date TEXT,
+    reference TEXT,
+    amount_cents INTEGER,
+    account TEXT
+);
+CREATE INDEX IF NOT EXISTS lines_key ON lines (kind, key, occurrence);
+CREATE INDEX IF NOT EXISTS lines_export ON lines (export_id);
+"""
+
+
+def natural_keys(kind: str, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    tx_date, reference, amount_cents, account, key and occurrence per row.
+    key is a 64-bit hash of the four fields; occurrence numbers repeats of a
+    key inside one export (0, 1, ...), so two identical deposits on the same
+    day are two lines: a later export holding both again repeats both, a
+    third identical line in it is new.
+    """
+    date_col, ref_col, amount_col, account_col = KEYS[kind]
+    text = lambda col: df[col].astype(str).str.strip()     # noqa: E731
+    amount = pd.to_numeric(df[amount_col], errors="coerce").mul(100).round()
+    keys = pd.DataFrame({
+        "tx_date": text(date_col),
+        "reference": text(ref_col),
+        "amount_cents": amount.astype("Int64"),
+        "account": text(account_col),
+    }, index=df.index)
+    # hash_pandas_object is uint64; SQLite integers are signed
+    keys["key"] = pd.util.hash_pandas_object(keys, index=False).to_numpy().view("int64")
+    keys["occurrence"] = keys.groupby("key").cumcount()
+    return keys
+
+
+# ---------- Ledger ----------
+class ExportLedger:
+    """
+    Every line written to an Evolution import, by natural key, in a local
+    SQLite file. check() flags lines an earlier export already contained;
+    record() adds an export once it is written.
+    """
+
+    def __init__(self, path: str = LEDGER_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")     # batch workers record concurrently
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def check(self, kind: str, df: pd.DataFrame) -> pd.Series:
+        """
+        Per row of df: None for new lines, else 'file (exported_at)' of the
+        first export that already held the line. One indexed join for the
+        whole frame.
+        """
+        keys = natural_keys(kind, df)
+        probe = zip(range(len(keys)), keys["key"].tolist(), keys["occurrence"].tolist())
+        with closing(self._connect()) as conn:
+            conn.execute("CREATE TEMP TABLE probe (row INTEGER, key INTEGER, occurrence INTEGER)")
+            conn.executemany("INSERT INTO probe VALUES (?, ?, ?)", probe)
+            found = conn.execute("""
+                SELECT p.row, MIN(l.export_id)
+                FROM probe p
+                JOIN lines l ON l.kind = ? AND l.key = p.key AND l.occurrence = p.occurrence
+                GROUP BY p.row
+            """, (kind,)).fetchall()
+            ids = sorted({export_id for _, export_id in found})
+            labels = {
+                export_id: f"{os.path.basename(file or '')} ({exported_at})"
+                for export_id, file, exported_at in conn.execute(
+                    f"SELECT id, file, exported_at FROM exports WHERE id IN ({','.join('?' * len(ids))})", ids)
+            } if ids else {}
+        previous = pd.Series(None, index=df.index, dtype=object)
+        if found:
+            rows, export_ids = zip(*found)
+            previous.iloc[list(rows)] = [labels[i] for i in export_ids]
+        return previous
+
+    def record(self, kind: str, df: pd.DataFrame, file: str = None, mask=None) -> int:
+        """
+        Add df as one export of `kind`; returns the export id. When only some
+        lines were written (repeats skipped), pass the whole checked frame and
+        mask = the written rows (previous.isna()): occurrences are numbered
+        over all of df, as check() numbered them, so a third identical line
+        is stored as occurrence 2 and not as a second 0.
+        """
+        keys = natural_keys(kind, df)
+        if mask is not None:
+            keys = keys[np.asarray(mask, dtype=bool)]
+        amounts = keys["amount_cents"].astype(object).where(keys["amount_cents"].notna(), None)
+        with closing(self._connect()) as conn, conn:
+            export_id = conn.execute(
+                "INSERT INTO exports (kind, file, exported_at, rows) VALUES (?, ?, ?, ?)",
+                (kind, file, datetime.now().isoformat(sep=" ", timespec="seconds"), len(keys)),
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO lines VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                zip([export_id] * len(keys), [kind] * len(keys), keys["key"].tolist(),
+                    keys["occurrence"].tolist(), keys["tx_date"].tolist(), keys["reference"].tolist(),
+                    amounts.tolist(), keys["account"].tolist()),
+            )
+        return export_id
+
+    def exports(self, kind: str = None) -> pd.DataFrame:
+        """Recorded exports, newest first."""
+        query = "SELECT id, kind, file, exported_at, rows FROM exports"
+        params = ()
+        if kind:
+            query, params = query + " WHERE kind = ?", (kind,)
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(query + " ORDER BY id DESC", conn, params=params)
+
+    def remove(self, export_id: int):
+        """Forget an export, e.g. one Evolution rejected, so its lines can be exported again."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM exports WHERE id = ?", (export_id,))
+
+
+REPEATS_PROMPT = "\n\nYes: export only the new lines\nNo: export all lines\nCancel: don't export"
+
+
+def describe(previous: pd.Series) -> str:
+    """'12 of 300 lines were exported before, e.g. in deposits_aug.csv (2025-09-01 10:15:00).'"""
+    repeats = previous.dropna()
+    if repeats.empty:
+        return ""
+    return (f"{len(repeats):,} of {len(previous):,} lines were exported before, "
+            f"e.g. in {repeats.value_counts().index[0]}.")
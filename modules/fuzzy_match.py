@@ -0,0 +1,126 @@
+# modules/fuzzy_match.py
+import numpy as np
+import pandas as pd
+
+# Near-miss tolerances for the second matching stage
+DATE_TOLERANCE_DAYS = 3
+AMOUNT_TOLERANCE = 0.05     # rand; covers cents rounding on either side
+MIN_SCORE = 0.5             # weaker candidates are not worth a clerk's time
+
+# Score weights (a perfect pair scores 1.0)
+_DATE_WEIGHT = 0.5
+_AMOUNT_WEIGHT = 0.3
+_REFERENCE_WEIGHT = 0.2
+
+_NO_DATE = pd.Timestamp("1970-01-01")
+
+
+def _signed_amount(df: pd.DataFrame) -> pd.Series:
+    """Credit positive, debit negative, so a receipt never pairs with a payment."""
+    amount = pd.Series(0.0, index=df.index)
+    for col, sign in (("Credit", 1), ("Debit", -1)):
+        if col in df.columns:
+            amount += sign * pd.to_numeric(df[col], errors="coerce").fillna(0)
+    return amount
+
+
+def _reference(df: pd.DataFrame) -> pd.Series:
+    if "Reference" not in df.columns:
+        return pd.Series("", index=df.index)
+    return (df["Reference"].astype(str).str.strip().str.lstrip("0")
+            .str.replace(r"\.0$", "", regex=True).replace(["None", "nan", "<NA>"], ""))
+
+
+def _keys(df: pd.DataFrame, tolerance: float) -> pd.DataFrame:
+    """Per-row match keys: position, signed amount, amount bucket, date and reference."""
+    amount = _signed_amount(df)
+    if "Date" in df.columns:
+        date = pd.to_datetime(df["Date"], errors="coerce")
+    else:
+        date = pd.Series(_NO_DATE, index=df.index)
+    keys = pd.DataFrame({
+        "row": np.arange(len(df)),
+        "amount": amount.to_numpy(),
+        # Amounts within `tolerance` of each other are at most one bucket apart
+        "bucket": np.floor(amount.to_numpy() / tolerance).astype("int64"),
+        "date": date.to_numpy(),
+        "ref": _reference(df).to_numpy(),
+    })
+    return keys.dropna(subset=["date"]).sort_values("date", kind="stable")
+
+
+def _one_to_one(candidates: pd.DataFrame) -> pd.DataFrame:
+    """Greedy best-score-first pairing: each A and each B row is used at most once."""
+    remaining = candidates.sort_values(["score", "row_a", "row_b"], ascending=[False, True, True])
+    chosen = []
+    while not remaining.empty:
+        best = remaining[~remaining["row_a"].duplicated() & ~remaining["row_b"].duplicated()]
+        # The top row is always kept, so every round makes progress
+        chosen.append(best)
+        remaining = remaining[~remaining["row_a"].isin(best["row_a"]) & ~remaining["row_b"].isin(best["row_b"])]
+    return pd.concat(chosen).sort_values("score", ascending=False, kind="stable") if chosen else remaining
+
+
+def propose_matches(only_in_a: pd.DataFrame, only_in_b: pd.DataFrame,
+                    date_tolerance_days: int = DATE_TOLERANCE_DAYS,
+                    amount_tolerance: float = AMOUNT_TOLERANCE,
+                    min_score: float = MIN_SCORE) -> pd.DataFrame:
+    """
+    Candidate pairs between the unmatched rows of an exact compare.
+
+    Rows are bucketed by signed amount and, inside a bucket, joined to the
+    nearest date with merge_asof (the neighbouring buckets are probed too), so
+    the cost is a few sorts rather than an A x B cross-join. Pairs further
+    apart than the tolerances are dropped, the rest scored 0..1 (date gap,
+    amount gap, reference agreement); pairs scoring at least min_score are
+    paired one-to-one, best first.
+
+    Returns one row per pair: Score, Days apart, Amount diff, then the A
+    columns prefixed "A: " and the B columns prefixed "B: ". "A row" and
+    "B row" are positions in only_in_a / only_in_b.
+    """
+    amount_tolerance = max(amount_tolerance, 0.005)
+    keys_a = _keys(only_in_a, amount_tolerance)
+    keys_b = _keys(only_in_b, amount_tolerance)
+    if keys_a.empty or keys_b.empty:
+        return pd.DataFrame(columns=["Score", "Days apart", "Amount diff", "A row", "B row"])
+
+    tolerance = pd.Timedelta(days=date_tolerance_days)
+    probes = []
+    for shift in (-1, 0, 1):
+        right = keys_b.assign(bucket=keys_b["bucket"] - shift)
+        probes.append(pd.merge_asof(
+            keys_a, right, on="date", by="bucket", suffixes=("_a", "_b"),
+            tolerance=tolerance, direction="nearest", allow_exact_matches=True,
+        ).dropna(subset=["row_b"]))
+    cand = pd.concat(probes, ignore_index=True)
+    if cand.empty:
+        return pd.DataFrame(columns=["Score", "Days apart", "Amount diff", "A row", "B row"])
+
+    cand["row_b"] = cand["row_b"].astype("int64")
+    cand["amount_gap"] = (cand["amount_a"] - cand["amount_b"]).abs().round(2)
+    cand = cand[cand["amount_gap"] <= amount_tolerance]
+
+    # merge_asof keeps A's date; look B's back up for the gap
+    date_b = keys_b.set_index("row")["date"]
+    cand["days"] = (cand["date"] - cand["row_b"].map(date_b)).abs().dt.days
+    ref_differs = (cand["ref_a"] != cand["ref_b"]) | (cand["ref_a"] == "")
+    cand["score"] = (1.0
+                     - _DATE_WEIGHT * cand["days"] / (date_tolerance_days + 1)
+                     - _AMOUNT_WEIGHT * cand["amount_gap"] / amount_tolerance
+                     - _REFERENCE_WEIGHT * ref_differs).round(3)
+
+    cand = cand[cand["score"] >= min_score]
+    pairs = _one_to_one(cand[["row_a", "row_b", "score", "days", "amount_gap"]].drop_duplicates(["row_a", "row_b"]))
+
+    left = only_in_a.iloc[pairs["row_a"].to_numpy()].add_prefix("A: ").reset_index(drop=True)
+    right = only_in_b.iloc[pairs["row_b"].to_numpy()].add_prefix("B: ").reset_index(drop=True)
+    head = pd.DataFrame({
+        "Score": pairs["score"].to_numpy(),
+        "Days apart": pairs["days"].to_numpy(),
+        "Amount diff": pairs["amount_gap"].to_numpy(),
+    })
+    out = pd.concat([head, left, right], axis=1)
+    out["A row"] = pairs["row_a"].to_numpy()
+    out["B row"] = pairs["row_b"].to_numpy()
+    return out
@@ -0,0 +1,95 @@
+# modules/gl_transform.py
+import re
+
+import pandas as pd
+
+from modules.evolution_schema import GL_INVOICE
+
+# GL header rows in the Account Transactions export look like "1234/BLM/007 ..."
+GL_HEADER_PATTERN = r"\d{4}/[A-Z]{2,3}/\d{3}"
+
+LEDGER_COLUMNS = ['GL', 'Date', 'Reference', 'Description', 'Unused', 'Debit', 'Credit', 'Balance']
+
+INVOICE_COLUMNS = GL_INVOICE.columns
+
+_STRIP_QUOTES = {'\'': '', '\"': '', ',': ''}
+_STRIP_QUOTES_RE = re.compile("['\",]")
+
+
+def _parse_dates(text: pd.Series) -> pd.Series:
+    """Bulk date parse: ISO strings in one vectorized pass, anything else per value."""
+    dates = pd.to_datetime(text, format="ISO8601", errors="coerce")
+    rest = dates.isna() & text.ne("")
+    if rest.any():
+        dates[rest] = pd.to_datetime(text[rest], format="mixed", errors="coerce")
+    return dates
+
+
+def extract_gl_rows(raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Split an Account Transactions export (read with header=None) into
+    transaction rows tagged with the GL header they appear under.
+
+    GL header rows are found in one regex pass over the first column, the GL
+    code is forward-filled down to its transactions, and only rows whose first
+    cell parses as a date are kept.
+    """
+    first = raw[raw.columns[0]]
+    text = first.astype(str).where(first.notna(), "")
+
+    is_header = text.str.match(GL_HEADER_PATTERN)
+    gl = text.str.strip().where(is_header).ffill()
+    dates = _parse_dates(text.where(~is_header, ""))
+
+    keep = ~is_header & dates.notna()
+    clean_df = raw.loc[keep].copy()
+    clean_df.insert(0, 'GL', gl[keep])
+    clean_df.columns = LEDGER_COLUMNS
+    return clean_df.reset_index(drop=True).infer_objects()
+
+
+def _strip_quotes(text: pd.Series) -> pd.Series:
+    return text.replace(_STRIP_QUOTES, regex=True)
+
+
+def build_customer_invoices(clean_df: pd.DataFrame, invoice_date: str) -> pd.DataFrame:
+    """Recovery invoices (A008, Aucor Central) for the '/007' GLs of an extracted ledger."""
+    clean_df = clean_df[clean_df['GL'].str.endswith('/007', na=False)]
+    idx = clean_df.index
+
+    debit = clean_df['Debit'].fillna(0)
+    credit_only_mask = (debit == 0) & (clean_df['Credit'].fillna(0) > 0)
+    price = debit.astype(float).where(~credit_only_mask, clean_df['Credit'].astype(float))
+    quantity = pd.Series(1, index=idx).where(~credit_only_mask, -1)
+
+    return GL_INVOICE.build(idx, {
+        'DOCTYPE': 4,
+        'ACCOUNTID': 'A008',
+        'DESCRIPTION': 'Aucor Central',
+        'INVDATE': _STRIP_QUOTES_RE.sub('', str(invoice_date)),
+        'TAXINCLUSIVE': '',
+        'ORDERNUM': 'A008',
+        'CDESCRIPTION': _strip_quotes('REC: ' + clean_df['Description'].astype(str)),
+        'CLINENOTES': '',
+        'FQUANTITY': quantity,
+        'FQTYTOPROCESS': quantity,
+        'FUNITPRICEEXCL': price,
+        'IMODULE': 1,
+        'ISTOCKCODEID': '',
+        'ILEDGERACCOUNTID': _strip_quotes(clean_df['GL']),
+        'ITAXTYPEID': 1,
+        'IWAREHOUSEID': 'MSTR',
+        'IPRICELISTNAMEID': 1,
+    })
+
+
+def build_supplier_invoices(customer_df: pd.DataFrame) -> pd.DataFrame:
+    """Mirror of the customer invoices as supplier invoices (A001, Aucor Bloemfontein)."""
+    return GL_INVOICE.build(customer_df.index, {
+        **{c: customer_df[c] for c in customer_df.columns},
+        'DOCTYPE': 5,
+        'ACCOUNTID': 'A001',
+        'DESCRIPTION': 'Aucor Bloemfontein',
+        'ORDERNUM': 'A001',
+        'CDESCRIPTION': _strip_quotes(customer_df['CDESCRIPTION'].str.replace('^REC:', 'B:', regex=True)),
+    })
@@ -0,0 +1,147 @@
+# modules/hot_folder.py
+import fnmatch
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+from modules.parse_cache import file_digest
+
+log = logging.getLogger(__name__)
+
+POLL_SECONDS = 2.0
+DEBOUNCE_SECONDS = 3.0      # a file must sit unchanged this long before it is picked up
+
+
+class HotFolder:
+    """
+    Poll `directory` for files matching `patterns` and run handler(path) -> dict
+    on each new one, on a background thread.
+
+    A file is only taken once its size and mtime have been stable for
+    `debounce` seconds, so half-copied files and bursts of drops are handled in
+    one sweep. Processed files are recorded by content hash in a JSON ledger in
+    the folder itself; a re-dropped or renamed copy of a processed file is
+    skipped, and (path, size, mtime) is remembered so unchanged files aren't
+    re-hashed on every poll.
+
+    on_event(kind, path, info) is called from the watcher thread with kind
+    'processed', 'skipped' or 'failed'.
+    """
+
+    def __init__(self, directory, handler, patterns=("*.csv",), ignore=(), ledger_name=".processed.json",
+                 poll=POLL_SECONDS, debounce=DEBOUNCE_SECONDS, on_event=None):
+        self.directory = directory
+        self.handler = handler
+        self.patterns = patterns
+        self.ignore = ignore
+        self.ledger_path = os.path.join(directory, ledger_name)
+        self.poll = poll
+        self.debounce = debounce
+        self.on_event = on_event or (lambda kind, path, info: None)
+
+        self._pending = {}      # path -> (size, mtime, first seen unchanged at)
+        self._known = {}        # path -> (size, mtime) already handled or skipped
+        self._stop = threading.Event()
+        self._thread = None
+        self.ledger = self._load_ledger()
+
+    # ---------- Ledger ----------
+    def _load_ledger(self) -> dict:
+        try:
+            with open(self.ledger_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_ledger(self):
+        tmp = self.ledger_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.ledger, f, indent=1)
+        os.replace(tmp, self.ledger_path)
+
+    # ---------- Scanning ----------
+    def _matches(self, name: str) -> bool:
+        lower = name.lower()
+        return (any(fnmatch.fnmatch(lower, p) for p in self.patterns)
+                and not any(fnmatch.fnmatch(lower, p) for p in self.ignore)
+                and not name.startswith((".", "~$")))
+
+    def _ready_files(self, now: float) -> list:
+        """Files whose size/mtime haven't changed for `debounce` seconds and aren't handled yet."""
+        seen, ready = set(), []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.is_file() or not self._matches(entry.name):
+                    continue
+                st = entry.stat()
+                sig = (st.st_size, st.st_mtime)
+                seen.add(entry.path)
+                if self._known.get(entry.path) == sig:
+                    continue
+                size, mtime, since = self._pending.get(entry.path, (None, None, now))
+                if (size, mtime) != sig:
+                    self._pending[entry.path] = (*sig, now)     # new or still being written
+                elif now - since >= self.debounce:
+                    ready.append((entry.path, sig))
+        # Forget files that were removed before they settled
+        for path in list(self._pending):
+            if path not in seen:
+                del self._pending[path]
+        return sorted(ready)
+
+    def scan_once(self, now: float = None) -> int:
+        """One sweep; returns how many files were processed. Also what the thread calls."""
+        now = time.monotonic() if now is None else now
+        processed = 0
+        dirty = False
+        for path, sig in self._ready_files(now):
+            self._pending.pop(path, None)
+            self._known[path] = sig
+            try:
+                digest = file_digest(path)
+            except OSError as e:
+                self.on_event("failed", path, {"error": str(e)})
+                continue
+            if digest in self.ledger:
+                self.on_event("skipped", path, self.ledger[digest])
+                continue
+            try:
+                info = self.handler(path)
+            except Exception as e:
+                log.exception("Hot folder: failed to process %s", path)
+                self.on_event("failed", path, {"error": str(e)})
+                continue
+            self.ledger[digest] = {"file": os.path.basename(path),
+                                   "processed_at": datetime.now().isoformat(timespec="seconds"), **info}
+            dirty = True
+            processed += 1
+            self.on_event("processed", path, info)
+        if dirty:
+            self._save_ledger()     # once per sweep, however many files arrived together
+        return processed
+
+    # ---------- Thread ----------
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="hot-folder", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.scan_once()
+            except OSError as e:
+                self.on_event("failed", self.directory, {"error": str(e)})
+            self._stop.wait(self.poll)
@@ -3,6 +3,18 @@ from tkinter import ttk, filedialog, messagebox, simpledialog
 import pandas as pd
 from datetime import datetime
 
+from modules.jobs import JobRunner
+from modules import perf
+from modules.excel_io import read_sheet_cached, sheet_names
+from modules.parse_cache import describe
+from modules.deposit_transform import REQUIRED_COLUMNS, build_deposit_import, export_frame, load_all_sheets
+from modules.evolution_schema import write_csv
+from modules.export_ledger import ExportLedger, describe as describe_repeats, REPEATS_PROMPT
+
+class MissingColumnsError(ValueError):
+    pass
+
+
 class DepositImportApp:
     def __init__(self, parent):
         self.parent = parent
@@ -21,6 +33,7 @@ class DepositImportApp:
             "1. Upload an Excel file with columns: Date, Reference 2, Code, Reference, Description, Credit.",
             "2. The data will be formatted for Evolution.",
             "3. You'll be able to preview and export the processed file as CSV.",
+            "4. Tick 'All sheets' to process every sheet of the workbook into one combined CSV.",
         ]
         for line in instructions:
             ttk.Label(info_frame, text=line, font=("Segoe UI", 10)).pack(anchor="w", padx=5, pady=2)
@@ -30,6 +43,11 @@ class DepositImportApp:
 
         ttk.Button(action_frame, text="📥 Upload Excel", command=self.load_excel).grid(row=0, column=0, padx=10)
         ttk.Button(action_frame, text="⬇️ Download CSV", command=self.download_csv).grid(row=0, column=1, padx=10)
+        self.all_sheets_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(action_frame, text="All sheets", variable=self.all_sheets_var).grid(row=0, column=2, padx=10)
+
+        self.jobs = JobRunner(self.frame, name="Import Deposits")
+        self.jobs.pack(fill="x", pady=5)
 
         ttk.Label(self.frame, text="Preview:", font=("Segoe UI", 10, "bold")).pack(anchor="w", pady=(10, 5))
         self.preview = tk.Text(self.frame, height=10, width=100, wrap="none", font=("Consolas", 9))
@@ -46,83 +64,116 @@ class DepositImportApp:
         if not path:
             return
 
-        try:
-            self.excel_path = path
-            self.excel_file = pd.ExcelFile(path, engine="openpyxl")
-            self.load_selected_sheet(self.excel_file.sheet_names[0])
-        except Exception as e:
-            messagebox.showerror("Error", f"Unable to open file:\n{e}")
+        self.excel_path = path
+        if self.all_sheets_var.get():
+            self.load_all_sheets()
+            return
+
+        def work(ctx):
+            self.sheet_names = sheet_names(path)
+            return self.sheet_names[0]
+
+        self.jobs.run(work, on_done=self.load_selected_sheet, text="Opening workbook...",
+                      on_error=lambda e: messagebox.showerror("Error", f"Unable to open file:\n{e}"))
 
     def load_selected_sheet(self, sheet):
-        try:
-            df = pd.read_excel(self.excel_file, sheet_name=sheet)
+        path = self.excel_path
+
+        def work(ctx):
+            with perf.stage("read") as s:
+                df, hit = read_sheet_cached(path, sheet=sheet,
+                                            on_chunk=lambda n: ctx.progress(n, text=f"Reading '{sheet}': {n:,} rows"))
+                s.rows, s.extra["cache_hit"] = len(df), hit
+            ctx.summary = describe(hit, sheet)
             df.columns = df.columns.str.strip()
 
-            required = ["Date", "Description", "Credit", "Code", "Reference"]
-            if any(col not in df.columns for col in required):
-                messagebox.showerror("Missing Columns", f"File must contain: {', '.join(required)}")
-                return
+            if any(col not in df.columns for col in REQUIRED_COLUMNS):
+                raise MissingColumnsError(f"File must contain: {', '.join(REQUIRED_COLUMNS)}")
 
-            df['Reference'] = df['Reference'].astype(str).str.strip()
-
-            modified = pd.DataFrame()
-            modified["TxDate"] = df["Date"]
-            modified["Description"] = df["Description"]
-            modified["Reference"] = df["Code"].astype(str) + df["Reference"].astype(str)
-            modified["Amount"] = df["Credit"]
-            modified["UseTax"] = "N"
-            modified["TaxType"] = ""
-            modified["TaxAccount"] = ""
-            modified["TaxAmount"] = 0
-            modified["Project"] = ""
-            modified["Account"] = "9500/BLM/027"
-            modified["IsDebit"] = "Y"
-            modified["SplitType"] = 0
-            modified["SplitGroup"] = 0
-            modified["Reconcile"] = "N"
-            modified["PostDated"] = "N"
-            modified["UseDiscount"] = "N"
-            modified["DiscPerc"] = 0
-            modified["DiscTrCode"] = ""
-            modified["DiscDesc"] = ""
-            modified["UseDiscTax"] = "N"
-            modified["DiscTaxType"] = ""
-            modified["DiscTaxAcc"] = ""
-            modified["DiscTaxAmt"] = 0
-            modified["PayeeName"] = ""
-            modified["PrintCheque"] = "N"
-            modified["SalesRep"] = ""
-            modified["Module"] = 0
-            modified["SagePayExtra1"] = ""
-            modified["SagePayExtra2"] = ""
-            modified["SagePayExtra3"] = ""
-
-            phrases = [
-                "FNB APP PAYMENT FROM", "DIGITAL PAYMENT CR ABSA BANK", "CAPITEC",
-                "ACB CREDIT CAPITEC", "FNB OB PMT", "PayShap Ext Credit",
-                "INT-BANKING PMT FRM", "IMMEDIATE TRF CR CAPITEC",
-                "IMMEDIATE TRF CR", "ACB CREDIT", "INVESTECPB"
-            ]
-            modified["Description"] = modified["Description"].replace(phrases, '', regex=True).str.strip()
-            modified["Reference"] = modified["Reference"].str.strip().str.replace(r"\.0$", "", regex=True)
+            with perf.stage("transform", rows=len(df)):
+                return self.transform(df)
 
+        def done(modified):
             self.df = modified
-            self.preview.delete("1.0", "end")
-            self.preview.insert("end", str(modified.head()))
+            with perf.stage("display", rows=len(modified)):
+                self.preview.delete("1.0", "end")
+                self.preview.insert("end", str(modified.head()))
+                channels = modified["Channel"].value_counts()
+                self.preview.insert("end", "\n\nDeposits by channel:\n" + channels.to_string())
             self.filename_label.config(text=f"Loaded file: {self.excel_path} (Sheet: {sheet})")
 
             messagebox.showinfo("Success", f"Excel sheet '{sheet}' processed successfully.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to process sheet:\n{e}")
+
+        def failed(e):
+            if isinstance(e, MissingColumnsError):
+                messagebox.showerror("Missing Columns", str(e))
+            else:
+                messagebox.showerror("Error", f"Failed to process sheet:\n{e}")
+
+        self.jobs.run(work, on_done=done, on_error=failed, text=f"Processing sheet '{sheet}'...")
+
+    def load_all_sheets(self):
+        path = self.excel_path
+
+        def work(ctx):
+            # Read and transform happen together, one process per sheet
+            with perf.stage("read + transform (all sheets)") as s:
+                combined, skipped = load_all_sheets(
+                    path, cancel_event=ctx.cancel_event,
+                    progress=lambda done, total: ctx.progress(done, total, f"Sheets processed: {done}/{total}"),
+                )
+                s.rows = len(combined)
+            return combined, skipped
+
+        def done(result):
+            combined, skipped = result
+            if combined.empty:
+                messagebox.showerror("Missing Columns", f"No sheet contains: {', '.join(REQUIRED_COLUMNS)}")
+                return
+            self.df = combined
+            with perf.stage("display", rows=len(combined)):
+                self.preview.delete("1.0", "end")
+                self.preview.insert("end", str(combined.head()))
+                per_sheet = combined["Sheet"].value_counts(sort=False)
+                self.preview.insert("end", "\n\nRows per sheet:\n" + per_sheet.to_string())
+            self.filename_label.config(text=f"Loaded file: {path} ({len(per_sheet)} sheets)")
+
+            message = f"{len(per_sheet)} sheets processed ({len(combined):,} rows)."
+            if skipped:
+                message += f"\n\nSkipped (missing columns): {', '.join(skipped)}"
+            messagebox.showinfo("Success", message)
+
+        self.jobs.run(work, on_done=done, text="Processing all sheets...",
+                      on_error=lambda e: messagebox.showerror("Error", f"Failed to process workbook:\n{e}"))
+
+    def transform(self, df):
+        return build_deposit_import(df)
 
     def download_csv(self):
         if self.df is None:
             messagebox.showwarning("Missing", "Please upload and process a file first.")
             return
 
+        out = export_frame(self.df)
+        ledger = ExportLedger()
+        with perf.stage("ledger check", rows=len(out), module=self.jobs.name):
+            previous = ledger.check("deposits", out)
+        written = None      # all lines; else the mask of new lines, for the ledger
+        if previous.notna().any():
+            choice = messagebox.askyesnocancel("Already exported", describe_repeats(previous) + REPEATS_PROMPT)
+            if choice is None:
+                return
+            if choice:
+                written = previous.isna()
+        checked = out
+        if written is not None:
+            out = out[written]
+
         path = filedialog.asksaveasfilename(defaultextension=".csv",
                                             initialfile=f"IMPORT_{datetime.today().strftime('%Y-%m-%d')}.csv")
         if path:
-            self.df.to_csv(path, index=False)
+            with perf.stage("export", rows=len(out), module=self.jobs.name):
+                write_csv(out, path)
+                ledger.record("deposits", checked, path, mask=written)
             self.filename_label.config(text=f"Exported CSV to: {path}")
             messagebox.showinfo("Exported", f"CSV saved to:\n{path}")
@@ -0,0 +1,202 @@
+# modules/jobs.py
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from tkinter import ttk, messagebox
+
+from modules import perf
+from modules.parallel import JobCancelled  # noqa: F401 (re-exported)
+
+log = logging.getLogger(__name__)
+
+# ---------- Shared executors ----------
+# One small thread pool for every tab; the process pool is only started when a
+# job asks for it (process start-up is expensive on Windows).
+_THREADS = ThreadPoolExecutor(max_workers=4, thread_name_prefix="job")
+_PROCESSES = None
+
+
+def process_pool() -> ProcessPoolExecutor:
+    global _PROCESSES
+    if _PROCESSES is None:
+        _PROCESSES = ProcessPoolExecutor()
+    return _PROCESSES
+
+
+class JobContext:
+    """Handed to every job: report progress and check for cancellation from the worker thread."""
+
+    def __init__(self, events: queue.Queue, cancel_event: threading.Event):
+        self._events = events
+        self.cancel_event = cancel_event
+        self.summary = None     # status-bar text shown when the job finishes, instead of "Done."
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def check(self):
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+
+    def progress(self, done, total=None, text=None):
+        """Thread-safe. total=None shows a busy (indeterminate) bar. Also a cancellation point."""
+        self._events.put(("progress", (done, total, text)))
+        self.check()
+
+
+class JobRunner(ttk.Frame):
+    """
+    Progress bar, Cancel button and status line for one tab.
+
+    run() executes work(ctx) on the shared thread pool; run_process() sends a
+    picklable function to the shared process pool. Results come back through a
+    queue drained with after(), so on_done/on_error always run on the Tk thread.
+    File dialogs and Tk variable reads belong on the Tk thread, before run().
+
+    Every job is recorded in the perf log under `name` (the tab); perf.stage()
+    blocks inside work or on_done are attributed to the same job.
+    """
+
+    POLL_MS = 100
+
+    def __init__(self, parent, name: str = "", **kwargs):
+        super().__init__(parent, **kwargs)
+        self.name = name
+        self._job_id = None
+        self._events = queue.Queue()
+        self._cancel = None
+        self._on_done = None
+        self._on_error = None
+        self._ctx = None
+
+        self.progress = ttk.Progressbar(self, mode="determinate")
+        self.progress.pack(side="left", fill="x", expand=True, padx=(0, 10))
+        self.cancel_button = ttk.Button(self, text="✖ Cancel", command=self.cancel, state="disabled")
+        self.cancel_button.pack(side="left")
+        self.status = ttk.Label(self, text="", foreground="blue", width=50, anchor="w")
+        self.status.pack(side="left", padx=10)
+
+    # ---------- Public ----------
+    @property
+    def busy(self) -> bool:
+        return self._cancel is not None
+
+    def run(self, work, on_done=None, on_error=None, text="Working..."):
+        """Run work(ctx) in a background thread. Returns False if a job is already running."""
+        if not self._start(on_done, on_error, text):
+            return False
+        ctx = self._ctx = JobContext(self._events, self._cancel)
+        job_id = self._job_id
+
+        def task():
+            try:
+                with perf.job_scope(self.name, job_id), perf.stage(perf.JOB, label=text):
+                    result = work(ctx)
+                self._events.put(("done", result))
+            except JobCancelled:
+                self._events.put(("cancelled", None))
+            except Exception as e:
+                log.exception("Job %s failed", text)
+                self._events.put(("error", e))
+
+        _THREADS.submit(task)
+        return True
+
+    def run_process(self, fn, *args, on_done=None, on_error=None, text="Working..."):
+        """Run fn(*args) in the shared process pool. Cancel only works before it starts."""
+        if not self._start(on_done, on_error, text):
+            return False
+        future = process_pool().submit(fn, *args)
+        cancel = self._cancel
+        job_id = self._job_id
+
+        def wait():
+            try:
+                with perf.job_scope(self.name, job_id), perf.stage(perf.JOB, label=text):
+                    while not future.done():
+                        if cancel.wait(0.1) and future.cancel():
+                            raise JobCancelled()
+                    result = future.result()
+                self._events.put(("done", result))
+            except JobCancelled:
+                self._events.put(("cancelled", None))
+            except Exception as e:
+                log.exception("Job %s failed", text)
+                self._events.put(("error", e))
+
+        _THREADS.submit(wait)
+        return True
+
+    def cancel(self):
+        if self._cancel is not None:
+            self._cancel.set()
+            self.status.config(text="Cancelling...")
+
+    def set_status(self, text: str):
+        self.status.config(text=text)
+
+    # ---------- Internals ----------
+    def _start(self, on_done, on_error, text) -> bool:
+        if self.busy:
+            messagebox.showwarning("Busy", "Please wait for the current job to finish (or cancel it).")
+            return False
+        self._cancel = threading.Event()
+        self._job_id = perf.new_job_id()
+        self._on_done, self._on_error = on_done, on_error
+        self.cancel_button.configure(state="normal")
+        self._set_progress(0, None)
+        self.status.config(text=text)
+        self.after(self.POLL_MS, self._poll)
+        return True
+
+    def _set_progress(self, done, total):
+        if total is None:
+            if str(self.progress.cget("mode")) != "indeterminate":
+                self.progress.configure(mode="indeterminate")
+                self.progress.start(15)
+        else:
+            self.progress.stop()
+            self.progress.configure(mode="determinate", maximum=max(1, total), value=done)
+
+    def _finish(self):
+        self._cancel = None
+        self._ctx = None
+        self.cancel_button.configure(state="disabled")
+        self.progress.stop()
+        self.progress.configure(mode="determinate", value=0)
+
+    def _poll(self):
+        while True:
+            try:
+                kind, payload = self._events.get_nowait()
+            except queue.Empty:
+                self.after(self.POLL_MS, self._poll)
+                return
+
+            if kind == "progress":
+                done, total, text = payload
+                self._set_progress(done, total)
+                if text:
+                    self.status.config(text=text)
+                continue
+
+            on_done, on_error = self._on_done, self._on_error
+            summary = self._ctx.summary if self._ctx else None
+            job_id = self._job_id
+            self._finish()
+            if kind == "cancelled":
+                self.status.config(text="Cancelled.")
+            elif kind == "error":
+                self.status.config(text="Failed.")
+                if on_error:
+                    on_error(payload)
+                else:
+                    messagebox.showerror("Error", f"Something went wrong:\n{payload}")
+            else:
+                self.status.config(text=summary or "Done.")
+                if on_done:
+                    with perf.job_scope(self.name, job_id):
+                        on_done(payload)
+            return
@@ -0,0 +1,35 @@
+# modules/parallel.py
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when the user pressed Cancel."""
+
+
+def map_processes(fn, items, workers=None, progress=None, cancel_event=None) -> list:
+    """
+    fn(item) for every item on a process pool (up to `workers` processes),
+    results in item order. progress(done, total) is called as items finish.
+
+    Setting cancel_event raises JobCancelled as soon as the next item finishes;
+    queued items are dropped and nothing is returned, so a cancelled run can
+    never pass for a complete one.
+    """
+    items = list(items)
+    workers = workers or min(os.cpu_count() or 1, len(items)) or 1
+    results = [None] * len(items)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fn, item): i for i, item in enumerate(items)}
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                results[futures[future]] = future.result()
+                if cancel_event is not None and cancel_event.is_set():
+                    raise JobCancelled()
+                if progress:
+                    progress(done, len(items))
+        finally:
+            # Don't sit in __exit__ while queued items run after a cancel or error
+            pool.shutdown(wait=False, cancel_futures=True)
+    return results
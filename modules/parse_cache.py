@@ -0,0 +1,160 @@
+# modules/parse_cache.py
+import hashlib
+import logging
+import os
+import threading
+
+import pandas as pd
+
+log = logging.getLogger(__name__)
+
+try:
+    import pyarrow  # noqa: F401
+    HAVE_ARROW = True
+except ImportError:
+    HAVE_ARROW = False
+
+# Bump when a reader's output changes so old entries are never served
+CACHE_VERSION = 1
+
+CACHE_DIR = os.environ.get(
+    "AUCOR_PARSE_CACHE",
+    os.path.join(os.path.expanduser("~"), ".aucor_tools", "parse_cache"),
+)
+MAX_BYTES = int(os.environ.get("AUCOR_PARSE_CACHE_MB", "512")) * 1024 * 1024
+
+_EXTENSIONS = (".feather", ".pkl")
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+# ---------- Keys ----------
+def file_digest(path) -> str:
+    """SHA-256 of the file contents, so a renamed or re-saved-but-identical file still hits."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def cache_key(path, **params) -> str:
+    """Content hash + reader parameters (sheet, layout, dtypes, ...) -> entry name."""
+    h = hashlib.sha256(f"v{CACHE_VERSION}:{file_digest(path)}".encode())
+    for name in sorted(params):
+        h.update(f"|{name}={params[name]!r}".encode())
+    return h.hexdigest()
+
+
+# ---------- Storage ----------
+def _entry(key: str):
+    for ext in _EXTENSIONS:
+        path = os.path.join(CACHE_DIR, key + ext)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _can_feather(df: pd.DataFrame) -> bool:
+    return (HAVE_ARROW
+            and isinstance(df.index, pd.RangeIndex) and df.index.start == 0 and df.index.step == 1
+            and all(isinstance(c, str) for c in df.columns))
+
+
+def _write(key: str, df: pd.DataFrame):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Writers can be threads of several pool processes; thread idents repeat across processes
+    tmp = os.path.join(CACHE_DIR, f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+    if _can_feather(df):
+        try:
+            df.to_feather(tmp)
+            os.replace(tmp, os.path.join(CACHE_DIR, key + ".feather"))
+            return
+        except Exception as e:      # mixed-type object columns etc.
+            log.debug("Feather write failed for %s, using pickle: %s", key, e)
+    df.to_pickle(tmp)
+    os.replace(tmp, os.path.join(CACHE_DIR, key + ".pkl"))
+
+
+def _read(path: str) -> pd.DataFrame:
+    if path.endswith(".feather"):
+        return pd.read_feather(path)
+    return pd.read_pickle(path)
+
+
+def _evict():
+    """Drop least-recently-used entries (oldest mtime) until the cache fits MAX_BYTES."""
+    try:
+        entries = [e for e in os.scandir(CACHE_DIR) if e.name.endswith(_EXTENSIONS)]
+    except FileNotFoundError:
+        return
+    entries = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in entries]
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+# ---------- Public ----------
+def load(path, loader, **params):
+    """
+    Return (df, hit). On a hit the stored frame is read back from CACHE_DIR;
+    on a miss loader() parses the file and the result is stored for next time.
+    A cache that can't be read or written never stops the load.
+    """
+    try:
+        key = cache_key(path, **params)
+        entry = _entry(key)
+    except OSError as e:
+        log.warning("Parse cache unavailable: %s", e)
+        return loader(), False
+
+    if entry is not None:
+        try:
+            df = _read(entry)
+            os.utime(entry)     # LRU: mark as recently used
+            with _lock:
+                _stats["hits"] += 1
+            return df, True
+        except Exception as e:
+            log.warning("Dropping unreadable cache entry %s: %s", entry, e)
+            try:
+                os.remove(entry)
+            except OSError:
+                pass
+
+    df = loader()
+    with _lock:
+        _stats["misses"] += 1
+        try:
+            _write(key, df)
+            _evict()
+        except Exception as e:
+            log.warning("Could not store parse cache entry: %s", e)
+    return df, False
+
+
+def stats() -> dict:
+    with _lock:
+        return dict(_stats)
+
+
+def clear():
+    if not os.path.isdir(CACHE_DIR):
+        return
+    for entry in os.scandir(CACHE_DIR):
+        if entry.name.endswith(_EXTENSIONS + (".tmp",)):
+            os.remove(entry.path)
+
+
+def describe(hit: bool, name: str = "") -> str:
+    """Status-bar text for one load, with the session's running totals."""
+    s = stats()
+    what = f"{name}: " if name else ""
+    state = "loaded from cache" if hit else "parsed (cached for next time)"
+    return f"{what}{state} · cache {s['hits']} hits / {s['misses']} misses"
@@ -1,47 +1,14 @@
+import os
 import pandas as pd
-from datetime import datetime
-from fpdf import FPDF
-from fpdf.enums import XPos, YPos
 from tkinter import filedialog, messagebox, simpledialog
 import tkinter as tk
 from tkinter import ttk
 
-class PDF(FPDF):
-    def __init__(self, user):
-        super().__init__()
-        self.user = user
-
-    def header(self):
-        self.image('Aucor-Logo.png', 12, 1, 40)
-        self.set_font('helvetica', 'B', 25)
-        self.cell(0, 20, 'Aucor Payment Requisition', border=True, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='R')
-        self.ln(4)
-
-    def footer(self):
-        self.set_y(-15)
-        self.set_font('helvetica', 'I', 10)
-        self.cell(0, 10, f'Payment requisition created by {self.user}', align='C')
-
-    def chapter_title(self, title):
-        self.set_font('helvetica', 'B', 12)
-        self.cell(0, 10, title, 0, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='L')
-        self.ln(1)
-        self.cell(0, 0, '', 'T', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
-        self.ln(5)
-
-    def add_form_field(self, label):
-        self.set_font('helvetica', '', 10)
-        self.cell(0, 8, label, 0, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='L')
-        self.ln(2)
-
-    def add_approval_section(self):
-        self.set_font('helvetica', 'B', 10)
-        self.cell(0, 10, 'Approval Signatures:', 0, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='L')
-        self.cell(0, 0, '', 'T', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
-        self.add_form_field('Approver 1: Jacques van der Linde - Managing Director')
-        self.add_form_field('Approver 2: Charles Neser - National Mining Manager')
-        self.add_form_field('Signatures will be on Payment Requisition or Daily Transfer List')
-
+from modules.excel_io import read_sheet_cached
+from modules.parse_cache import describe
+from modules.jobs import JobRunner
+from modules import perf
+from modules.requisition_pdf import prepare_refunds, render_requisitions
 
 class PaymentRequisitionApp:
     def __init__(self, parent):
@@ -92,25 +59,30 @@ class PaymentRequisitionApp:
         self.supplier_status_label.pack(anchor="w", pady=5)
         self.status_label.pack(anchor="w", pady=5)
 
+        # Render progress
+        self.jobs = JobRunner(self.frame, name="Requisitions")
+        self.jobs.pack(fill="x", pady=(10, 0))
+
     def load_excel(self):
         path = filedialog.askopenfilename(filetypes=[("Excel Files", "*.xlsx *.xls")])
         if not path:
             return
-        try:
-            self.df = pd.read_excel(path)
-            self.df['Balance'] = (
-                self.df['Balance']
-                .astype(str)
-                .str.replace(r'[Rr]', '', regex=True)
-                .str.replace(',', '', regex=False)
-                .str.strip()
-                .astype(float)
-                .round(2) * -1
-            )
-            self.df['Telephone 1'] = self.df['Telephone 1'].astype(str).str.replace('.0', '', regex=False)
+
+        def work(ctx):
+            with perf.stage("read customers") as s:
+                df, hit = read_sheet_cached(path, on_chunk=lambda n: ctx.progress(n, text=f"Reading customers: {n:,} rows"))
+                s.rows, s.extra["cache_hit"] = len(df), hit
+            ctx.summary = describe(hit, "Customers")
+            with perf.stage("prepare customers", rows=len(df)):
+                prepare_refunds(df, "customer")
+            return df
+
+        def done(df):
+            self.df = df
             self.status_label.config(text=f"Loaded: {path}", foreground="green")
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not load file:\n{e}")
+
+        self.jobs.run(work, on_done=done, text="Loading customer Excel...",
+                      on_error=lambda e: messagebox.showerror("Error", f"Could not load file:\n{e}"))
 
     def generate_pdfs(self):
         if self.df is None:
@@ -121,32 +93,28 @@ class PaymentRequisitionApp:
         if not self.user:
             return
 
-        for _, row in self.df.iterrows():
-            self.create_pdf(row)
-
-        messagebox.showinfo("Done", "All PDFs created successfully.")
+        self.start_render(self.df, "customer", "All PDFs created successfully.")
 
     def load_supplier_excel(self):
         path = filedialog.askopenfilename(filetypes=[("Excel Files", "*.xlsx *.xls")])
         if not path:
             return
-        try:
-            self.supplier_df = pd.read_excel(path)
-            self.supplier_df['Balance'] = (
-                self.supplier_df['Balance']
-                .astype(str)
-                .str.replace(r'[Rr]', '', regex=True)
-                .str.replace(',', '', regex=False)
-                .str.strip()
-                .astype(float)
-                .round(2)
-            )
-            self.supplier_df[['Bank Name', 'Bank Branch Code', 'Bank Account No']] = (
-                self.supplier_df[['Bank Name', 'Bank Branch Code', 'Bank Account No']].fillna('')
-            )
+
+        def work(ctx):
+            with perf.stage("read suppliers") as s:
+                df, hit = read_sheet_cached(path, on_chunk=lambda n: ctx.progress(n, text=f"Reading suppliers: {n:,} rows"))
+                s.rows, s.extra["cache_hit"] = len(df), hit
+            ctx.summary = describe(hit, "Suppliers")
+            with perf.stage("prepare suppliers", rows=len(df)):
+                prepare_refunds(df, "supplier")
+            return df
+
+        def done(df):
+            self.supplier_df = df
             self.supplier_status_label.config(text=f"Loaded: {path}", foreground="green")
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not load supplier file:\n{e}")
+
+        self.jobs.run(work, on_done=done, text="Loading supplier Excel...",
+                      on_error=lambda e: messagebox.showerror("Error", f"Could not load supplier file:\n{e}"))
 
     def generate_supplier_pdfs(self):
         if not hasattr(self, 'supplier_df') or self.supplier_df is None:
@@ -157,99 +125,29 @@ class PaymentRequisitionApp:
         if not self.user:
             return
 
-        for _, row in self.supplier_df.iterrows():
-            self.create_supplier_pdf(row)
-
-        messagebox.showinfo("Done", "All supplier PDFs created successfully.")
-
-    def create_pdf(self, row):
-        pdf = PDF(self.user)
-        pdf.add_page()
-
-        auction_code = str(row['Group'])
-        auction_name = str(row['Group Description'])
-        client_name = str(row['Name'])
-        client_company = str(row['Customer Description']) if pd.notna(row['Customer Description']) else ''
-        client_customer_code = str(row['Customer']).replace('/', '_')
-        client_phone = str(row['Telephone 1']) if pd.notna(row['Telephone 1']) else ''
-        client_email = str(row['E-mail']) if pd.notna(row['E-mail']) else ''
-        refund_amount = '{:,.2f}'.format(row['Balance'])
-
-        today = datetime.today().strftime('%d/%m/%Y')
-        pdf.set_font('helvetica', '', 12)
-        pdf.cell(0, 8, f'Date: {today}', align='R', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-
-        pdf.set_font('helvetica', 'B', 12)
-        pdf.cell(100, 10, 'Auction Refund/Deposit Refund', border=True)
-        pdf.set_text_color(255, 0, 0)
-        pdf.cell(90, 10, f'Amount to Refund: R {refund_amount}', align='R', border=True, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-        pdf.set_text_color(0, 0, 0)
-        pdf.ln(10)
-
-        pdf.chapter_title('Auction Details:')
-        pdf.add_form_field(f'Auction Code: {auction_code}')
-        pdf.add_form_field(f'Auction Name: {auction_name}')
-
-        pdf.chapter_title('Client Information')
-        pdf.add_form_field(f'Customer Code: {client_customer_code}')
-        pdf.add_form_field(f'Client Name: {client_name} : {client_company}')
-        pdf.add_form_field(f'Phone Number: {client_phone}                      Email: {client_email}')
-
-        pdf.chapter_title('Banking Details') 
-        pdf.add_form_field('Bank Name:                                         Account Number:')
-        pdf.add_form_field('ABSA: 632005      NED: 198765 ')
-        pdf.add_form_field('STD:  051001      FNB: 250655 ')
-        pdf.add_form_field('Capitec: 470010')
-        pdf.add_form_field('Immediate Payment:                                 Mail Proof of payment:')
-
-        pdf.chapter_title('Notes')
-        pdf.add_form_field('')
-        pdf.add_approval_section()
-
-        file_name = f'{client_customer_code}_{client_name}.pdf'
-        pdf.output(file_name)
-
-    def create_supplier_pdf(self, row):
-        pdf = PDF(self.user)
-        pdf.add_page()
-
-        auction_code = str(row['Group'])
-        auction_name = str(row['Group Description'])
-        client_name = str(row['Name'])
-        client_customer_code = str(row['Supplier']).replace('/', '_')
-        refund_amount = '{:,.2f}'.format(row['Balance'])
-        bank_name = str(row.get('Bank Name', ''))
-        bank_branch = str(row.get('Bank Branch Code', ''))
-        bank_no = str(row.get('Bank Account No', ''))
-
-        today = datetime.today().strftime('%d/%m/%Y')
-        pdf.set_font('helvetica', '', 12)
-        pdf.cell(0, 8, f'Date: {today}', align='R', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-
-        pdf.set_font('helvetica', 'B', 12)
-        pdf.cell(100, 10, 'Supplier Payment', border=True)
-        pdf.set_text_color(255, 0, 0)
-        pdf.cell(90, 10, f'Amount to Refund: R {refund_amount}', align='R', border=True, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-        pdf.set_text_color(0, 0, 0)
-        pdf.ln(10)
-
-        pdf.chapter_title('Auction Details:')
-        pdf.add_form_field(f'Group: {auction_code}')
-        pdf.add_form_field(f'Supplier Type: {auction_name}')
-
-        pdf.chapter_title('Supplier Information')
-        pdf.add_form_field(f'Supplier Code: {client_customer_code}')
-        pdf.add_form_field(f'Supplier Name: {client_name} ')
-
-        pdf.chapter_title('Banking Details') 
-        pdf.add_form_field(f'Bank Name:  {bank_name}                                       Account Number:  {bank_no}')
-        pdf.add_form_field(f'Bank Branch Code: {bank_branch}')
-        pdf.add_form_field('(STD:  051001  FNB: 250655  ABSA: 632005  NED: 198765 Capitec: 470010)')
-        pdf.add_form_field('Immediate Payment:                                 Mail Proof of payment:')
-
-        pdf.chapter_title('Notes')
-        pdf.add_form_field('')
-        pdf.add_approval_section()
-
-        file_name = f'{client_customer_code}_{client_name}.pdf'
-        pdf.output(file_name)
+        self.start_render(self.supplier_df, "supplier", "All supplier PDFs created successfully.")
+
+    # ---------- Background rendering ----------
+    def start_render(self, df, kind, done_message):
+        user = self.user
+
+        def work(ctx):
+            with perf.stage(f"render {kind} PDFs") as s:
+                stats = render_requisitions(
+                    df, kind, user, out_dir=os.getcwd(),
+                    progress=lambda done, total: ctx.progress(done, total, f"Generated {done} of {total} PDFs..."),
+                    cancel_event=ctx.cancel_event,
+                )
+                s.rows = stats["written"]
+            return stats
+
+        def done(stats):
+            summary = f"{stats['written']} of {stats['total']} PDFs in {stats['seconds']:.1f}s ({stats['per_second']:.1f} PDFs/s)"
+            self.jobs.set_status(("Cancelled: " if stats["cancelled"] else "Done: ") + summary)
+            if stats["cancelled"]:
+                messagebox.showinfo("Cancelled", f"Stopped after {stats['written']} PDFs.")
+            else:
+                messagebox.showinfo("Done", done_message)
+
+        self.jobs.run(work, on_done=done, text=f"Generating {len(df)} PDFs...",
+                      on_error=lambda e: messagebox.showerror("Error", f"Could not create PDFs:\n{e}"))
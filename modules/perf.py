@@ -0,0 +1,182 @@
+# modules/perf.py
+import ctypes
+import json
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+# One JSON object per line; rotated at MAX_BYTES, keeping BACKUPS old files
+LOG_PATH = os.environ.get(
+    "AUCOR_PERF_LOG",
+    os.path.join(os.path.expanduser("~"), ".aucor_tools", "perf_log.jsonl"),
+)
+MAX_BYTES = 1_000_000
+BACKUPS = 3
+
+JOB = "job"     # stage name of the record written for a whole background job
+
+_local = threading.local()
+_lock = threading.Lock()
+_logger = None
+
+
+def _log() -> logging.Logger:
+    global _logger
+    with _lock:
+        if _logger is None:
+            logger = logging.getLogger("aucor.perf")
+            logger.propagate = False
+            logger.setLevel(logging.INFO)
+            os.makedirs(os.path.dirname(os.path.abspath(LOG_PATH)), exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(
+                LOG_PATH, maxBytes=MAX_BYTES, backupCount=BACKUPS, encoding="utf-8", delay=True)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            _logger = logger
+    return _logger
+
+
+# ---------- Memory ----------
+if sys.platform == "win32":
+    from ctypes import wintypes
+
+    class _MemoryCounters(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+            (name, ctypes.c_size_t) for name in (
+                "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")
+        ]
+
+
+def peak_rss_mb():
+    """High-water mark of this process's resident memory in MB, or None where it can't be read."""
+    try:
+        if sys.platform == "win32":
+            counters = _MemoryCounters()
+            counters.cb = ctypes.sizeof(counters)
+            kernel32 = ctypes.windll.kernel32
+            kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+            ctypes.windll.psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb)
+            return counters.PeakWorkingSetSize / 1024 ** 2
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024    # bytes on macOS, KB elsewhere
+    except (ImportError, OSError, AttributeError):
+        return None
+
+
+# ---------- Recording ----------
+def new_job_id() -> str:
+    return uuid.uuid4().hex[:8]
+
+
+@contextmanager
+def job_scope(module: str, job_id: str):
+    """Stages recorded on this thread inside the block belong to (module, job_id)."""
+    previous = getattr(_local, "job", None)
+    _local.job = (module, job_id)
+    try:
+        yield
+    finally:
+        _local.job = previous
+
+
+def record(module: str, stage: str, seconds: float, rows=None, job=None, status="ok", **extra):
+    entry = {
+        "at": datetime.now().isoformat(timespec="seconds"),
+        "module": module, "stage": stage, "seconds": round(seconds, 4),
+        "rows": rows, "job": job, "status": status, **extra,
+    }
+    try:
+        _log().info(json.dumps(entry, default=str))
+    except Exception:
+        pass    # instrumentation must never break a job
+
+
+class Stage:
+    """
+    Times one stage of a job: wall time, rows (set .rows inside the block) and
+    process peak memory. peak_delta_mb is how far the stage pushed the peak up,
+    so it is non-zero only for the stage that set a new high-water mark.
+    Exceptions are recorded with their class name as status and re-raised.
+    """
+
+    def __init__(self, name: str, rows=None, module: str = None, **extra):
+        self.name = name
+        self.rows = rows
+        self.extra = extra
+        self.module, self.job = getattr(_local, "job", None) or ("", None)
+        if module:
+            self.module = module
+
+    def __enter__(self):
+        self._peak = peak_rss_mb()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self._start
+        peak = peak_rss_mb()
+        delta = peak - self._peak if peak is not None and self._peak is not None else None
+        record(self.module, self.name, seconds, rows=self.rows, job=self.job,
+               status=exc_type.__name__ if exc_type else "ok",
+               peak_mb=round(peak, 1) if peak is not None else None,
+               peak_delta_mb=round(delta, 1) if delta is not None else None, **self.extra)
+        return False
+
+
+def stage(name: str, rows=None, module: str = None, **extra) -> Stage:
+    """with perf.stage("read") as s: df = ...; s.rows = len(df)"""
+    return Stage(name, rows, module, **extra)
+
+
+# ---------- Reading back ----------
+def read_log(path: str = None) -> list:
+    """Every record in the log and its rotated backups, oldest first. Unreadable lines are skipped."""
+    path = path or LOG_PATH
+    records = []
+    for name in [f"{path}.{i}" for i in range(BACKUPS, 0, -1)] + [path]:
+        try:
+            with open(name, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            continue
+    return records
+
+
+def recent_jobs(records: list, limit: int = 50):
+    """Newest jobs first: module, label, wall time, status, rows (largest stage) and peak memory."""
+    import pandas as pd
+    df = pd.DataFrame(records, columns=["at", "module", "stage", "seconds", "rows", "job", "status", "label", "peak_mb"])
+    stages = df[df["stage"] != JOB]
+    jobs = df[df["stage"] == JOB].drop(columns=["stage", "rows"])
+    rows = stages.groupby("job")["rows"].max()
+    slowest = stages.sort_values("seconds").groupby("job")["stage"].last()
+    jobs = jobs.assign(rows=jobs["job"].map(rows), slowest_stage=jobs["job"].map(slowest))
+    cols = ["at", "module", "label", "seconds", "status", "rows", "slowest_stage", "peak_mb"]
+    return jobs.iloc[::-1][cols].head(limit).reset_index(drop=True)
+
+
+def slowest_stages(records: list, limit: int = 20):
+    """Per module and stage: runs, median and worst wall time, largest row count and peak growth; worst first."""
+    import pandas as pd
+    df = pd.DataFrame(records, columns=["module", "stage", "seconds", "rows", "peak_delta_mb"])
+    df = df[df["stage"] != JOB]
+    if df.empty:
+        return pd.DataFrame(columns=["module", "stage", "runs", "median_s", "max_s", "max_rows", "max_peak_delta_mb"])
+    summary = df.groupby(["module", "stage"]).agg(
+        runs=("seconds", "size"), median_s=("seconds", "median"), max_s=("seconds", "max"),
+        max_rows=("rows", "max"), max_peak_delta_mb=("peak_delta_mb", "max"),
+    ).reset_index()
+    summary["median_s"] = summary["median_s"].round(3)
+    return summary.sort_values("max_s", ascending=False).head(limit).reset_index(drop=True)
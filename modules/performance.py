@@ -0,0 +1,43 @@
+# modules/performance.py
+import os
+from tkinter import ttk
+
+from modules import perf
+from modules.data_grid import DataFrameGrid
+
+
+class PerformanceApp:
+    """Recent jobs and the slowest stages from the perf log, so 'slow today' can be pinned down."""
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.frame = ttk.Frame(parent, padding=20)
+        self.frame.pack(fill="both", expand=True)
+
+        self.build_ui()
+        self.refresh()
+
+    def build_ui(self):
+        ttk.Label(self.frame, text="⏱ Performance", font=("Segoe UI", 14, "bold")).pack(pady=(0, 10))
+
+        control_frame = ttk.Frame(self.frame)
+        control_frame.pack(fill="x", pady=(0, 10))
+        ttk.Button(control_frame, text="🔄 Refresh", command=self.refresh).pack(side="left")
+        self.log_label = ttk.Label(control_frame, text="", foreground="gray")
+        self.log_label.pack(side="left", padx=10)
+
+        jobs_frame = ttk.LabelFrame(self.frame, text="Recent jobs (newest first)", padding=5)
+        jobs_frame.pack(fill="both", expand=True, pady=(0, 10))
+        self.table_jobs = DataFrameGrid(jobs_frame)
+        self.table_jobs.pack(fill="both", expand=True)
+
+        stages_frame = ttk.LabelFrame(self.frame, text="Slowest stages (worst run first)", padding=5)
+        stages_frame.pack(fill="both", expand=True)
+        self.table_stages = DataFrameGrid(stages_frame)
+        self.table_stages.pack(fill="both", expand=True)
+
+    def refresh(self):
+        records = perf.read_log()
+        self.table_jobs.show(perf.recent_jobs(records), widths=110)
+        self.table_stages.show(perf.slowest_stages(records), widths=120)
+        self.log_label.config(text=f"{len(records):,} records in {os.path.abspath(perf.LOG_PATH)}")
@@ -4,7 +4,14 @@ from tkinter import ttk, filedialog, messagebox
 import pandas as pd
 
 from modules.base_page import BasePage
-from modules.petty_transform import transform_petty_or_ewallet
+from modules.data_grid import DataFrameGrid
+from modules.jobs import JobRunner
+from modules import perf
+from modules.excel_io import read_sheet_cached, PETTY_CASH
+from modules.parse_cache import describe
+from modules.petty_transform import transform_petty_or_ewallet, export_frame, load_batch
+from modules.evolution_schema import write_csv
+from modules.export_ledger import ExportLedger, describe as describe_repeats, REPEATS_PROMPT
 
 class PettyCashApp(BasePage):
     def __init__(self, parent):
@@ -14,6 +21,7 @@ class PettyCashApp(BasePage):
             "3. UseTax = Y only if VAT = Y.",
             "4. Module: gl→0, ar→1, ap→2.",
             "5. Blank Reference becomes 'DEP'.",
+            "Month end: 'Batch' takes several branch / eWallet templates and builds one combined import.",
         ]
         super().__init__(parent, "🧾 Petty Cash Import", steps)
 
@@ -29,23 +37,16 @@ class PettyCashApp(BasePage):
         controls.pack(pady=8, fill="x")
 
         ttk.Button(controls, text="📁 Select Petty Cash File", command=self.load_file).pack(side="left", padx=6)
+        ttk.Button(controls, text="📚 Batch...", command=self.load_batch).pack(side="left", padx=6)
         ttk.Button(controls, text="⬇️ Export to Excel", command=lambda: self.export_file(kind="xlsx")).pack(side="left", padx=6)
         ttk.Button(controls, text="⬇️ Export to CSV", command=lambda: self.export_file(kind="csv")).pack(side="left", padx=6)
 
-        # Table
-        table_wrap = ttk.Frame(self.frame)
-        table_wrap.pack(fill="both", expand=True, pady=8)
-
-        self.tree = ttk.Treeview(table_wrap, show="headings")
-        self.tree.pack(side="left", fill="both", expand=True)
-
-        yscroll = ttk.Scrollbar(table_wrap, orient="vertical", command=self.tree.yview)
-        yscroll.pack(side="right", fill="y")
-        self.tree.configure(yscrollcommand=yscroll.set)
+        self.jobs = JobRunner(self.frame, name="Petty Cash")
+        self.jobs.pack(fill="x", pady=(0, 4))
 
-        xscroll = ttk.Scrollbar(self.frame, orient="horizontal", command=self.tree.xview)
-        xscroll.pack(fill="x")
-        self.tree.configure(xscrollcommand=xscroll.set)
+        # Table
+        self.table = DataFrameGrid(self.frame)
+        self.table.pack(fill="both", expand=True, pady=8)
 
     # ---------- File IO ----------
     def load_file(self):
@@ -56,28 +57,83 @@ class PettyCashApp(BasePage):
         if not path:
             return
 
-        try:
+        def work(ctx):
             # Your template rule: header row = row 4 (0-based header=3)
             # and then drop the next 2 rows (which are rows 5 & 6 in Excel terms)
-            df = pd.read_excel(path, header=3)
+            with perf.stage("read") as s:
+                df, hit = read_sheet_cached(path, layout=PETTY_CASH,
+                                            on_chunk=lambda n: ctx.progress(n, text=f"Reading: {n:,} rows"))
+                s.rows, s.extra["cache_hit"] = len(df), hit
+            ctx.summary = describe(hit, "Petty cash")
             df.columns = [str(c).strip() for c in df.columns]
-            df = df.iloc[2:].reset_index(drop=True)
-
-            self.src_df = df
 
             # Apply shared transform (petty/eWallet both use same rules)
-            self.proc_df = transform_petty_or_ewallet(df)
+            with perf.stage("transform", rows=len(df)):
+                return df, transform_petty_or_ewallet(df)
 
-            self._display(self.proc_df)
+        def done(result):
+            self.src_df, self.proc_df = result
+            with perf.stage("display", rows=len(self.proc_df)):
+                self._display(self.proc_df)
             messagebox.showinfo("Loaded", "File loaded and processed successfully.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load/process file:\n{e}")
+
+        self.jobs.run(work, on_done=done, text="Loading petty cash file...",
+                      on_error=lambda e: messagebox.showerror("Error", f"Failed to load/process file:\n{e}"))
+
+    def load_batch(self):
+        paths = filedialog.askopenfilenames(
+            title="Select Petty Cash / eWallet templates",
+            filetypes=[("Excel files", "*.xlsx *.xlsm *.xls")]
+        )
+        if not paths:
+            return
+
+        def work(ctx):
+            with perf.stage("read + transform (batch)") as s:
+                combined, failures = load_batch(
+                    paths, cancel_event=ctx.cancel_event,
+                    progress=lambda done, total: ctx.progress(done, total, f"Templates processed: {done}/{total}"),
+                )
+                s.rows, s.extra["files"] = len(combined), len(paths)
+            ctx.summary = f"{len(paths) - len(failures)} of {len(paths)} templates, {len(combined):,} lines"
+            return combined, failures
+
+        def done(result):
+            combined, failures = result
+            self.src_df, self.proc_df = None, combined
+            with perf.stage("display", rows=len(combined)):
+                self._display(combined)
+            per_file = combined["Source"].value_counts(sort=False)
+            message = "\n".join(f"{name}: {count:,} lines" for name, count in per_file.items()) or "No lines loaded."
+            if failures:
+                message += "\n\nNot processed:\n" + "\n".join(f"{name}: {error}" for name, error in failures.items())
+                messagebox.showwarning("Batch loaded with errors", message)
+            else:
+                messagebox.showinfo("Batch loaded", message)
+
+        self.jobs.run(work, on_done=done, text=f"Processing {len(paths)} templates...",
+                      on_error=lambda e: messagebox.showerror("Error", f"Failed to process templates:\n{e}"))
 
     def export_file(self, kind: str = "xlsx"):
         if self.proc_df is None or self.proc_df.empty:
             messagebox.showwarning("No Data", "Load a file first.")
             return
 
+        out = export_frame(self.proc_df)
+        ledger = ExportLedger()
+        with perf.stage("ledger check", rows=len(out), module=self.jobs.name):
+            previous = ledger.check("petty_cash", out)
+        written = None      # all lines; else the mask of new lines, for the ledger
+        if previous.notna().any():
+            choice = messagebox.askyesnocancel("Already exported", describe_repeats(previous) + REPEATS_PROMPT)
+            if choice is None:
+                return
+            if choice:
+                written = previous.isna()
+        checked = out
+        if written is not None:
+            out = out[written]
+
         if kind == "xlsx":
             path = filedialog.asksaveasfilename(
                 title="Save Processed Excel",
@@ -87,7 +143,9 @@ class PettyCashApp(BasePage):
             if not path:
                 return
             try:
-                self.proc_df.to_excel(path, index=False)
+                with perf.stage("export xlsx", rows=len(out), module=self.jobs.name):
+                    out.to_excel(path, index=False)
+                    ledger.record("petty_cash", checked, path, mask=written)
                 messagebox.showinfo("Exported", f"Saved to {path}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save Excel:\n{e}")
@@ -101,28 +159,13 @@ class PettyCashApp(BasePage):
             if not path:
                 return
             try:
-                self.proc_df.to_csv(path, index=False, encoding="utf-8-sig")
+                with perf.stage("export csv", rows=len(out), module=self.jobs.name):
+                    write_csv(out, path, encoding="utf-8-sig")
+                    ledger.record("petty_cash", checked, path, mask=written)
                 messagebox.showinfo("Exported", f"Saved to {path}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save CSV:\n{e}")
 
     # ---------- Table display ----------
     def _display(self, df: pd.DataFrame):
-        # Clear
-        self.tree.delete(*self.tree.get_children())
-        for col in self.tree["columns"]:
-            self.tree.heading(col, text="")
-
-        cols = list(df.columns)
-        self.tree["columns"] = cols
-
-        # Headings + simple width heuristic
-        for col in cols:
-            self.tree.heading(col, text=col)
-            max_len = max([len(str(col))] + [len(str(v)) for v in df[col].head(200).tolist()])
-            width = min(max(80, max_len * 8), 380)
-            self.tree.column(col, width=width, anchor="w")
-
-        # Rows
-        for _, row in df.iterrows():
-            self.tree.insert("", "end", values=[row.get(c, "") for c in cols])
+        self.table.show(df)
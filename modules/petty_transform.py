@@ -1,13 +1,14 @@
 # modules/petty_transform.py
+import os
+
 import pandas as pd
 from typing import Optional
 
-OUTPUT_COLUMNS = [
-    'TxDate','Description','Reference','Amount','UseTax','TaxType','TaxAccount','TaxAmount',
-    'Project','Account','IsDebit','SplitType','SplitGroup','Reconcile','PostDated','UseDiscount',
-    'DiscPerc','DiscTrCode','DiscDesc','UseDiscTax','DiscTaxType','DiscTaxAcc','DiscTaxAmt',
-    'PayeeName','PrintCheque','SalesRep','Module','SagePayExtra1','SagePayExtra2','SagePayExtra3'
-]
+from modules.excel_io import read_sheet, read_sheet_cached, PETTY_CASH
+from modules.evolution_schema import CASHBOOK
+from modules.parallel import map_processes
+
+OUTPUT_COLUMNS = CASHBOOK.columns
 
 DEFAULTS = {
     'TaxType':'', 'TaxAccount':'', 'TaxAmount':0, 'Project':'', 'IsDebit':'N',
@@ -55,13 +56,9 @@ def transform_petty_or_ewallet(df: pd.DataFrame) -> pd.DataFrame:
     recv_c = _col(cols, 'amount_received')
     vat_c  = _col(cols, 'vat(y/n)') or _col(cols, 'vat')
 
-    # --- Build formatted output skeleton ---
-    out = pd.DataFrame(index=df.index, columns=OUTPUT_COLUMNS)
-
-    # core fields
-    out['TxDate'] = df[date_c]
+    # --- Core fields ---
+    out = {}
     out['Description'] = df[desc_c].astype(str) if desc_c else pd.Series('', index=df.index)
-    out['Reference']   = df[ref_c] if ref_c else pd.Series('', index=df.index)
     out['Account']     = df[acct_c].astype(str).str.strip() if acct_c else pd.Series('', index=df.index)
 
     # amounts (prefer paid, else received)
@@ -77,9 +74,10 @@ def transform_petty_or_ewallet(df: pd.DataFrame) -> pd.DataFrame:
     out['UseTax'] = vat_series.eq('Y').map({True: 'Y', False: 'N'})
 
     # TxDate format dd/mm/yyyy (text)
-    out['TxDate'] = pd.to_datetime(out['TxDate'], errors='coerce', dayfirst=True).dt.strftime('%d/%m/%Y')
+    out['TxDate'] = pd.to_datetime(df[date_c], errors='coerce', dayfirst=True).dt.strftime('%d/%m/%Y')
 
-    # Defaults (except Module / IsDebit set below)
+    # Defaults (except Module / IsDebit set below); scalars stay scalars until
+    # CASHBOOK.build stores them as one-byte categoricals
     for k, v in DEFAULTS.items():
         if k not in ('Module', 'IsDebit'):
             out[k] = v
@@ -99,12 +97,64 @@ def transform_petty_or_ewallet(df: pd.DataFrame) -> pd.DataFrame:
     out['IsDebit'] = mask_received.map({True: 'Y', False: 'N'})
 
     # Reference: blank -> 'DEP'
-    ref_mask = out['Reference'].isna() | (out['Reference'].astype(str).str.strip() == '')
-    out.loc[ref_mask, 'Reference'] = 'DEP'
+    reference = df[ref_c].astype(object) if ref_c else pd.Series('', index=df.index, dtype=object)
+    ref_mask = reference.isna() | (reference.astype(str).str.strip() == '')
+    out['Reference'] = reference.mask(ref_mask, 'DEP')
+
+    # Final order & compact dtypes
+    return CASHBOOK.build(df.index, out)
+
+def export_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Only the Evolution import columns; tagging columns (Source, Channel, ...) stay in the app."""
+    return df[OUTPUT_COLUMNS]
+
+# --- Batch: several templates into one import ---
+TEMPLATE_EXTENSIONS = (".xlsx", ".xlsm", ".xls")
+
+def template_paths(source) -> list:
+    """A folder (its Excel files, sorted; Office lock files skipped), one path, or a list of paths."""
+    if isinstance(source, (str, os.PathLike)):
+        if not os.path.isdir(source):
+            return [source]
+        return sorted(
+            os.path.join(source, name) for name in os.listdir(source)
+            if name.lower().endswith(TEMPLATE_EXTENSIONS) and not name.startswith("~$")
+        )
+    return list(source)
 
-    # Final order & return
-    out = out[OUTPUT_COLUMNS]
-    return out
+def _load_template(path):
+    """Worker: one template -> (path, lines tagged with Source, None) or (path, None, error)."""
+    try:
+        df, _ = read_sheet_cached(path, layout=PETTY_CASH)
+        return path, transform_petty_or_ewallet(df).assign(Source=os.path.basename(path)), None
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+
+def load_batch(source, workers=None, progress=None, cancel_event=None):
+    """
+    Read and transform every petty cash / eWallet template in `source` (see
+    template_paths) in parallel, one process per file, with the PETTY_CASH
+    layout. progress(done, total) is called as files finish; setting
+    cancel_event raises JobCancelled (see parallel.map_processes).
+
+    Returns (combined, failures): combined keeps the file order and has a
+    'Source' column with each line's file name; failures maps file name ->
+    error for templates that could not be read or transformed. One bad file
+    never stops the others.
+    """
+    paths = template_paths(source)
+    loaded = map_processes(_load_template, paths, workers=workers, progress=progress, cancel_event=cancel_event)
+    results = {path: frame for path, frame, _ in loaded if frame is not None}
+    failures = {os.path.basename(path): error for path, frame, error in loaded if frame is None}
+
+    frames = [results[p] for p in paths if p in results]
+    if not frames:
+        return pd.DataFrame(columns=OUTPUT_COLUMNS + ["Source"]), failures
+    combined = pd.concat(frames, ignore_index=True)
+    # Per-file categoricals come back as object after concat; store them compactly again
+    names = list(dict.fromkeys(os.path.basename(p) for p in paths if p in results))
+    source_col = combined["Source"].astype(pd.CategoricalDtype(names))
+    return CASHBOOK.conform(combined).assign(Source=source_col), failures
 
 # --- Optional: run as a script on a file ---
 if __name__ == "__main__":
@@ -115,8 +165,7 @@ if __name__ == "__main__":
 
     # 1) Read with header on row 4 (index=3) then drop rows 5 & 6
     src_path = "E-Wallet Template.xlsx"  # or "Petty Cash Template.xlsx"
-    df_in = pd.read_excel(src_path, header=3)      # engine autodetected
-    df_in = df_in.iloc[2:].reset_index(drop=True)  # drop rows 5 & 6 (after header)
+    df_in = read_sheet(src_path, layout=PETTY_CASH)  # also drops rows 5 & 6 (after header)
 
     formatted = transform_petty_or_ewallet(df_in)
 
@@ -0,0 +1,145 @@
+# modules/recon_store.py
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from modules.diff_engine import row_hashes, _unmatched_mask
+
+STORE_DIR = os.environ.get(
+    "AUCOR_RECON_DIR",
+    os.path.join(os.path.expanduser("~"), ".aucor_tools", "recon"),
+)
+
+
+# Rows sampled to check that an export still starts with last run's rows when no
+# precomputed hashes are given (with them, every old row is checked)
+CHECK_ROWS = 1_000
+STORE_VERSION = 2
+
+
+class ReconStore:
+    """
+    Last run's rows of one reconciliation (e.g. account 9500), carried from
+    one month's compare to the next: per side, the row hashes in export order
+    and which rows were still open (unmatched).
+
+    Hashes are of normalize_for_compare() rows, so the store is only valid for
+    the same column set; a compare with different columns starts it afresh.
+    """
+
+    def __init__(self, name: str, directory: str = STORE_DIR):
+        self.name = name
+        self.path = os.path.join(directory, re.sub(r"[^\w.-]+", "_", name) + ".npz")
+        self.reset(remove=False)
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        with np.load(self.path, allow_pickle=False) as data:
+            if "version" not in data or int(data["version"]) != STORE_VERSION:
+                return      # older store format: the next compare rebuilds it
+            self.columns = [str(c) for c in data["columns"]]
+            self.hashes = {side: data[f"hashes_{side}"] for side in "ab"}
+            self.open = {side: data[f"open_{side}"] for side in "ab"}
+
+    def save(self):
+        """Write the store if this run changed it."""
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp.npz"
+        np.savez(
+            tmp, version=STORE_VERSION, columns=np.array(self.columns, dtype=str),
+            **{f"hashes_{side}": self.hashes[side] for side in "ab"},
+            **{f"open_{side}": self.open[side] for side in "ab"},
+        )
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+    def reset(self, remove: bool = True):
+        self.columns = []
+        self.hashes = {side: np.array([], dtype=np.uint64) for side in "ab"}
+        self.open = {side: np.array([], dtype=bool) for side in "ab"}
+        self.dirty = False
+        if remove and os.path.exists(self.path):
+            os.remove(self.path)
+
+    @property
+    def matched_rows(self) -> int:
+        return int((~self.open["a"]).sum())
+
+
+def _current_hashes(df: pd.DataFrame, hashes, known: np.ndarray):
+    """
+    (row hashes, still_known): still_known is True when df starts with the
+    `known` rows of last run. Without precomputed hashes only the rows after
+    them are hashed, and the old rows are checked on a CHECK_ROWS sample.
+    """
+    n = len(known)
+    if not n or len(df) < n:
+        return (row_hashes(df) if hashes is None else hashes), False
+    if hashes is not None:
+        return hashes, np.array_equal(hashes[:n], known)
+    probe = np.unique(np.linspace(0, n - 1, min(n, CHECK_ROWS)).astype(np.int64))
+    if not np.array_equal(row_hashes(df.iloc[probe]), known[probe]):
+        return row_hashes(df), False
+    return np.concatenate([known, row_hashes(df.iloc[n:])]), True
+
+
+def incremental_diff(df_a: pd.DataFrame, df_b: pd.DataFrame, store: ReconStore, hash_a=None, hash_b=None):
+    """
+    multiset_diff() that skips rows matched in an earlier run.
+
+    When both exports still start with last run's rows (Evolution and recon
+    exports grow at the end), the rows matched then stay matched, and only
+    last run's open rows plus the rows added since go through the
+    occurrence/diff pass; the result is the same as a full diff. Otherwise
+    (different columns, rows removed or changed) both sides are diffed in
+    full and the store starts again from this run. The store is updated in
+    memory (call store.save() to keep it).
+
+    Precomputed row hashes (CompareKeys.hashes) skip hashing altogether.
+
+    Returns (only_in_a, only_in_b, info) where info has carried, new_matches
+    and diffed_rows.
+    """
+    columns = [str(c) for c in df_a.columns]
+    if store.columns != columns:
+        store.reset(remove=False)
+        store.columns = columns
+    hash_a, known_a = _current_hashes(df_a, hash_a, store.hashes["a"])
+    hash_b, known_b = _current_hashes(df_b, hash_b, store.hashes["b"])
+
+    # Rows to diff: last run's open rows and everything after them, in export order
+    rest_a = np.ones(len(hash_a), dtype=bool)
+    rest_b = np.ones(len(hash_b), dtype=bool)
+    if known_a and known_b:
+        rest_a[:len(store.open["a"])] = store.open["a"]
+        rest_b[:len(store.open["b"])] = store.open["b"]
+    new_a, new_b = hash_a[rest_a], hash_b[rest_b]
+    open_a = _unmatched_mask(new_a, new_b)
+    open_b = _unmatched_mask(new_b, new_a)
+
+    carried = int((~rest_a).sum())
+    added_a, added_b = len(hash_a) - len(store.hashes["a"]), len(hash_b) - len(store.hashes["b"])
+    if not (known_a and known_b and added_a == 0 and added_b == 0):
+        store.hashes = {"a": hash_a, "b": hash_b}
+        store.dirty = True
+    for side, rest, still_open in (("a", rest_a, open_a), ("b", rest_b, open_b)):
+        now_open = rest.copy()
+        now_open[rest] = still_open
+        if store.dirty or not np.array_equal(now_open, store.open[side]):
+            store.open[side] = now_open
+            store.dirty = True
+
+    only_in_a = df_a[rest_a][open_a].reset_index(drop=True)
+    only_in_b = df_b[rest_b][open_b].reset_index(drop=True)
+    info = {
+        "carried": carried,
+        "new_matches": int((~open_a).sum()),
+        "diffed_rows": int(rest_a.sum() + rest_b.sum()),
+    }
+    return only_in_a, only_in_b, info
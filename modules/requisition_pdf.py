@@ -0,0 +1,263 @@
+# modules/requisition_pdf.py
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+from fpdf.image_datastructures import ImageCache
+from fpdf.image_parsing import preload_image
+
+log = logging.getLogger(__name__)
+
+# Next to app.py (or the frozen exe), so the CLI and batch runs find it from any working folder
+APP_DIR = (os.path.dirname(sys.executable) if getattr(sys, "frozen", False)
+           else os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+LOGO_PATH = os.environ.get("AUCOR_LOGO", os.path.join(APP_DIR, "Aucor-Logo.png"))
+BATCH_SIZE = 25     # requisitions per pool task; keeps pickling overhead low
+
+# Decoded logo, filled once per process by _load_logo()
+_LOGO_CACHE = None
+
+
+def _load_logo(logo_path: str = LOGO_PATH) -> ImageCache:
+    """Decode and compress the logo once; every PDF in this process reuses the result."""
+    global _LOGO_CACHE
+    if _LOGO_CACHE is None:
+        cache = ImageCache()
+        preload_image(cache, logo_path)
+        _LOGO_CACHE = cache
+    return _LOGO_CACHE
+
+
+class PDF(FPDF):
+    def __init__(self, user):
+        super().__init__()
+        self.user = user
+        # Seed this document's image cache with the already-decoded logo
+        logo = _load_logo()
+        self.image_cache.icc_profiles.update(logo.icc_profiles)
+        for name, info in logo.images.items():
+            copy = type(info)(info)
+            copy["usages"] = 0
+            self.image_cache.images[name] = copy
+
+    def header(self):
+        self.image(LOGO_PATH, 12, 1, 40)
+        self.set_font('helvetica', 'B', 25)
+        self.cell(0, 20, 'Aucor Payment Requisition', border=True, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='R')
+        self.ln(4)
+
+    def footer(self):
+        self.set_y(-15)
+        self.set_font('helvetica', 'I', 10)
+        self.cell(0, 10, f'Payment requisition created by {self.user}', align='C')
+
+    def chapter_title(self, title):
+        self.set_font('helvetica', 'B', 12)
+        self.cell(0, 10, title, 0, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='L')
+        self.ln(1)
+        self.cell(0, 0, '', 'T', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
+        self.ln(5)
+
+    def add_form_field(self, label):
+        self.set_font('helvetica', '', 10)
+        self.cell(0, 8, label, 0, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='L')
+        self.ln(2)
+
+    def add_approval_section(self):
+        self.set_font('helvetica', 'B', 10)
+        self.cell(0, 10, 'Approval Signatures:', 0, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='L')
+        self.cell(0, 0, '', 'T', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
+        self.add_form_field('Approver 1: Jacques van der Linde - Managing Director')
+        self.add_form_field('Approver 2: Charles Neser - National Mining Manager')
+        self.add_form_field('Signatures will be on Payment Requisition or Daily Transfer List')
+
+
+# ---------- Single documents ----------
+def create_customer_pdf(row, user, out_dir='.'):
+    pdf = PDF(user)
+    pdf.add_page()
+
+    auction_code = str(row['Group'])
+    auction_name = str(row['Group Description'])
+    client_name = str(row['Name'])
+    client_company = str(row['Customer Description']) if pd.notna(row['Customer Description']) else ''
+    client_customer_code = str(row['Customer']).replace('/', '_')
+    client_phone = str(row['Telephone 1']) if pd.notna(row['Telephone 1']) else ''
+    client_email = str(row['E-mail']) if pd.notna(row['E-mail']) else ''
+    refund_amount = '{:,.2f}'.format(row['Balance'])
+
+    today = datetime.today().strftime('%d/%m/%Y')
+    pdf.set_font('helvetica', '', 12)
+    pdf.cell(0, 8, f'Date: {today}', align='R', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    pdf.set_font('helvetica', 'B', 12)
+    pdf.cell(100, 10, 'Auction Refund/Deposit Refund', border=True)
+    pdf.set_text_color(255, 0, 0)
+    pdf.cell(90, 10, f'Amount to Refund: R {refund_amount}', align='R', border=True, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_text_color(0, 0, 0)
+    pdf.ln(10)
+
+    pdf.chapter_title('Auction Details:')
+    pdf.add_form_field(f'Auction Code: {auction_code}')
+    pdf.add_form_field(f'Auction Name: {auction_name}')
+
+    pdf.chapter_title('Client Information')
+    pdf.add_form_field(f'Customer Code: {client_customer_code}')
+    pdf.add_form_field(f'Client Name: {client_name} : {client_company}')
+    pdf.add_form_field(f'Phone Number: {client_phone}                      Email: {client_email}')
+
+    pdf.chapter_title('Banking Details')
+    pdf.add_form_field('Bank Name:                                         Account Number:')
+    pdf.add_form_field('ABSA: 632005      NED: 198765 ')
+    pdf.add_form_field('STD:  051001      FNB: 250655 ')
+    pdf.add_form_field('Capitec: 470010')
+    pdf.add_form_field('Immediate Payment:                                 Mail Proof of payment:')
+
+    pdf.chapter_title('Notes')
+    pdf.add_form_field('')
+    pdf.add_approval_section()
+
+    file_name = os.path.join(out_dir, f'{client_customer_code}_{client_name}.pdf')
+    pdf.output(file_name)
+    return file_name
+
+
+def create_supplier_pdf(row, user, out_dir='.'):
+    pdf = PDF(user)
+    pdf.add_page()
+
+    auction_code = str(row['Group'])
+    auction_name = str(row['Group Description'])
+    client_name = str(row['Name'])
+    client_customer_code = str(row['Supplier']).replace('/', '_')
+    refund_amount = '{:,.2f}'.format(row['Balance'])
+    bank_name = str(row.get('Bank Name', ''))
+    bank_branch = str(row.get('Bank Branch Code', ''))
+    bank_no = str(row.get('Bank Account No', ''))
+
+    today = datetime.today().strftime('%d/%m/%Y')
+    pdf.set_font('helvetica', '', 12)
+    pdf.cell(0, 8, f'Date: {today}', align='R', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    pdf.set_font('helvetica', 'B', 12)
+    pdf.cell(100, 10, 'Supplier Payment', border=True)
+    pdf.set_text_color(255, 0, 0)
+    pdf.cell(90, 10, f'Amount to Refund: R {refund_amount}', align='R', border=True, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_text_color(0, 0, 0)
+    pdf.ln(10)
+
+    pdf.chapter_title('Auction Details:')
+    pdf.add_form_field(f'Group: {auction_code}')
+    pdf.add_form_field(f'Supplier Type: {auction_name}')
+
+    pdf.chapter_title('Supplier Information')
+    pdf.add_form_field(f'Supplier Code: {client_customer_code}')
+    pdf.add_form_field(f'Supplier Name: {client_name} ')
+
+    pdf.chapter_title('Banking Details')
+    pdf.add_form_field(f'Bank Name:  {bank_name}                                       Account Number:  {bank_no}')
+    pdf.add_form_field(f'Bank Branch Code: {bank_branch}')
+    pdf.add_form_field('(STD:  051001  FNB: 250655  ABSA: 632005  NED: 198765 Capitec: 470010)')
+    pdf.add_form_field('Immediate Payment:                                 Mail Proof of payment:')
+
+    pdf.chapter_title('Notes')
+    pdf.add_form_field('')
+    pdf.add_approval_section()
+
+    file_name = os.path.join(out_dir, f'{client_customer_code}_{client_name}.pdf')
+    pdf.output(file_name)
+    return file_name
+
+
+# ---------- Refund lists ----------
+def _parse_balance(values: pd.Series) -> pd.Series:
+    """'R-1,234.56' -> -1234.56"""
+    return (values.astype(str).str.replace(r'[Rr]', '', regex=True)
+            .str.replace(',', '', regex=False).str.strip().astype(float).round(2))
+
+
+def prepare_refunds(df: pd.DataFrame, kind: str) -> pd.DataFrame:
+    """
+    In-place clean-up of a loaded refund list before rendering. Customer
+    balances are owed to the customer, so their sign is flipped; supplier
+    bank details are blanked rather than left as NaN.
+    """
+    if kind == "customer":
+        df['Balance'] = _parse_balance(df['Balance']) * -1
+        df['Telephone 1'] = df['Telephone 1'].astype(str).str.replace('.0', '', regex=False)
+    else:
+        df['Balance'] = _parse_balance(df['Balance'])
+        bank = ['Bank Name', 'Bank Branch Code', 'Bank Account No']
+        df[bank] = df[bank].fillna('')
+    return df
+
+
+RENDERERS = {
+    "customer": create_customer_pdf,
+    "supplier": create_supplier_pdf,
+}
+
+
+# ---------- Process pool ----------
+def _render_batch(kind, rows, user, out_dir):
+    render = RENDERERS[kind]
+    for row in rows:
+        render(row, user, out_dir)
+    return len(rows)
+
+
+def render_requisitions(df: pd.DataFrame, kind: str, user: str, out_dir: str = '.',
+                        workers=None, progress=None, cancel_event=None) -> dict:
+    """
+    Render one requisition PDF per row of df across a process pool.
+
+    kind: 'customer' or 'supplier'. Each worker decodes the logo once and
+    renders batches of BATCH_SIZE rows. progress(done, total) is called from
+    the calling thread as batches finish; setting cancel_event stops queued
+    batches (batches already running still finish).
+
+    Returns {'written', 'total', 'seconds', 'per_second', 'cancelled'}.
+    """
+    records = df.to_dict("records")
+    total = len(records)
+    out_dir = os.path.abspath(out_dir)
+    batches = [records[i:i + BATCH_SIZE] for i in range(0, total, BATCH_SIZE)]
+    workers = workers or min(os.cpu_count() or 1, max(1, len(batches)))
+    if not os.path.isfile(LOGO_PATH):
+        # Checked here: a failing pool initializer only surfaces as BrokenProcessPool
+        raise FileNotFoundError(f"Logo not found: {LOGO_PATH}")
+
+    start = time.perf_counter()
+    written, cancelled = 0, False
+    with ProcessPoolExecutor(max_workers=workers, initializer=_load_logo) as pool:
+        futures = [pool.submit(_render_batch, kind, batch, user, out_dir) for batch in batches]
+        counted = set()
+        try:
+            for future in as_completed(futures):
+                counted.add(future)
+                written += future.result()
+                if cancel_event is not None and cancel_event.is_set():
+                    cancelled = True
+                    pool.shutdown(wait=True, cancel_futures=True)
+                    written += sum(f.result() for f in futures
+                                   if f not in counted and f.done() and not f.cancelled())
+                    break
+                if progress:
+                    progress(written, total)
+        except BaseException:
+            # Don't let the pool's __exit__ render every queued batch before re-raising
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    seconds = time.perf_counter() - start
+    per_second = written / seconds if seconds else 0.0
+    log.info("Rendered %d/%d %s PDFs in %.2fs (%.1f PDFs/s) on %d workers",
+             written, total, kind, seconds, per_second, workers)
+    return {"written": written, "total": total, "seconds": seconds,
+            "per_second": per_second, "cancelled": cancelled}
@@ -0,0 +1,14 @@
+# tests/conftest.py
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks")]
+
+# Keep caches and logs out of the user's ~/.aucor_tools (read when the modules are imported)
+_TMP = tempfile.mkdtemp(prefix="aucor_tests_")
+os.environ.setdefault("AUCOR_PARSE_CACHE", os.path.join(_TMP, "parse_cache"))
+os.environ.setdefault("AUCOR_PERF_LOG", os.path.join(_TMP, "perf_log.jsonl"))
+os.environ.setdefault("AUCOR_RECON_DIR", os.path.join(_TMP, "recon"))
+os.environ.setdefault("AUCOR_EXPORT_LEDGER", os.path.join(_TMP, "export_ledger.sqlite3"))
@@ -0,0 +1,40 @@
+# tests/test_batch_runner.py
+import json
+import os
+
+import synthetic
+from modules.batch_runner import run_batch
+
+
+def test_month_end_manifest(tmp_path, monkeypatch):
+    # Run from another folder: inputs resolve against the manifest's folder, which holds no logo
+    elsewhere = tmp_path / "elsewhere"
+    elsewhere.mkdir()
+    monkeypatch.chdir(elsewhere)
+    synthetic.write_petty(tmp_path / "petty_blm.xlsx", 50, seed=1)
+    synthetic.write_deposits(tmp_path / "deposits.xlsx", 200, seed=2, sheets=2)
+    synthetic.write_refunds(tmp_path / "refunds.xlsx", 30, seed=3)
+    manifest = {
+        "out_dir": "month_end",
+        "jobs": [
+            {"name": "petty BLM", "command": "petty-cash", "templates": ["petty_blm.xlsx"]},
+            {"name": "deposits", "command": "deposits", "workbook": "deposits.xlsx", "all_sheets": True},
+            {"name": "refunds", "command": "requisitions", "refunds": "refunds.xlsx",
+             "kind": "customer", "user": "Jane Smith", "workers": 1},
+            {"name": "missing", "command": "petty-cash", "templates": ["missing.xlsx"]},
+        ],
+    }
+    path = tmp_path / "month_end.json"
+    path.write_text(json.dumps(manifest), encoding="utf-8")
+
+    report = run_batch(path, run_date="2025-09-30", workers=2)
+    assert os.getcwd() == str(elsewhere)
+
+    status = {row["job"]: row["status"] for row in report["jobs"]}
+    assert status["petty BLM"] == status["deposits"] == status["refunds"] == "ok"
+    assert status["missing"] != "ok" and report["failed"] == 1
+    out_dir = tmp_path / "month_end" / "2025-09-30"
+    assert len(os.listdir(out_dir / "refunds")) == 30
+    assert (out_dir / "summary.csv").exists()
+    assert os.listdir(elsewhere) == []
+
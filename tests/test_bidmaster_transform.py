@@ -0,0 +1,11 @@
+# tests/test_bidmaster_transform.py
+import numpy as np
+import pandas as pd
+
+from modules.bidmaster_transform import parse_amount
+
+
+def test_parse_amount_thousands_separators():
+    values = pd.Series(["1 234.50", "1,234.50", " 7504 ", "12 500", "", "   "])
+    expected = [1234.5, 1234.5, 7504.0, 12500.0, np.nan, 0.0]
+    np.testing.assert_array_equal(parse_amount(values).to_numpy(), expected)
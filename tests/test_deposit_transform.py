@@ -0,0 +1,28 @@
+# tests/test_deposit_transform.py
+import threading
+
+import pytest
+
+import synthetic
+from modules.deposit_transform import load_all_sheets
+from modules.excel_io import sheet_names
+from modules.parallel import JobCancelled
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    return synthetic.write_deposits(tmp_path / "deposits.xlsx", 400, sheets=4)
+
+
+def test_load_all_sheets_keeps_sheet_order(workbook):
+    combined, skipped = load_all_sheets(workbook, workers=2)
+    assert skipped == []
+    assert list(combined["Sheet"].unique()) == sheet_names(workbook)
+
+
+def test_load_all_sheets_cancel_raises(workbook):
+    # The cancel contract itself is covered in test_parallel; the loader must not swallow it
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(JobCancelled):
+        load_all_sheets(workbook, workers=1, cancel_event=cancel)
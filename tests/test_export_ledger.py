@@ -0,0 +1,34 @@
+# tests/test_export_ledger.py
+import pandas as pd
+import pytest
+
+from modules.export_ledger import ExportLedger
+
+
+def deposits(n: int) -> pd.DataFrame:
+    """n identical deposit lines (same date, reference, amount and account)."""
+    return pd.DataFrame({"TxDate": ["01/09/2025"] * n, "Reference": ["DEP 1249"] * n,
+                         "Amount": ["7504.00"] * n, "Account": ["9500"] * n})
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return ExportLedger(str(tmp_path / "ledger.sqlite3"))
+
+
+def test_identical_lines_are_counted(ledger):
+    ledger.record("deposits", deposits(2), "first.csv")
+    previous = ledger.check("deposits", deposits(3))
+    assert previous.notna().tolist() == [True, True, False]
+
+
+def test_skipped_repeats_keep_their_occurrence(ledger):
+    ledger.record("deposits", deposits(2), "first.csv")
+    checked = deposits(3)
+    written = ledger.check("deposits", checked).isna()
+    ledger.record("deposits", checked, "second.csv", mask=written)
+
+    # The third line was exported by second.csv, so it is no longer offered as new
+    assert ledger.check("deposits", deposits(3)).notna().all()
+    assert ledger.check("deposits", deposits(4)).notna().tolist() == [True, True, True, False]
+    assert ledger.exports()["rows"].tolist() == [1, 2]
@@ -0,0 +1,40 @@
+# tests/test_parallel.py
+import threading
+import time
+
+import pytest
+
+from modules.parallel import JobCancelled, map_processes
+
+ITEMS = 12
+
+
+def _write_marker(path):
+    """Worker: a little work, then leave a trace that this item ran."""
+    time.sleep(0.05)
+    with open(path, "w") as f:
+        f.write("done")
+    return path
+
+
+def test_results_keep_item_order(tmp_path):
+    paths = [str(tmp_path / f"{i}.txt") for i in range(ITEMS)]
+    assert map_processes(_write_marker, paths, workers=3) == paths
+
+
+def test_cancel_stops_queued_items_and_returns_nothing(tmp_path):
+    paths = [str(tmp_path / f"{i}.txt") for i in range(ITEMS)]
+    cancel = threading.Event()
+    calls = []
+
+    def progress(done, total):
+        calls.append(done)
+        cancel.set()
+
+    with pytest.raises(JobCancelled):
+        map_processes(_write_marker, paths, workers=1, progress=progress, cancel_event=cancel)
+
+    assert calls == [1]
+    time.sleep(0.5)     # let items already handed to the worker finish
+    ran = len(list(tmp_path.iterdir()))
+    assert ran < ITEMS, "queued items should be dropped after a cancel"
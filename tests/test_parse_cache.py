@@ -0,0 +1,39 @@
+# tests/test_parse_cache.py
+import os
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from modules import parse_cache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(parse_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+def load_twice(tmp_path, frame):
+    source = tmp_path / "source.bin"
+    source.write_bytes(b"same contents")
+    first, hit = parse_cache.load(source, lambda: frame.copy(), reader="test")
+    assert not hit
+    second, hit = parse_cache.load(source, lambda: pytest.fail("parsed again"), reader="test")
+    assert hit
+    pd.testing.assert_frame_equal(second, first)
+
+
+def test_typed_frames_are_stored_as_feather(tmp_path, cache_dir):
+    pytest.importorskip("pyarrow")
+    frame = pd.DataFrame({"Date": pd.to_datetime(["2025-09-01", None]), "Reference": ["DEP 1", None],
+                          "Credit": [7504.0, 12.5]})
+    load_twice(tmp_path, frame)
+    assert [os.path.splitext(name)[1] for name in os.listdir(cache_dir)] == [".feather"]
+
+
+def test_mixed_columns_fall_back_to_pickle(tmp_path, cache_dir):
+    # A raw ledger column holds both dates and text, which Feather can't store
+    frame = pd.DataFrame({0: [datetime(2025, 9, 1), "Opening Balance"], 1: [1.0, 2.0]})
+    load_twice(tmp_path, frame)
+    assert [os.path.splitext(name)[1] for name in os.listdir(cache_dir)] == [".pkl"]
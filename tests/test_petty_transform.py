@@ -0,0 +1,30 @@
+# tests/test_petty_transform.py
+import threading
+
+import pytest
+
+import synthetic
+from modules.parallel import JobCancelled
+from modules.petty_transform import load_batch
+
+
+@pytest.fixture
+def templates(tmp_path):
+    for i in range(4):
+        synthetic.write_petty(tmp_path / f"branch_{i}.xlsx", 50, seed=i, ewallet=i == 3)
+    (tmp_path / "broken.xlsx").write_bytes(b"not a workbook")
+    return tmp_path
+
+
+def test_load_batch_keeps_file_order_and_reports_failures(templates):
+    combined, failures = load_batch(templates, workers=2)
+    assert list(combined["Source"].unique()) == [f"branch_{i}.xlsx" for i in range(4)]
+    assert list(failures) == ["broken.xlsx"]
+
+
+def test_load_batch_cancel_raises(templates):
+    # The cancel contract itself is covered in test_parallel; the loader must not swallow it
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(JobCancelled):
+        load_batch(templates, workers=1, cancel_event=cancel)